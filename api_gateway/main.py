@@ -11,9 +11,11 @@ from fastapi import Body, FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, Field
 
 from src.backend.core.aetherbus_extreme import AetherBusExtreme
-from src.backend.causal_policy_lab import CausalPolicyLab
+from src.backend.causal_policy_lab import DEFAULT_KPI_OUTCOMES, DEFAULT_TREATMENTS, CausalPolicyLab
+from src.backend.compute_executor import BoundedComputeExecutor, ComputeSaturatedError, ComputeTimeoutError
 from src.backend.auth.google_auth import router as google_auth_router
 from src.backend.freeze_api import router as freeze_router
 from src.backend.resonance_drift_api import router as resonance_drift_router
@@ -57,11 +59,22 @@ except ImportError:  # pragma: no cover
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     init_db()
-    yield
+    causal_lab.start_auto_refresh(CAUSAL_REFRESH_INTERVAL_S)
+    try:
+        yield
+    finally:
+        causal_lab.shutdown()
+        compute_executor.shutdown(wait=False)
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 frontend_dist = ROOT_DIR / "frontend" / "dist"
 GENESIS_WEBHOOK_SECRET = os.getenv("GENESIS_WEBHOOK_SECRET", "asi-genesis-dev-secret")
+CAUSAL_REFRESH_INTERVAL_S = float(os.getenv("CAUSAL_REFRESH_INTERVAL_S", "30"))
+# Thread pool: the handlers run methods of shared in-process state (causal_lab).
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+COMPUTE_MAX_QUEUE_DEPTH = int(os.getenv("COMPUTE_MAX_QUEUE_DEPTH", "32"))
+COMPUTE_TIMEOUT_S = float(os.getenv("COMPUTE_TIMEOUT_S", "30"))
+CAUSAL_MAX_BOOTSTRAP_RESAMPLES = int(os.getenv("CAUSAL_MAX_BOOTSTRAP_RESAMPLES", "2000"))
 
 app = FastAPI(title="Aetherium API Gateway", version="1.1.0", lifespan=lifespan)
 app.add_middleware(
@@ -85,6 +98,11 @@ app.include_router(marketplace_router)
 bus = AetherBusExtreme()
 immune_system = ContractChecker()
 causal_lab = CausalPolicyLab()
+compute_executor = BoundedComputeExecutor(
+    COMPUTE_WORKERS,
+    max_queue_depth=COMPUTE_MAX_QUEUE_DEPTH,
+    timeout_s=COMPUTE_TIMEOUT_S,
+)
 policy_genome_engine = PolicyGenomeEngine()
 resonance_orchestrator = ResonanceFeedbackLoopOrchestrator()
 cogitator_engine = CogitatorXEngine(
@@ -114,6 +132,14 @@ async def soulbreak_exception_handler(_request: Request, exc: SoulBreakError):
     status_code, payload = problem_details_from_error(exc, status_code=400)
     return JSONResponse(status_code=status_code, content=payload)
 
+@app.exception_handler(ComputeSaturatedError)
+async def compute_saturated_handler(_request: Request, exc: ComputeSaturatedError):
+    return JSONResponse(status_code=503, content={"error": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(ComputeTimeoutError)
+async def compute_timeout_handler(_request: Request, exc: ComputeTimeoutError):
+    return JSONResponse(status_code=504, content={"error": str(exc)})
+
 @app.get("/")
 async def root():
     return {"status": "ONLINE", "brain_connected": HAS_BRAIN}
@@ -150,30 +176,81 @@ async def sse_events() -> StreamingResponse:
             await asyncio.sleep(2)
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
+class CausalEstimateRequest(BaseModel):
+    treatment: str | None = None
+    outcome: str | None = None
+    common_causes: list[str] | None = None
+    method: str = "propensity_score_matching"
+    online: bool = False
+    bootstrap_resamples: int | None = Field(default=None, ge=0, le=CAUSAL_MAX_BOOTSTRAP_RESAMPLES)
+
 @app.post("/causal/estimate")
-async def causal_estimate(payload: dict = Body(...)):
+async def causal_estimate(payload: CausalEstimateRequest):
+    if not payload.treatment or not payload.outcome:
+        return {"error": "treatment and outcome are required", "causal_effect": None}
+    if payload.online:
+        try:
+            return await compute_executor.run(
+                causal_lab.estimate_online,
+                treatment=payload.treatment,
+                outcome=payload.outcome,
+                common_causes=payload.common_causes,
+            )
+        except KeyError:
+            return {"error": "spec is not registered; POST /causal/specs first", "causal_effect": None}
+    return await compute_executor.run(
+        causal_lab.estimate_causal_effect,
+        treatment=payload.treatment,
+        outcome=payload.outcome,
+        common_causes=payload.common_causes,
+        method=payload.method,
+        bootstrap_resamples=payload.bootstrap_resamples,
+    )
+
+@app.post("/causal/estimate-matrix")
+async def causal_estimate_matrix(payload: dict = Body(default={})):
+    return await compute_executor.run(
+        causal_lab.estimate_matrix,
+        treatments=payload.get("treatments") or list(DEFAULT_TREATMENTS),
+        outcomes=payload.get("outcomes") or list(DEFAULT_KPI_OUTCOMES),
+        common_causes=payload.get("common_causes"),
+    )
+
+@app.post("/causal/specs")
+async def register_causal_spec(payload: dict = Body(...)):
     treatment = payload.get("treatment")
     outcome = payload.get("outcome")
-    common_causes = payload.get("common_causes")
-    method = payload.get("method", "propensity_score_matching")
     if not treatment or not outcome:
-        return {"error": "treatment and outcome are required", "causal_effect": None}
-    return causal_lab.estimate_causal_effect(
+        return JSONResponse(status_code=400, content={"error": "treatment and outcome are required"})
+    return await compute_executor.run(
+        causal_lab.register_spec,
         treatment=treatment,
         outcome=outcome,
-        common_causes=common_causes,
-        method=method,
+        common_causes=payload.get("common_causes"),
     )
 
+@app.get("/causal/specs")
+async def list_causal_specs():
+    return {"specs": await compute_executor.run(causal_lab.registered_specs)}
+
+@app.get("/causal/cache/stats")
+async def causal_cache_stats():
+    return causal_lab.cache_stats()
+
 @app.get("/causal/recommend")
 async def causal_recommend(top_n: int = 3):
-    return {"recommendations": causal_lab.recommend_policies(top_n=top_n)}
+    return {"recommendations": await compute_executor.run(causal_lab.recommend_policies, top_n=top_n)}
+
+def _build_policy_genome(policies: list[dict[str, Any]] | None, top_n: int) -> dict[str, Any]:
+    return policy_genome_engine.build_graph(policies or causal_lab.recommend_policies(top_n=top_n))
 
 @app.post("/policy-genome/build")
 async def build_policy_genome(payload: dict = Body(default={})):
-    policies = payload.get("policies") or causal_lab.recommend_policies(top_n=payload.get("top_n", 5))
-    graph = policy_genome_engine.build_graph(policies)
-    return graph
+    return await compute_executor.run(_build_policy_genome, payload.get("policies"), payload.get("top_n", 5))
+
+@app.get("/api/v1/compute/metrics")
+async def compute_metrics():
+    return compute_executor.metrics()
 
 @app.get("/api/genesis/terminology")
 async def get_genesis_terminology():
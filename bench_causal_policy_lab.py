@@ -0,0 +1,217 @@
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from src.backend import causal_policy_lab
+from src.backend.causal_policy_lab import CausalPolicyLab, _coerce_numeric, _coerce_treatment, _ols_treatment_effect_python
+from src.backend.columnar_events import ColumnarEventTable
+
+COMMON_CAUSES = ["load_level", "industry", "scenario"]
+INDUSTRIES = ("TechSaaS", "Healthcare", "Retail", "Finance")
+
+
+def build_rows(count: int, seed: int) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    rows: list[dict[str, object]] = []
+    for _ in range(count):
+        load_level = rng.randrange(3)
+        industry = rng.choice(INDUSTRIES)
+        treated = 1.0 if rng.random() < 0.3 + 0.15 * load_level else 0.0
+        rows.append(
+            {
+                "__treatment__": treated,
+                "__outcome__": 0.5 + 0.2 * treated - 0.05 * load_level + rng.gauss(0.0, 0.05),
+                "load_level": load_level,
+                "industry": industry,
+                "scenario": "stress_test",
+            }
+        )
+    return rows
+
+
+def build_event_rows(count: int, seed: int) -> list[dict[str, object]]:
+    # Shape of `_event_row` output for `resonance.intervention.evaluated` events.
+    rng = random.Random(seed)
+    rows: list[dict[str, object]] = []
+    for idx in range(count):
+        load_level = rng.randrange(3)
+        treated = rng.random() < 0.3 + 0.15 * load_level
+        rows.append(
+            {
+                "event_type": "resonance.intervention.evaluated",
+                "timestamp": f"2026-02-11T00:00:{idx % 60:02d}Z",
+                "treatment": "auto_switch_deep" if treated else "manual",
+                "stakeholder_trust": 0.5 + 0.2 * treated - 0.05 * load_level + rng.gauss(0.0, 0.05),
+                "adaptability": 0.5 + 0.1 * treated,
+                "load_level": load_level,
+                "industry": rng.choice(INDUSTRIES),
+                "scenario": "stress_test",
+            }
+        )
+    return rows
+
+
+def traced_bytes(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def dict_prepare(rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    # The pre-columnar `_prepare_rows` loop over per-event dicts.
+    prepared: list[dict[str, object]] = []
+    for row in rows:
+        treatment_value = _coerce_treatment(row, "auto_switch_deep")
+        outcome_value = _coerce_numeric(row.get("stakeholder_trust"))
+        if treatment_value is None or outcome_value is None:
+            continue
+        out_row = {"__treatment__": treatment_value, "__outcome__": outcome_value}
+        out_row.update({cause: row[cause] for cause in COMMON_CAUSES if cause in row})
+        prepared.append(out_row)
+    return prepared
+
+
+def measure_columnar(size: int, seed: int) -> str:
+    rows, dict_bytes = traced_bytes(lambda: build_event_rows(size, seed))
+    table, table_bytes = traced_bytes(lambda: ColumnarEventTable(rows))
+    spec = {"treatment": "auto_switch_deep", "outcome": "stakeholder_trust", "common_causes": COMMON_CAUSES}
+    start = time.perf_counter()
+    prepared = dict_prepare(rows)
+    if causal_policy_lab.np is not None:
+        causal_policy_lab._design_matrix(prepared, "__treatment__", COMMON_CAUSES)
+    dict_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    if causal_policy_lab.np is not None:
+        table.design(**spec)
+    else:
+        table.prepare_rows(**spec)
+    table_seconds = time.perf_counter() - start
+    return (
+        f"events={size:>9,} | dicts {dict_bytes / size:6.0f} B/event, table {table_bytes / size:5.0f} B/event"
+        f" | prepare dicts {dict_seconds * 1000:8.1f} ms, table {table_seconds * 1000:7.1f} ms"
+    )
+
+
+def timed(fn, *args) -> tuple[float, float]:
+    start = time.perf_counter()
+    effect = fn(*args)
+    return effect, time.perf_counter() - start
+
+
+def measure_refute(rows: list[dict[str, object]], *, rounds: int, workers: int) -> float:
+    lab = CausalPolicyLab(events_file="/nonexistent", refute_rounds=rounds, refute_workers=workers)
+    try:
+        start = time.perf_counter()
+        lab._random_refute(rows, COMMON_CAUSES)
+        return time.perf_counter() - start
+    finally:
+        lab.shutdown()
+
+
+def measure_bootstrap(rows: list[dict[str, object]], *, resamples: int, workers: int) -> tuple[float, dict | None]:
+    lab = CausalPolicyLab(events_file="/nonexistent", refute_workers=workers)
+    try:
+        design = causal_policy_lab._design_matrix(rows, "__treatment__", COMMON_CAUSES)
+        y = causal_policy_lab.np.array([row["__outcome__"] for row in rows])
+        start = time.perf_counter()
+        interval = lab._bootstrap_interval(resamples, len(rows), design=design, y=y)
+        return time.perf_counter() - start, interval
+    finally:
+        lab.shutdown()
+
+
+def main(
+    sizes: list[int],
+    python_max_rows: int,
+    seed: int,
+    refute_rounds: int,
+    refute_workers: int,
+    bootstrap_resamples: int,
+) -> None:
+    print("=" * 60)
+    print("CAUSAL POLICY LAB: ADJUSTED OLS ESTIMATE")
+    print("=" * 60)
+    if causal_policy_lab.np is None:
+        print("NumPy not installed: only the pure-Python path is measured.")
+    for size in sizes:
+        rows = build_rows(size, seed)
+        line = f"rows={size:>9,}"
+        if size <= python_max_rows:
+            effect, seconds = timed(_ols_treatment_effect_python, rows, "__treatment__", "__outcome__", COMMON_CAUSES)
+            line += f" | python {seconds * 1000:10.1f} ms (effect={effect:.4f})"
+        else:
+            line += " | python      skipped"
+        if causal_policy_lab.np is not None:
+            effect, seconds = timed(
+                causal_policy_lab._ols_treatment_effect_numpy, rows, "__treatment__", "__outcome__", COMMON_CAUSES
+            )
+            line += f" | numpy {seconds * 1000:9.1f} ms (effect={effect:.4f})"
+        print(line)
+    print("-" * 60)
+    print("COLUMNAR EVENT TABLE (memory per event, estimate preparation)")
+    print("-" * 60)
+    for size in sizes:
+        print(measure_columnar(size, seed))
+    print("-" * 60)
+    print(f"PERMUTATION REFUTATION ({refute_rounds} rounds)")
+    print("-" * 60)
+    for size in sizes:
+        if causal_policy_lab.np is None and size > python_max_rows:
+            continue
+        rows = build_rows(size, seed)
+        line = f"rows={size:>9,} | inline {measure_refute(rows, rounds=refute_rounds, workers=1) * 1000:9.1f} ms"
+        if refute_workers > 1 and causal_policy_lab.np is not None:
+            pooled = measure_refute(rows, rounds=refute_rounds, workers=refute_workers)
+            line += f" | {refute_workers} procs {pooled * 1000:9.1f} ms"
+        print(line)
+    if causal_policy_lab.np is not None:
+        print("-" * 60)
+        print(f"BOOTSTRAP CONFIDENCE INTERVAL ({bootstrap_resamples} requested, default cell budget)")
+        print("-" * 60)
+        for size in sizes:
+            rows = build_rows(size, seed)
+            seconds, interval = measure_bootstrap(rows, resamples=bootstrap_resamples, workers=1)
+            line = f"rows={size:>9,} | inline {seconds * 1000:9.1f} ms"
+            if interval is not None:
+                line += f" | resamples={interval['resamples']:>4} [{interval['lower']:.4f}, {interval['upper']:.4f}]"
+            if refute_workers > 1:
+                pooled, _ = measure_bootstrap(rows, resamples=bootstrap_resamples, workers=refute_workers)
+                line += f" | {refute_workers} procs {pooled * 1000:9.1f} ms"
+            print(line)
+    print("=" * 60)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CausalPolicyLab benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Row counts")
+    parser.add_argument(
+        "--python-max-rows",
+        type=int,
+        default=100_000,
+        help="Largest row count timed on the pure-Python path (it is O(n*k^2))",
+    )
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic data seed")
+    parser.add_argument("--refute-rounds", type=int, default=32, help="Placebo rounds per refutation")
+    parser.add_argument(
+        "--refute-workers", type=int, default=1, help="Process pool size for refutation and bootstrap batches"
+    )
+    parser.add_argument("--bootstrap-resamples", type=int, default=200, help="Bootstrap resamples requested per estimate")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(
+        sizes=args.sizes,
+        python_max_rows=args.python_max_rows,
+        seed=args.seed,
+        refute_rounds=args.refute_rounds,
+        refute_workers=args.refute_workers,
+        bootstrap_resamples=args.bootstrap_resamples,
+    )
@@ -0,0 +1,173 @@
+import argparse
+import os
+import time
+from dataclasses import dataclass
+
+from src.backend.cogitator_x import (
+    CogitatorXEngine,
+    LanguageMixedThoughtGenerator,
+    PangenesAgent,
+    ProcessRewardModel,
+    RuleBasedOutcomeReward,
+    WisdomGemStore,
+)
+
+PROMPT = "จงหาผลลัพธ์ 12 + 30 และตอบเป็นภาษาไทย"
+
+
+@dataclass
+class SolveStats:
+    label: str
+    compute_budget: int
+    runs: int
+    mean_ms: float
+    p99_ms: float
+
+
+def build_engine(*, cached: bool) -> CogitatorXEngine:
+    generator = LanguageMixedThoughtGenerator(cache_size=512 if cached else 0)
+    prm = ProcessRewardModel(cache_size=4096 if cached else 0)
+    return CogitatorXEngine(generator=generator, prm=prm, pangenes=PangenesAgent(WisdomGemStore()))
+
+
+def measure_solve(*, label: str, cached: bool, compute_budget: int, runs: int) -> SolveStats:
+    engine = build_engine(cached=cached)
+    outcome = RuleBasedOutcomeReward(answer_checker=lambda answer: answer == "42")
+    latencies: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        engine.solve(
+            prompt=PROMPT, outcome_reward=outcome, compute_budget=compute_budget, base_branch_factor=2, use_cache=False
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return SolveStats(
+        label=label,
+        compute_budget=compute_budget,
+        runs=runs,
+        mean_ms=sum(latencies) / len(latencies),
+        p99_ms=latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+    )
+
+
+def measure_iterations(*, compute_budget: int) -> float:
+    engine = build_engine(cached=True)
+    outcome = RuleBasedOutcomeReward(answer_checker=lambda answer: answer == "42")
+    start = time.perf_counter()
+    engine.solve(
+        prompt=PROMPT, outcome_reward=outcome, compute_budget=compute_budget, base_branch_factor=2, use_cache=False
+    )
+    return compute_budget / (time.perf_counter() - start)
+
+
+def measure_profile_overhead(*, compute_budget: int, runs: int) -> tuple[float, float]:
+    engine = build_engine(cached=True)
+    outcome = RuleBasedOutcomeReward(answer_checker=lambda answer: answer == "42")
+    totals = {False: 0.0, True: 0.0}
+    for _ in range(runs):
+        # Interleave so both modes see the same warm caches and machine noise.
+        for profile in (False, True):
+            start = time.perf_counter()
+            engine.solve(
+                prompt=PROMPT,
+                outcome_reward=outcome,
+                compute_budget=compute_budget,
+                base_branch_factor=2,
+                use_cache=False,
+                profile=profile,
+            )
+            totals[profile] += time.perf_counter() - start
+    return totals[False] / runs * 1000, totals[True] / runs * 1000
+
+
+def usable_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _answer_is_42(answer: str) -> bool:
+    return answer == "42"
+
+
+def measure_batch_scaling(*, workers: int, prompts: int, compute_budget: int) -> float:
+    engine = build_engine(cached=True)
+    batch = [f"จงหาผลลัพธ์ {idx} + {42 - idx} และตอบเป็นภาษาไทย" for idx in range(prompts)]
+    outcome = RuleBasedOutcomeReward(answer_checker=_answer_is_42)
+    try:
+        # Warm the pool so process start-up is not billed to the batch.
+        engine.solve_batch(batch[:workers], outcome, workers=workers, compute_budget=1)
+        start = time.perf_counter()
+        engine.solve_batch(batch, outcome, workers=workers, compute_budget=compute_budget)
+        return prompts / (time.perf_counter() - start)
+    finally:
+        engine.shutdown()
+
+
+def main(budgets: list[int], runs: int, mcts_budgets: list[int], max_workers: int, batch_prompts: int) -> None:
+    print("=" * 60)
+    print("COGITATOR-X: SOLVE LATENCY BENCHMARK")
+    print("=" * 60)
+    for budget in budgets:
+        for label, cached in (("uncached", False), ("cached", True)):
+            stats = measure_solve(label=label, cached=cached, compute_budget=budget, runs=runs)
+            print(
+                f"budget={stats.compute_budget:>4} | {stats.label:<8} | "
+                f"mean={stats.mean_ms:8.3f} ms | p99={stats.p99_ms:8.3f} ms"
+            )
+        print("-" * 60)
+    print("MCTS THROUGHPUT (cached engine)")
+    print("-" * 60)
+    for budget in mcts_budgets:
+        print(f"budget={budget:>7,} | {measure_iterations(compute_budget=budget):>12,.0f} iterations/sec")
+    print("-" * 60)
+    print("PROFILING OVERHEAD (budget=200)")
+    print("-" * 60)
+    plain_ms, profiled_ms = measure_profile_overhead(compute_budget=200, runs=runs)
+    print(
+        f"profile=off {plain_ms:8.3f} ms | profile=on {profiled_ms:8.3f} ms | "
+        f"overhead={(profiled_ms / plain_ms - 1) * 100:+5.1f}%"
+    )
+    print("-" * 60)
+    print(f"SOLVE_BATCH SCALING ({batch_prompts} prompts, budget=200, process pool)")
+    print("-" * 60)
+    cores = usable_cores()
+    if max_workers > cores:
+        # Extra workers only add pickling and scheduling overhead, so speedup stays at or below 1x.
+        print(f"note: {cores} usable core(s); runs with more workers measure pool overhead, not scaling")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        throughput = measure_batch_scaling(workers=workers, prompts=batch_prompts, compute_budget=200)
+        baseline = baseline or throughput
+        print(f"workers={workers:>3} | {throughput:>10,.1f} solves/sec | speedup={throughput / baseline:5.2f}x")
+        workers *= 2
+    print("=" * 60)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cogitator-X benchmark suite")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[12, 50, 200], help="compute_budget values to measure")
+    parser.add_argument("--runs", type=int, default=30, help="Solves per configuration")
+    parser.add_argument(
+        "--mcts-budgets",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 50_000],
+        help="Large compute_budget values for the iterations/sec measurement",
+    )
+    parser.add_argument("--max-workers", type=int, default=usable_cores(), help="Largest solve_batch pool size")
+    parser.add_argument("--batch-prompts", type=int, default=64, help="Prompts per solve_batch call")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(
+        budgets=args.budgets,
+        runs=args.runs,
+        mcts_budgets=args.mcts_budgets,
+        max_workers=args.max_workers,
+        batch_prompts=args.batch_prompts,
+    )
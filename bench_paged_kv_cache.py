@@ -0,0 +1,182 @@
+import argparse
+import time
+from dataclasses import dataclass
+
+from src.backend.paged_kv_cache import PagedKVBlockManager, SlidingWindowPolicy
+
+
+@dataclass
+class SessionStats:
+    label: str
+    tokens: int
+    duration: float
+    peak_used_blocks: int
+    final_used_blocks: int
+    tokens_per_sec: float
+
+
+def run_long_session(
+    *,
+    label: str,
+    total_tokens: int,
+    block_size: int,
+    chunk_tokens: int,
+    window: SlidingWindowPolicy | None,
+) -> SessionStats:
+    num_blocks = (total_tokens + block_size - 1) // block_size + 1
+    manager = PagedKVBlockManager(num_gpu_blocks=num_blocks, block_size=block_size)
+    manager.allocate_for_request("session", 0, window=window)
+
+    peak_used = 0
+    appended = 0
+    start = time.perf_counter()
+    while appended < total_tokens:
+        step = min(chunk_tokens, total_tokens - appended)
+        manager.append_token("session", token_count=step)
+        appended += step
+        peak_used = max(peak_used, num_blocks - len(manager.free_blocks))
+    duration = time.perf_counter() - start
+
+    final_used = manager.memory_report()["used_blocks"]
+    manager.release_request("session")
+    return SessionStats(
+        label=label,
+        tokens=total_tokens,
+        duration=duration,
+        peak_used_blocks=peak_used,
+        final_used_blocks=int(final_used),
+        tokens_per_sec=total_tokens / duration if duration else 0.0,
+    )
+
+
+@dataclass
+class BeamStats:
+    prefix_tokens: int
+    forks: int
+    fork_seconds: float
+    peak_used_blocks: int
+
+    @property
+    def fork_us(self) -> float:
+        return self.fork_seconds / max(1, self.forks) * 1_000_000
+
+
+def run_beam_tree(*, prefix_tokens: int, branch_factor: int, depth: int, step_tokens: int, block_size: int) -> BeamStats:
+    # Beam width equals the branch factor: every level forks each survivor
+    # `branch_factor` times, decodes a step, then prunes back to the beam width.
+    prefix_blocks = (prefix_tokens + block_size - 1) // block_size
+    step_blocks = (step_tokens + block_size - 1) // block_size + 1
+    num_blocks = prefix_blocks + branch_factor * branch_factor * step_blocks * (depth + 1)
+    manager = PagedKVBlockManager(num_gpu_blocks=num_blocks, block_size=block_size)
+    manager.allocate_for_request("beam", prefix_tokens)
+
+    frontier = ["beam"]
+    forks = 0
+    fork_seconds = 0.0
+    peak_used = 0
+    for _ in range(depth):
+        expanded: list[str] = []
+        for node in frontier:
+            start = time.perf_counter()
+            children = manager.fork_many(node, branch_factor)
+            fork_seconds += time.perf_counter() - start
+            forks += len(children)
+            for child in children:
+                manager.append_token(child, token_count=step_tokens)
+            expanded.extend(children)
+        peak_used = max(peak_used, num_blocks - len(manager.free_blocks))
+        for node in frontier:
+            manager.release_request(node)
+        frontier = expanded[:branch_factor]
+        for pruned in expanded[branch_factor:]:
+            manager.release_request(pruned)
+
+    for node in frontier:
+        manager.release_request(node)
+    return BeamStats(prefix_tokens=prefix_tokens, forks=forks, fork_seconds=fork_seconds, peak_used_blocks=peak_used)
+
+
+def print_stats(stats: SessionStats, block_size: int) -> None:
+    print(f"[{stats.label}]")
+    print(f"  Tokens appended      : {stats.tokens:,}")
+    print(f"  Duration             : {stats.duration:.4f} sec")
+    print(f"  Append throughput    : {stats.tokens_per_sec:,.0f} tokens/sec")
+    print(f"  Peak used blocks     : {stats.peak_used_blocks:,} ({stats.peak_used_blocks * block_size:,} token slots)")
+    print(f"  Final used blocks    : {stats.final_used_blocks:,}")
+
+
+def main(
+    total_tokens: int,
+    block_size: int,
+    chunk_tokens: int,
+    sink_blocks: int,
+    window_blocks: int,
+    branch_factor: int,
+    depth: int,
+) -> None:
+    print("=" * 60)
+    print("PAGED KV CACHE: LONG SESSION + BEAM FORK BENCHMARK")
+    print("=" * 60)
+
+    full = run_long_session(
+        label="full retention",
+        total_tokens=total_tokens,
+        block_size=block_size,
+        chunk_tokens=chunk_tokens,
+        window=None,
+    )
+    windowed = run_long_session(
+        label=f"sink={sink_blocks} window={window_blocks}",
+        total_tokens=total_tokens,
+        block_size=block_size,
+        chunk_tokens=chunk_tokens,
+        window=SlidingWindowPolicy(sink_blocks=sink_blocks, window_blocks=window_blocks),
+    )
+
+    print_stats(full, block_size)
+    print_stats(windowed, block_size)
+    print("-" * 60)
+    ratio = full.peak_used_blocks / max(1, windowed.peak_used_blocks)
+    print(f"Peak block reduction   : {ratio:,.1f}x")
+    print("=" * 60)
+
+    print(f"BEAM TREE FORKS (branch={branch_factor}, depth={depth})")
+    print("-" * 60)
+    for prefix_tokens in (1_024, 16_384, total_tokens):
+        beam = run_beam_tree(
+            prefix_tokens=prefix_tokens,
+            branch_factor=branch_factor,
+            depth=depth,
+            step_tokens=block_size * 2,
+            block_size=block_size,
+        )
+        print(
+            f"prefix={beam.prefix_tokens:>7,} tokens | forks={beam.forks:,} | "
+            f"{beam.fork_us:.2f} µs/fork | peak blocks={beam.peak_used_blocks:,}"
+        )
+    print("=" * 60)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Paged KV cache benchmark suite")
+    parser.add_argument("--tokens", type=int, default=100_000, help="Tokens appended to the long-running session")
+    parser.add_argument("--block-size", type=int, default=16, help="Tokens per KV block")
+    parser.add_argument("--chunk", type=int, default=1, help="Tokens appended per decode step")
+    parser.add_argument("--sink-blocks", type=int, default=1, help="Attention-sink blocks kept at the start")
+    parser.add_argument("--window-blocks", type=int, default=256, help="Recent blocks kept in the sliding window")
+    parser.add_argument("--branch-factor", type=int, default=5, help="Children forked per beam node")
+    parser.add_argument("--depth", type=int, default=10, help="Beam tree depth")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(
+        total_tokens=args.tokens,
+        block_size=args.block_size,
+        chunk_tokens=args.chunk,
+        sink_blocks=args.sink_blocks,
+        window_blocks=args.window_blocks,
+        branch_factor=args.branch_factor,
+        depth=args.depth,
+    )
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import copy
+import functools
 import json
+import logging
 import math
 import random
-from dataclasses import dataclass
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+from src.backend.bounded_cache import LRUCache
+from src.backend.columnar_events import ColumnarEventTable
+from src.backend.pattern_scanner import MultiPatternScanner
 
 try:  # Optional dependency (recommended path)
     import pandas as pd
@@ -14,8 +23,18 @@ except Exception:  # pragma: no cover - optional branch
     pd = None
     CausalModel = None
 
+try:  # Optional dependency (vectorized OLS path)
+    import numpy as np
+except Exception:  # pragma: no cover - optional branch
+    np = None
+
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_EVENTS_PATH = Path("storage/frozen_lights/events.jsonl")
+DEFAULT_COMMON_CAUSES = ("load_level", "industry", "scenario")
+DEFAULT_TREATMENTS = ("auto_switch_deep", "summary_to_story", "strategic_to_operational")
+DEFAULT_KPI_OUTCOMES = ("resilience", "adaptability", "resource_efficiency", "stakeholder_trust")
 DEFAULT_RELEVANT_EVENTS = {
     "resonance.drift.intervention",
     "resonance.intervention.evaluated",
@@ -30,35 +49,410 @@ class EstimateResult:
     interpretation: str
     sample_size: int
     refute_results: dict[str, Any] | None = None
+    confidence_interval: dict[str, Any] | None = None
     error: str | None = None
 
 
-class CausalPolicyLab:
-    def __init__(self, events_file: str | Path = DEFAULT_EVENTS_PATH):
-        self.events_file = Path(events_file)
-        self.rows = self.load_events()
+@dataclass
+class _DoWhyModel:
+    """Prepared frame (inside `model`), causal model and identified estimand for one spec and data version."""
 
-    def load_events(self) -> list[dict[str, Any]]:
-        if not self.events_file.exists():
-            return []
-        rows: list[dict[str, Any]] = []
-        for line in self.events_file.read_text(encoding="utf-8").splitlines():
+    model: Any
+    identified: Any
+    sample_size: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class EventLogTail:
+    """Follows an append-only JSONL log from a remembered byte offset.
+
+    Only bytes appended since the previous `read_new()` are read. A trailing line
+    without its newline is held back while it is still being written, i.e. until
+    it parses as a complete JSON object (no strict prefix of an object does), so a
+    log whose last line never gets a newline is still fully ingested. A shrinking
+    file or a new inode (truncation / rotation) restarts from offset 0 and reports
+    a reset.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.offset = 0
+        self.skipped_lines = 0
+        self._inode: int | None = None
+        self._partial = b""
+
+    def read_new(self) -> tuple[list[dict[str, Any]], bool]:
+        """Return `(new_records, reset)`; after a reset the records restart from the top of the file."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            reset = self.offset > 0 or bool(self._partial)
+            self._restart(None)
+            return [], reset
+
+        reset = False
+        if (self._inode is not None and stat.st_ino != self._inode) or stat.st_size < self.offset:
+            reset = True
+            self._restart(stat.st_ino)
+        self._inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return [], reset
+
+        with self.path.open("rb") as fh:
+            fh.seek(self.offset)
+            chunk = fh.read()
+        self.offset += len(chunk)
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        if self._partial.strip() and _is_json_object(self._partial):
+            # Complete record without its newline; a newline written later is just an empty line.
+            lines.append(self._partial)
+            self._partial = b""
+
+        records: list[dict[str, Any]] = []
+        for line in lines:
             if not line.strip():
                 continue
-            payload = json.loads(line)
-            if payload.get("event_type") not in DEFAULT_RELEVANT_EVENTS:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                self.skipped_lines += 1
+        return records, reset
+
+    def _restart(self, inode: int | None) -> None:
+        self.offset = 0
+        self._partial = b""
+        self._inode = inode
+
+
+def _is_json_object(line: bytes) -> bool:
+    try:
+        return isinstance(json.loads(line), dict)
+    except ValueError:
+        return False
+
+
+class OnlineOLSAccumulator:
+    """Running X'X / X'y for one `(treatment, outcome, common_causes)` spec.
+
+    Statistics live in a superset basis: intercept, treatment, one column per
+    numeric confounder and one indicator per category seen for categorical ones.
+    The batch design (first sorted category dropped, confounders missing from any
+    row dropped) is therefore always a sub-block, and a new category only appends
+    a zero row/column. A confounder that turns out categorical after numeric
+    values were accumulated cannot be re-encoded in place: `add_rows` then
+    returns False and the owner rebuilds with `categorical_hint`.
+    """
+
+    def __init__(
+        self,
+        treatment: str,
+        outcome: str,
+        common_causes: list[str] | tuple[str, ...],
+        *,
+        categorical: frozenset[str] = frozenset(),
+    ):
+        self.treatment = treatment
+        self.outcome = outcome
+        self.common_causes = tuple(common_causes)
+        self.count = 0
+        self.xtx: list[list[float]] = [[0.0, 0.0], [0.0, 0.0]]
+        self.xty: list[float] = [0.0, 0.0]
+        self.dropped: set[str] = set()
+        self.kinds: dict[str, str] = {cause: "categorical" for cause in categorical}
+        self.numeric_index: dict[str, int] = {}
+        self.categories: dict[str, dict[str, int]] = {}
+        self.categorical_hint = frozenset(categorical)
+
+    def add_rows(self, rows: Iterable[dict[str, Any]]) -> bool:
+        for row in rows:
+            if not self._add_row(row):
+                return False
+        return True
+
+    def effect(self) -> float:
+        features = [0, 1]
+        for cause in self.common_causes:
+            if cause in self.dropped or cause not in self.kinds:
+                continue
+            if self.kinds[cause] == "numeric":
+                features.append(self.numeric_index[cause])
+            else:
+                categories = self.categories[cause]
+                features.extend(categories[category] for category in sorted(categories)[1:])
+        xtx = [[self.xtx[i][j] for j in features] for i in features]
+        xty = [self.xty[i] for i in features]
+        coeffs = _solve_linear_system(xtx, xty)
+        return float(coeffs[1])
+
+    def _add_row(self, row: dict[str, Any]) -> bool:
+        treatment_value = _coerce_treatment(row, self.treatment)
+        outcome_value = _coerce_numeric(row.get(self.outcome))
+        if treatment_value is None or outcome_value is None:
+            return True
+
+        x: list[tuple[int, float]] = [(0, 1.0), (1, treatment_value)]
+        for cause in self.common_causes:
+            if cause not in row:
+                self.dropped.add(cause)
                 continue
-            row: dict[str, Any] = {
-                "event_type": payload.get("event_type"),
-                "timestamp": payload.get("timestamp"),
-            }
-            embedded = payload.get("payload", {})
-            if isinstance(embedded, dict):
-                row.update(embedded)
-            if "confounders" in row and isinstance(row["confounders"], dict):
-                row.update(row.pop("confounders"))
-            rows.append(row)
-        return rows
+            value = row[cause]
+            numeric = isinstance(value, (int, float, bool))
+            kind = self.kinds.setdefault(cause, "numeric" if numeric else "categorical")
+            if kind == "numeric":
+                if not numeric:
+                    self.categorical_hint = self.categorical_hint | {cause}
+                    return False
+                index = self.numeric_index.get(cause)
+                if index is None:
+                    index = self.numeric_index[cause] = self._add_feature()
+                x.append((index, float(value)))
+            else:
+                categories = self.categories.setdefault(cause, {})
+                index = categories.get(str(value))
+                if index is None:
+                    index = categories[str(value)] = self._add_feature()
+                x.append((index, 1.0))
+
+        for i, xi in x:
+            self.xty[i] += xi * outcome_value
+            xtx_row = self.xtx[i]
+            for j, xj in x:
+                xtx_row[j] += xi * xj
+        self.count += 1
+        return True
+
+    def _add_feature(self) -> int:
+        for xtx_row in self.xtx:
+            xtx_row.append(0.0)
+        self.xtx.append([0.0] * (len(self.xtx) + 1))
+        self.xty.append(0.0)
+        return len(self.xty) - 1
+
+
+class CausalPolicyLab:
+    """Causal estimates over Freeze Light events.
+
+    Events are loaded lazily and incrementally: the first estimate (or an explicit
+    `refresh()`) reads the log, later refreshes only read appended lines, and
+    `start_auto_refresh()` keeps the rows fresh from a background thread.
+    Rows are stored column-wise in a `ColumnarEventTable`, so estimates slice
+    typed columns instead of walking per-event dicts.
+    `data_version` advances whenever the loaded rows change. Specs passed to
+    `register_spec()` keep online X'X / X'y statistics updated on every refresh,
+    so `estimate_online()` costs O(k^3) regardless of the row count.
+
+    Adjusted-OLS estimates can carry a percentile bootstrap interval. It is
+    opt-in (`bootstrap_resamples=0` by default): each request may ask for
+    resamples, but at most `bootstrap_max_cells` resampled rows are drawn, so
+    latency stays bounded as the log grows.
+    `refute_workers > 1` fans out both placebo rounds and bootstrap batches
+    over one shared process pool.
+
+    With DoWhy installed, the frame, `CausalModel` and identified estimand are
+    cached per spec and data version, so repeat requests (any method) only run
+    `estimate_effect`. `dowhy_refute` picks how the slow `random_common_cause`
+    refutation runs: "inline", "off", or "background" (default), where results
+    first report `status: "pending"` and the finished refutation is attached to
+    the cached estimate once it completes. Refutations share the model's lock
+    with `estimate_effect`, and those queued for an older data version are
+    dropped when new events arrive.
+    """
+
+    def __init__(
+        self,
+        events_file: str | Path = DEFAULT_EVENTS_PATH,
+        *,
+        refute_rounds: int = 32,
+        refute_seed: int | None = 0,
+        refute_workers: int = 1,
+        estimate_cache_size: int = 256,
+        bootstrap_resamples: int = 0,
+        bootstrap_seed: int | None = 0,
+        bootstrap_max_cells: int = 10_000_000,
+        confidence_level: float = 0.95,
+        dowhy_refute: str = "background",
+        dowhy_model_cache_size: int = 8,
+    ):
+        if refute_rounds < 0:
+            raise ValueError("refute_rounds must be >= 0")
+        if refute_workers <= 0:
+            raise ValueError("refute_workers must be > 0")
+        if bootstrap_resamples < 0 or bootstrap_max_cells < 0:
+            raise ValueError("bootstrap_resamples and bootstrap_max_cells must be >= 0")
+        if not 0.0 < confidence_level < 1.0:
+            raise ValueError("confidence_level must be in (0, 1)")
+        if dowhy_refute not in ("inline", "background", "off"):
+            raise ValueError("dowhy_refute must be 'inline', 'background' or 'off'")
+        self.events_file = Path(events_file)
+        self.refute_rounds = refute_rounds
+        self.refute_seed = refute_seed
+        self.refute_workers = refute_workers
+        self.bootstrap_resamples = bootstrap_resamples
+        self.bootstrap_seed = bootstrap_seed
+        self.bootstrap_max_cells = bootstrap_max_cells
+        self.confidence_level = confidence_level
+        self._refute_pool: ProcessPoolExecutor | None = None
+        self._refute_pool_lock = threading.Lock()
+        # Keys embed `data_version`, so entries go stale (and age out) as soon as new
+        # events are ingested; no TTL is needed.
+        self._estimates: LRUCache[tuple[Any, ...], dict[str, Any]] = LRUCache(estimate_cache_size)
+        self.dowhy_refute = dowhy_refute
+        self._dowhy_models: LRUCache[tuple[Any, ...], _DoWhyModel] = LRUCache(dowhy_model_cache_size)
+        self._dowhy_refutes: LRUCache[tuple[Any, ...], dict[str, Any]] = LRUCache(estimate_cache_size)
+        self._refute_jobs: dict[tuple[Any, ...], Future] = {}
+        self._refute_jobs_lock = threading.Lock()
+        self._background: ThreadPoolExecutor | None = None
+        self.table = ColumnarEventTable()
+        self.data_version = 0
+        self._tail = EventLogTail(self.events_file)
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: threading.Thread | None = None
+        self._online: dict[tuple[str, str, tuple[str, ...]], OnlineOLSAccumulator] = {}
+
+    def shutdown(self) -> None:
+        self.stop_auto_refresh()
+        with self._refute_pool_lock:
+            pool, self._refute_pool = self._refute_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        background, self._background = self._background, None
+        if background is not None:
+            background.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        """Loaded rows materialized as dicts (a copy; estimates read `table` directly)."""
+        return self.table.to_rows()
+
+    def load_events(self) -> list[dict[str, Any]]:
+        """Read every relevant event from the log (one-off full scan; `refresh()` is incremental)."""
+        records, _ = EventLogTail(self.events_file).read_new()
+        return [row for row in map(_event_row, records) if row is not None]
+
+    def refresh(self) -> int:
+        """Ingest events appended since the last refresh; returns how many rows were added."""
+        with self._refresh_lock:
+            records, reset = self._tail.read_new()
+            new_rows = [row for row in map(_event_row, records) if row is not None]
+            self._loaded = True
+            if reset:
+                # Swap in a fresh table so estimates reading the old one are unaffected.
+                self.table = ColumnarEventTable(new_rows)
+            elif new_rows:
+                self.table.append_rows(new_rows)
+            if reset or new_rows:
+                self.data_version += 1
+                self._drop_stale_refutes()
+            for key, accumulator in list(self._online.items()):
+                if reset or not accumulator.add_rows(new_rows):
+                    self._online[key] = self._build_accumulator(key, accumulator.categorical_hint)
+            return len(new_rows)
+
+    def register_spec(
+        self,
+        treatment: str,
+        outcome: str,
+        common_causes: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Start maintaining online sufficient statistics for this estimate spec."""
+        self.ensure_loaded()
+        key = (treatment, outcome, tuple(common_causes or DEFAULT_COMMON_CAUSES))
+        with self._refresh_lock:
+            if key not in self._online:
+                self._online[key] = self._build_accumulator(key, frozenset())
+            return self._describe_spec(self._online[key])
+
+    def registered_specs(self) -> list[dict[str, Any]]:
+        with self._refresh_lock:
+            return [self._describe_spec(accumulator) for accumulator in self._online.values()]
+
+    def estimate_online(
+        self,
+        treatment: str,
+        outcome: str,
+        common_causes: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Adjusted OLS effect from a registered spec's running statistics (no row scan, no refutation)."""
+        self.ensure_loaded()
+        key = (treatment, outcome, tuple(common_causes or DEFAULT_COMMON_CAUSES))
+        with self._refresh_lock:
+            accumulator = self._online.get(key)
+            if accumulator is None:
+                raise KeyError(f"spec not registered: {key}")
+            sample_size = accumulator.count
+            effect = accumulator.effect() if sample_size >= 5 else None
+        if effect is None:
+            return EstimateResult(
+                causal_effect=None,
+                method="online_ols",
+                interpretation="Insufficient rows for causal estimation.",
+                sample_size=sample_size,
+                error="Insufficient data",
+            ).__dict__
+        return EstimateResult(
+            causal_effect=effect,
+            method="online_ols",
+            interpretation=f"Approximate adjusted effect for `{treatment}` on `{outcome}` is {effect:.4f}.",
+            sample_size=sample_size,
+        ).__dict__
+
+    def _build_accumulator(
+        self,
+        key: tuple[str, str, tuple[str, ...]],
+        categorical: frozenset[str],
+    ) -> OnlineOLSAccumulator:
+        treatment, outcome, common_causes = key
+        while True:
+            accumulator = OnlineOLSAccumulator(treatment, outcome, common_causes, categorical=categorical)
+            if accumulator.add_rows(self.table.iter_rows()):
+                return accumulator
+            categorical = accumulator.categorical_hint
+
+    @staticmethod
+    def _describe_spec(accumulator: OnlineOLSAccumulator) -> dict[str, Any]:
+        return {
+            "treatment": accumulator.treatment,
+            "outcome": accumulator.outcome,
+            "common_causes": list(accumulator.common_causes),
+            "sample_size": accumulator.count,
+            "features": len(accumulator.xty),
+        }
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.refresh()
+
+    def start_auto_refresh(self, interval_s: float) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be > 0")
+        if self._refresh_thread is not None:
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._auto_refresh_loop,
+            args=(interval_s,),
+            name="causal-lab-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def stop_auto_refresh(self) -> None:
+        thread, self._refresh_thread = self._refresh_thread, None
+        if thread is not None:
+            self._refresh_stop.set()
+            thread.join()
+
+    def _auto_refresh_loop(self, interval_s: float) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:  # pragma: no cover - keep the refresher alive on I/O errors
+                logger.exception("causal lab refresh failed")
+            if self._refresh_stop.wait(interval_s):
+                return
 
     def estimate_causal_effect(
         self,
@@ -66,9 +460,155 @@ class CausalPolicyLab:
         outcome: str,
         common_causes: list[str] | None = None,
         method: str = "propensity_score_matching",
+        *,
+        use_cache: bool = True,
+        bootstrap_resamples: int | None = None,
+    ) -> dict[str, Any]:
+        """Effect of `treatment` on `outcome`; `bootstrap_resamples` overrides the lab default (0 disables)."""
+        common_causes = common_causes or list(DEFAULT_COMMON_CAUSES)
+        resamples = self.bootstrap_resamples if bootstrap_resamples is None else max(0, int(bootstrap_resamples))
+        self.ensure_loaded()
+        key = (
+            treatment,
+            outcome,
+            tuple(common_causes),
+            method,
+            self.data_version,
+            self.refute_rounds,
+            self.refute_seed,
+            resamples,
+            self.bootstrap_seed,
+            self.bootstrap_max_cells,
+            self.confidence_level,
+        )
+        if use_cache:
+            cached = self._estimates.get(key)
+            if cached is not None:
+                return copy.deepcopy(self._attach_background_refute(key, cached))
+
+        result = self._estimate_uncached(treatment, outcome, common_causes, method, resamples)
+        if use_cache:
+            self._estimates.put(key, copy.deepcopy(result))
+        return result
+
+    def estimate_matrix(
+        self,
+        treatments: list[str],
+        outcomes: list[str],
+        common_causes: list[str] | None = None,
+        *,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Adjusted OLS effect of every treatment on every outcome in one pass (no refutation).
+
+        Pairs are grouped by the rows they select; each group shares one confounder
+        design and one orthonormal basis, and all of its (treatment, outcome)
+        effects come out of a single residualized product (`_residual_effects`).
+        Effects equal what `estimate_causal_effect` reports via `adjusted_ols`.
+        """
+        common_causes = common_causes or list(DEFAULT_COMMON_CAUSES)
+        self.ensure_loaded()
+        key = ("matrix", tuple(treatments), tuple(outcomes), tuple(common_causes), self.data_version)
+        if use_cache:
+            cached = self._estimates.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        effects: dict[str, dict[str, float | None]] = {treatment: dict.fromkeys(outcomes) for treatment in treatments}
+        sample_sizes: dict[str, dict[str, int]] = {treatment: dict.fromkeys(outcomes, 0) for treatment in treatments}
+        if np is not None:
+            self._fill_matrix_numpy(treatments, outcomes, common_causes, effects, sample_sizes)
+        else:
+            for treatment in treatments:
+                for outcome in outcomes:
+                    prepared = self._prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
+                    sample_sizes[treatment][outcome] = len(prepared)
+                    effects[treatment][outcome] = (
+                        _ols_treatment_effect(prepared, "__treatment__", "__outcome__", common_causes)
+                        if len(prepared) >= 5
+                        else None
+                    )
+        result = {
+            "method": "adjusted_ols",
+            "treatments": list(treatments),
+            "outcomes": list(outcomes),
+            "common_causes": list(common_causes),
+            "data_version": self.data_version,
+            "effects": effects,
+            "sample_sizes": sample_sizes,
+        }
+        if use_cache:
+            self._estimates.put(key, copy.deepcopy(result))
+        return result
+
+    def _fill_matrix_numpy(
+        self,
+        treatments: list[str],
+        outcomes: list[str],
+        common_causes: list[str],
+        effects: dict[str, dict[str, float | None]],
+        sample_sizes: dict[str, dict[str, int]],
+    ) -> None:
+        table = self.table
+        size = len(table)
+        treatment_values = {name: table.treatment_vector(name, size) for name in treatments}
+        outcome_values = {name: table.numeric_vector(name, size) for name in outcomes}
+        # Group pairs by selected rows; with complete KPI rows this is a single group.
+        groups: dict[bytes, tuple[Any, dict[str, list[str]]]] = {}
+        for treatment, t_values in treatment_values.items():
+            t_valid = ~np.isnan(t_values)
+            for outcome, y_values in outcome_values.items():
+                mask = t_valid & ~np.isnan(y_values)
+                group = groups.setdefault(np.packbits(mask).tobytes(), (mask, {}))
+                group[1].setdefault(treatment, []).append(outcome)
+
+        for mask, pairs in groups.values():
+            selected = np.flatnonzero(mask)
+            group_outcomes = sorted({outcome for names in pairs.values() for outcome in names}, key=outcomes.index)
+            for treatment, names in pairs.items():
+                for outcome in names:
+                    sample_sizes[treatment][outcome] = len(selected)
+            if len(selected) < 5:
+                continue
+            basis = _orthonormal_basis(table.confounder_design(selected, common_causes, size))
+            block = _residual_effects(
+                basis,
+                np.column_stack([treatment_values[treatment][selected] for treatment in pairs]),
+                np.column_stack([outcome_values[outcome][selected] for outcome in group_outcomes]),
+            )
+            for row, (treatment, names) in enumerate(pairs.items()):
+                for outcome in names:
+                    effects[treatment][outcome] = float(block[row, group_outcomes.index(outcome)])
+
+    def cache_stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = self._estimates.stats()
+        stats["data_version"] = self.data_version
+        stats["dowhy_models"] = self._dowhy_models.stats()
+        with self._refute_jobs_lock:
+            stats["pending_refutes"] = len(self._refute_jobs)
+        return stats
+
+    def _attach_background_refute(self, key: tuple[Any, ...], result: dict[str, Any]) -> dict[str, Any]:
+        """Swap a pending refutation for its finished record (and update the cached entry)."""
+        refute = result.get("refute_results") or {}
+        if refute.get("status") != "pending":
+            return result
+        done = self._dowhy_refutes.get(key[:5])
+        if done is None:
+            return result
+        result = {**result, "refute_results": done}
+        self._estimates.put(key, copy.deepcopy(result))
+        return result
+
+    def _estimate_uncached(
+        self,
+        treatment: str,
+        outcome: str,
+        common_causes: list[str],
+        method: str,
+        resamples: int,
     ) -> dict[str, Any]:
-        common_causes = common_causes or ["load_level", "industry", "scenario"]
-        if not self.rows:
+        if not len(self.table):
             return EstimateResult(
                 causal_effect=None,
                 method=method,
@@ -83,19 +623,46 @@ class CausalPolicyLab:
             except Exception:
                 pass
 
-        return self._estimate_with_adjustment(treatment, outcome, common_causes)
+        return self._estimate_with_adjustment(treatment, outcome, common_causes, resamples)
 
     def _estimate_with_dowhy(self, treatment: str, outcome: str, common_causes: list[str], method: str) -> dict[str, Any]:
-        frame_rows = self._prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
-        if len(frame_rows) < 5:
+        version = self.data_version
+        spec_key = (treatment, outcome, tuple(common_causes), version)
+        prepared = self._dowhy_models.get(spec_key)
+        if prepared is None:
+            prepared = self._prepare_dowhy_model(treatment, outcome, common_causes)
+            self._dowhy_models.put(spec_key, prepared)
+        if prepared.model is None:
             return EstimateResult(
                 causal_effect=None,
                 method=f"dowhy.{method}",
                 interpretation="Insufficient rows for causal estimation.",
-                sample_size=len(frame_rows),
+                sample_size=prepared.sample_size,
                 error="Insufficient data",
             ).__dict__
 
+        with prepared.lock:
+            estimate = prepared.model.estimate_effect(
+                prepared.identified,
+                method_name=f"backdoor.{method}",
+                confidence_intervals=False,
+            )
+        effect_value = float(estimate.value)
+        return EstimateResult(
+            causal_effect=effect_value,
+            method=f"dowhy.{method}",
+            interpretation=f"Positive value means `{treatment}` improves `{outcome}` by {effect_value:.4f} units.",
+            sample_size=prepared.sample_size,
+            refute_results=self._dowhy_refute_results(
+                prepared, estimate, (treatment, outcome, tuple(common_causes), method, version)
+            ),
+        ).__dict__
+
+    def _prepare_dowhy_model(self, treatment: str, outcome: str, common_causes: list[str]) -> _DoWhyModel:
+        frame_rows = self._prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
+        if len(frame_rows) < 5:
+            return _DoWhyModel(model=None, identified=None, sample_size=len(frame_rows))
+
         frame = pd.DataFrame(frame_rows)
         graph = "digraph {__treatment__ -> __outcome__;" + " ".join(
             [f"{cause} -> __treatment__; {cause} -> __outcome__;" for cause in common_causes if cause in frame.columns]
@@ -108,75 +675,185 @@ class CausalPolicyLab:
             common_causes=[c for c in common_causes if c in frame.columns],
             proceed_when_unidentifiable=True,
         )
-        identified = model.identify_effect()
-        estimate = model.estimate_effect(
-            identified,
-            method_name=f"backdoor.{method}",
-            confidence_intervals=False,
-        )
-        refute = model.refute_estimate(identified, estimate, "random_common_cause")
-        effect_value = float(estimate.value)
-        return EstimateResult(
-            causal_effect=effect_value,
-            method=f"dowhy.{method}",
-            interpretation=f"Positive value means `{treatment}` improves `{outcome}` by {effect_value:.4f} units.",
-            sample_size=len(frame_rows),
-            refute_results={"method": "random_common_cause", "result": str(refute)},
-        ).__dict__
+        return _DoWhyModel(model=model, identified=model.identify_effect(), sample_size=len(frame_rows))
+
+    def _dowhy_refute_results(
+        self,
+        prepared: _DoWhyModel,
+        estimate: Any,
+        refute_key: tuple[Any, ...],
+    ) -> dict[str, Any] | None:
+        if self.dowhy_refute == "off":
+            return None
+        if self.dowhy_refute == "inline":
+            # The model's data frame is shared with concurrent `estimate_effect` calls.
+            with prepared.lock:
+                refute = prepared.model.refute_estimate(prepared.identified, estimate, "random_common_cause")
+            return {"method": "random_common_cause", "status": "completed", "result": str(refute)}
+
+        done = self._dowhy_refutes.get(refute_key)
+        if done is not None:
+            return done
+        with self._refute_jobs_lock:
+            if refute_key[4] != self.data_version:
+                # New events arrived while estimating; the cached entry for this version is already stale.
+                return {"method": "random_common_cause", "status": "stale"}
+            job = None
+            if refute_key not in self._refute_jobs:
+                job = self._refute_jobs[refute_key] = self._get_background().submit(_run_dowhy_refute, prepared, estimate)
+        if job is not None:
+            # Outside the lock: the callback runs inline if the job already finished.
+            job.add_done_callback(functools.partial(self._store_refute, refute_key))
+        return {"method": "random_common_cause", "status": "pending"}
+
+    def _store_refute(self, refute_key: tuple[Any, ...], job: Future) -> None:
+        if not job.cancelled() and refute_key[4] == self.data_version:
+            self._dowhy_refutes.put(refute_key, job.result())
+        with self._refute_jobs_lock:
+            if self._refute_jobs.get(refute_key) is job:
+                del self._refute_jobs[refute_key]
+
+    def _drop_stale_refutes(self) -> None:
+        """Forget refutations queued for older data versions (cancelling any not yet started)."""
+        with self._refute_jobs_lock:
+            stale = [key for key in self._refute_jobs if key[4] != self.data_version]
+            jobs = [self._refute_jobs.pop(key) for key in stale]
+        for job in jobs:
+            # Outside the lock: cancelling runs `_store_refute` inline.
+            job.cancel()
+
+    def _get_background(self) -> ThreadPoolExecutor:
+        # Called with `_refute_jobs_lock` held.
+        if self._background is None:
+            self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="causal-refute")
+        return self._background
 
-    def _estimate_with_adjustment(self, treatment: str, outcome: str, common_causes: list[str]) -> dict[str, Any]:
-        prepared = self._prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
-        if len(prepared) < 5:
+    def _estimate_with_adjustment(
+        self,
+        treatment: str,
+        outcome: str,
+        common_causes: list[str],
+        resamples: int = 0,
+    ) -> dict[str, Any]:
+        if np is not None:
+            # Column slices straight into the design matrix; no per-row dicts.
+            design, y = self.table.design(treatment=treatment, outcome=outcome, common_causes=common_causes)
+            sample_size = len(y)
+        else:
+            prepared = self._prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
+            sample_size = len(prepared)
+        if sample_size < 5:
             return EstimateResult(
                 causal_effect=None,
                 method="adjusted_ols",
                 interpretation="Insufficient rows for causal estimation.",
-                sample_size=len(prepared),
+                sample_size=sample_size,
                 error="Insufficient data",
             ).__dict__
 
-        effect = _ols_treatment_effect(prepared, "__treatment__", "__outcome__", common_causes)
-        refute = self._random_refute(prepared, common_causes)
+        if np is not None:
+            effect = _lstsq_treatment_effect(design, y)
+            refute = self._design_refute(design, y)
+            interval = self._bootstrap_interval(resamples, sample_size, design=design, y=y)
+        else:
+            effect = _ols_treatment_effect(prepared, "__treatment__", "__outcome__", common_causes)
+            refute = self._random_refute(prepared, common_causes)
+            interval = self._bootstrap_interval(resamples, sample_size, prepared=prepared, common_causes=common_causes)
         return EstimateResult(
             causal_effect=effect,
             method="adjusted_ols",
             interpretation=f"Approximate adjusted effect for `{treatment}` on `{outcome}` is {effect:.4f}.",
-            sample_size=len(prepared),
+            sample_size=sample_size,
             refute_results=refute,
+            confidence_interval=interval,
         ).__dict__
 
     def _prepare_rows(self, *, treatment: str, outcome: str, common_causes: list[str]) -> list[dict[str, Any]]:
-        prepared: list[dict[str, Any]] = []
-        for row in self.rows:
-            treatment_value = _coerce_treatment(row, treatment)
-            outcome_value = _coerce_numeric(row.get(outcome))
-            if treatment_value is None or outcome_value is None:
-                continue
-            out_row = {"__treatment__": treatment_value, "__outcome__": outcome_value}
-            for cause in common_causes:
-                if cause in row:
-                    out_row[cause] = row[cause]
-            prepared.append(out_row)
-        return prepared
-
-    def _random_refute(self, prepared: list[dict[str, Any]], common_causes: list[str], rounds: int = 32) -> dict[str, Any]:
-        baseline = _ols_treatment_effect(prepared, "__treatment__", "__outcome__", common_causes)
-        null_effects: list[float] = []
-        treatment_values = [row["__treatment__"] for row in prepared]
-        for _ in range(rounds):
-            placebo = [dict(row) for row in prepared]
-            random.shuffle(treatment_values)
-            for idx, value in enumerate(treatment_values):
-                placebo[idx]["__treatment__"] = value
-            null_effects.append(abs(_ols_treatment_effect(placebo, "__treatment__", "__outcome__", common_causes)))
-        stronger = sum(1 for val in null_effects if val >= abs(baseline))
+        return self.table.prepare_rows(treatment=treatment, outcome=outcome, common_causes=common_causes)
+
+    def _random_refute(
+        self,
+        prepared: list[dict[str, Any]],
+        common_causes: list[str],
+        rounds: int | None = None,
+        *,
+        seed: int | None = None,
+    ) -> dict[str, Any]:
+        """Placebo test: re-estimate with the treatment column permuted `rounds` times.
+
+        With NumPy the design is built once and every round only permutes the
+        treatment column (see `_permutation_null_effects`); rounds are evaluated in
+        fixed-size batches, optionally fanned out over `refute_workers` processes.
+        Results depend only on the data, `rounds` and `seed`, never on worker count.
+        """
+        if np is not None:
+            design = _design_matrix(prepared, "__treatment__", common_causes)
+            y = np.fromiter((row["__outcome__"] for row in prepared), dtype=float, count=len(prepared))
+            return self._design_refute(design, y, rounds, seed=seed)
+        rounds = self.refute_rounds if rounds is None else rounds
+        seed = self.refute_seed if seed is None else seed
+        baseline, null_effects = _permutation_null_effects_python(prepared, common_causes, rounds=rounds, seed=seed)
+        return _refute_summary(baseline, null_effects, rounds, seed)
+
+    def _design_refute(self, design: Any, y: Any, rounds: int | None = None, *, seed: int | None = None) -> dict[str, Any]:
+        """`_random_refute` for an already-built NumPy design (column 1 = treatment)."""
+        rounds = self.refute_rounds if rounds is None else rounds
+        seed = self.refute_seed if seed is None else seed
+        baseline, null_effects = _permutation_null_effects(
+            design,
+            y,
+            rounds=rounds,
+            seed=seed,
+            executor=self._get_refute_pool() if self.refute_workers > 1 else None,
+        )
+        return _refute_summary(baseline, null_effects, rounds, seed)
+
+    def _bootstrap_interval(
+        self,
+        requested: int,
+        sample_size: int,
+        *,
+        design: Any = None,
+        y: Any = None,
+        prepared: list[dict[str, Any]] | None = None,
+        common_causes: list[str] | None = None,
+    ) -> dict[str, Any] | None:
+        """Percentile bootstrap interval for the treatment effect, within the resample budget."""
+        max_cells = self.bootstrap_max_cells if design is not None else min(self.bootstrap_max_cells, _PYTHON_BOOTSTRAP_MAX_CELLS)
+        resamples = min(requested, max_cells // max(1, sample_size))
+        if resamples < 2:
+            return None
+        seed = self.bootstrap_seed
+        if design is not None:
+            effects = _bootstrap_effects(
+                design,
+                y,
+                resamples=resamples,
+                seed=seed,
+                executor=self._get_refute_pool() if self.refute_workers > 1 else None,
+            )
+        else:
+            effects = _bootstrap_effects_python(prepared or [], common_causes or [], resamples=resamples, seed=seed)
+        effects.sort()
+        tail = (1.0 - self.confidence_level) / 2
+        mean = sum(effects) / len(effects)
         return {
-            "method": "randomized_placebo",
-            "baseline_effect": baseline,
-            "p_value": stronger / max(1, len(null_effects)),
-            "null_rounds": rounds,
+            "method": "bootstrap_percentile",
+            "level": self.confidence_level,
+            "lower": _percentile(effects, tail),
+            "upper": _percentile(effects, 1.0 - tail),
+            "std_error": math.sqrt(sum((val - mean) ** 2 for val in effects) / (len(effects) - 1)),
+            "resamples": resamples,
+            "requested_resamples": requested,
+            "seed": seed,
         }
 
+    def _get_refute_pool(self) -> ProcessPoolExecutor:
+        with self._refute_pool_lock:
+            if self._refute_pool is None:
+                self._refute_pool = ProcessPoolExecutor(max_workers=self.refute_workers)
+            return self._refute_pool
+
     def recommend_policies(self, top_n: int = 3) -> list[dict[str, Any]]:
         candidates = [
             ("auto_switch_deep", "stakeholder_trust"),
@@ -200,6 +877,32 @@ class CausalPolicyLab:
         return sorted(results, key=lambda item: item["effect_size"], reverse=True)[:top_n]
 
 
+def _run_dowhy_refute(prepared: _DoWhyModel, estimate: Any) -> dict[str, Any]:
+    try:
+        # Same lock as `estimate_effect`: the refuter mutates the model's shared data frame.
+        with prepared.lock:
+            refute = prepared.model.refute_estimate(prepared.identified, estimate, "random_common_cause")
+    except Exception as exc:
+        logger.exception("background refutation failed")
+        return {"method": "random_common_cause", "status": "failed", "error": str(exc)}
+    return {"method": "random_common_cause", "status": "completed", "result": str(refute)}
+
+
+def _event_row(payload: dict[str, Any]) -> dict[str, Any] | None:
+    if payload.get("event_type") not in DEFAULT_RELEVANT_EVENTS:
+        return None
+    row: dict[str, Any] = {
+        "event_type": payload.get("event_type"),
+        "timestamp": payload.get("timestamp"),
+    }
+    embedded = payload.get("payload", {})
+    if isinstance(embedded, dict):
+        row.update(embedded)
+    if "confounders" in row and isinstance(row["confounders"], dict):
+        row.update(row.pop("confounders"))
+    return row
+
+
 def _coerce_numeric(value: Any) -> float | None:
     if isinstance(value, bool) or value is None:
         return None
@@ -222,11 +925,74 @@ def _coerce_treatment(row: dict[str, Any], treatment_name: str) -> float | None:
     if isinstance(generic, bool):
         return float(int(generic))
     if isinstance(generic, (int, float)):
-        return float(generic)
+        return None if math.isnan(generic) else float(generic)
     return 1.0 if str(generic) == treatment_name else 0.0
 
 
 def _ols_treatment_effect(rows: list[dict[str, Any]], treatment_col: str, outcome_col: str, common_causes: list[str]) -> float:
+    if np is not None:
+        return _ols_treatment_effect_numpy(rows, treatment_col, outcome_col, common_causes)
+    return _ols_treatment_effect_python(rows, treatment_col, outcome_col, common_causes)
+
+
+def _design_matrix(rows: list[dict[str, Any]], treatment_col: str, common_causes: list[str]) -> Any:
+    """NumPy design matrix `[intercept, treatment, confounders...]`, mirroring the pure-Python feature set.
+
+    Categorical confounders are one-hot encoded against their first (sorted) category;
+    confounders missing from any row are dropped, as in `_ols_treatment_effect_python`.
+    """
+    size = len(rows)
+    columns = [np.ones(size), np.fromiter((row[treatment_col] for row in rows), dtype=float, count=size)]
+    for cause in common_causes:
+        values = [row.get(cause) for row in rows if cause in row]
+        if len(values) != size:
+            continue
+        if all(isinstance(v, (int, float, bool)) for v in values):
+            columns.append(np.asarray(values, dtype=float))
+        else:
+            # Dict-encode in one pass (far cheaper than sorting strings), then
+            # renumber codes so category ranks follow sorted order.
+            index: dict[str, int] = {}
+            codes = np.fromiter((index.setdefault(str(v), len(index)) for v in values), dtype=np.intp, count=size)
+            if len(index) > 1:
+                rank = np.empty(len(index), dtype=np.intp)
+                for position, category in enumerate(sorted(index)):
+                    rank[index[category]] = position
+                columns.append((rank[codes][:, None] == np.arange(1, len(index))).astype(float))
+    return np.column_stack(columns)
+
+
+def _ols_treatment_effect_numpy(
+    rows: list[dict[str, Any]],
+    treatment_col: str,
+    outcome_col: str,
+    common_causes: list[str],
+) -> float:
+    design = _design_matrix(rows, treatment_col, common_causes)
+    y = np.fromiter((row[outcome_col] for row in rows), dtype=float, count=len(rows))
+    return _lstsq_treatment_effect(design, y)
+
+
+def _lstsq_treatment_effect(design: Any, y: Any) -> float:
+    coeffs, *_ = np.linalg.lstsq(design, y, rcond=None)
+    return float(coeffs[1]) if len(coeffs) > 1 else 0.0
+
+
+def _ols_treatment_effect_python(
+    rows: list[dict[str, Any]],
+    treatment_col: str,
+    outcome_col: str,
+    common_causes: list[str],
+) -> float:
+    features, feature_values = _python_features(rows, treatment_col, common_causes)
+    return _python_ols(features, feature_values, [float(row[outcome_col]) for row in rows])
+
+
+def _python_features(
+    rows: list[dict[str, Any]],
+    treatment_col: str,
+    common_causes: list[str],
+) -> tuple[list[str], dict[str, list[float]]]:
     features = ["__intercept__", treatment_col]
     feature_values: dict[str, list[float]] = {"__intercept__": [1.0] * len(rows), treatment_col: [float(row[treatment_col]) for row in rows]}
 
@@ -244,22 +1010,213 @@ def _ols_treatment_effect(rows: list[dict[str, Any]], treatment_col: str, outcom
                 key = f"{cause}::{category}"
                 features.append(key)
                 feature_values[key] = [1.0 if str(v) == category else 0.0 for v in values]
+    return features, feature_values
+
 
+def _python_ols(
+    features: list[str],
+    feature_values: dict[str, list[float]],
+    y: list[float],
+    weights: list[int] | None = None,
+) -> float:
+    """Treatment coefficient of (optionally row-weighted) OLS; rows with weight 0 are skipped."""
     xtx = [[0.0 for _ in features] for _ in features]
     xty = [0.0 for _ in features]
-    y = [float(row[outcome_col]) for row in rows]
 
-    for row_idx in range(len(rows)):
+    for row_idx in range(len(y)):
+        weight = 1 if weights is None else weights[row_idx]
+        if not weight:
+            continue
         x = [feature_values[name][row_idx] for name in features]
         for i, xi in enumerate(x):
-            xty[i] += xi * y[row_idx]
+            wxi = weight * xi
+            xty[i] += wxi * y[row_idx]
             for j, xj in enumerate(x):
-                xtx[i][j] += xi * xj
+                xtx[i][j] += wxi * xj
 
     coeffs = _solve_linear_system(xtx, xty)
     return float(coeffs[1]) if len(coeffs) > 1 else 0.0
 
 
+_REFUTE_BATCH_CELLS = 2_000_000
+
+
+_BOOTSTRAP_BATCH_CELLS = 2_000_000
+_PYTHON_BOOTSTRAP_MAX_CELLS = 500_000
+
+
+def _bootstrap_effects(
+    design: Any,
+    y: Any,
+    *,
+    resamples: int,
+    seed: int | None,
+    executor: ProcessPoolExecutor | None = None,
+) -> list[float]:
+    """Treatment coefficients (column 1) refit on `resamples` row resamples of one design.
+
+    A resample is a vector of per-row draw counts (bincount weights), and its fit
+    solves X'WX b = X'Wy. The pairwise column products of `[design | y]` are built
+    once, so a batch of weight vectors yields every X'WX / X'Wy with a single
+    `(batch, n) @ (n, k(k+1)/2 + k)` product; no resampled copies are made. As in
+    `_permutation_null_effects`, batch sizes and per-batch seeds depend only on
+    the data, so pooled and inline runs agree.
+    """
+    rows, width = design.shape
+    batch_resamples = max(1, min(resamples, _BOOTSTRAP_BATCH_CELLS // max(1, rows)))
+    sizes = [min(batch_resamples, resamples - start) for start in range(0, resamples, batch_resamples)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    upper = np.triu_indices(width)
+    products = np.column_stack([design[:, upper[0]] * design[:, upper[1]], design * y[:, None]])
+    args = [(products, width, size, child) for size, child in zip(sizes, seeds)]
+    if executor is not None and len(args) > 1:
+        batches = list(executor.map(_bootstrap_batch, *zip(*args)))
+    else:
+        batches = [_bootstrap_batch(*arg) for arg in args]
+    return [float(value) for batch in batches for value in batch]
+
+
+def _bootstrap_batch(products: Any, width: int, size: int, seed: Any) -> Any:
+    rng = np.random.default_rng(seed)
+    rows = len(products)
+    draws = rng.integers(0, rows, size=(size, rows)) + rows * np.arange(size)[:, None]
+    weights = np.bincount(draws.ravel(), minlength=size * rows).reshape(size, rows).astype(float)
+    sums = weights @ products
+    upper = np.triu_indices(width)
+    xtx = np.empty((size, width, width))
+    xtx[:, upper[0], upper[1]] = sums[:, : len(upper[0])]
+    xtx[:, upper[1], upper[0]] = sums[:, : len(upper[0])]
+    xty = sums[:, len(upper[0]) :]
+    # pinv(X'WX) X'Wy is the minimum-norm least-squares fit, like `lstsq`, even when a
+    # resample misses a category and the k x k system turns singular.
+    return np.einsum("bij,bj->bi", np.linalg.pinv(xtx), xty)[:, 1]
+
+
+def _bootstrap_effects_python(
+    prepared: list[dict[str, Any]],
+    common_causes: list[str],
+    *,
+    resamples: int,
+    seed: int | None,
+) -> list[float]:
+    features, feature_values = _python_features(prepared, "__treatment__", common_causes)
+    y = [float(row["__outcome__"]) for row in prepared]
+    rng = random.Random(seed)
+    size = len(y)
+    effects: list[float] = []
+    for _ in range(resamples):
+        weights = [0] * size
+        for _ in range(size):
+            weights[rng.randrange(size)] += 1
+        effects.append(_python_ols(features, feature_values, y, weights))
+    return effects
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    # Linear interpolation between order statistics (NumPy's default method).
+    position = fraction * (len(sorted_values) - 1)
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def _refute_summary(baseline: float, null_effects: list[float], rounds: int, seed: int | None) -> dict[str, Any]:
+    stronger = sum(1 for val in null_effects if abs(val) >= abs(baseline))
+    return {
+        "method": "randomized_placebo",
+        "baseline_effect": baseline,
+        "p_value": stronger / max(1, len(null_effects)),
+        "null_rounds": rounds,
+        "seed": seed,
+    }
+
+
+def _permutation_null_effects(
+    design: Any,
+    y: Any,
+    *,
+    rounds: int,
+    seed: int | None,
+    executor: ProcessPoolExecutor | None = None,
+) -> tuple[float, list[float]]:
+    """Baseline and placebo treatment effects from one design matrix (column 1 = treatment).
+
+    By Frisch-Waugh-Lovell the treatment coefficient is `t~'y~ / t~'t~`, where `~`
+    is the residual after projecting out the other regressors. That projection is
+    computed once, so a batch of permuted treatment columns `P` costs one
+    `U'P` product: `coef = P'y~ / (t't - ||U'P||^2)` because `U'y~ = 0`.
+    """
+    treatment = design[:, 1]
+    basis = _orthonormal_basis(np.delete(design, 1, axis=1))
+    y_resid = y - basis @ (basis.T @ y)
+    t_resid = treatment - basis @ (basis.T @ treatment)
+    denom = float(t_resid @ t_resid)
+    baseline = float(t_resid @ y_resid) / denom if denom > 1e-12 else 0.0
+
+    # Batches are sized from the data alone so the random streams (one per batch)
+    # and therefore the results do not depend on how batches are scheduled.
+    batch_rounds = max(1, min(rounds, _REFUTE_BATCH_CELLS // max(1, len(y))))
+    sizes = [min(batch_rounds, rounds - start) for start in range(0, rounds, batch_rounds)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(basis, treatment, y_resid, size, child) for size, child in zip(sizes, seeds)]
+    if executor is not None and len(args) > 1:
+        batches = list(executor.map(_null_effect_batch, *zip(*args)))
+    else:
+        batches = [_null_effect_batch(*arg) for arg in args]
+    return baseline, [float(value) for batch in batches for value in batch]
+
+
+def _orthonormal_basis(matrix: Any) -> Any:
+    """Orthonormal basis `U` of the column space of `matrix` (rank-revealing SVD)."""
+    basis, singular, _ = np.linalg.svd(matrix, full_matrices=False)
+    return basis[:, singular > singular.max(initial=0.0) * max(matrix.shape) * np.finfo(float).eps]
+
+
+def _residual_effects(basis: Any, treatments: Any, outcomes: Any) -> Any:
+    """Treatment coefficients for every (treatment column, outcome column) pair sharing confounders `basis`.
+
+    Frisch-Waugh-Lovell: residualize both sides against the confounders once, then
+    `effect[i, j] = t~_i'y~_j / t~_i't~_i`, i.e. one matrix product for all pairs.
+    """
+    t_resid = treatments - basis @ (basis.T @ treatments)
+    y_resid = outcomes - basis @ (basis.T @ outcomes)
+    denom = np.einsum("ij,ij->j", t_resid, t_resid)
+    numer = t_resid.T @ y_resid
+    safe = np.where(denom > 1e-12, denom, 1.0)[:, None]
+    return np.where(denom[:, None] > 1e-12, numer / safe, 0.0)
+
+
+def _null_effect_batch(basis: Any, treatment: Any, y_resid: Any, size: int, seed: Any) -> Any:
+    rng = np.random.default_rng(seed)
+    permuted = rng.permuted(np.tile(treatment, (size, 1)), axis=1).T
+    projected = basis.T @ permuted
+    denom = float(treatment @ treatment) - np.einsum("ij,ij->j", projected, projected)
+    numer = permuted.T @ y_resid
+    return np.where(denom > 1e-12, numer / np.where(denom > 1e-12, denom, 1.0), 0.0)
+
+
+def _permutation_null_effects_python(
+    prepared: list[dict[str, Any]],
+    common_causes: list[str],
+    *,
+    rounds: int,
+    seed: int | None,
+) -> tuple[float, list[float]]:
+    # Without NumPy, still skip the per-round row copies: only the treatment
+    # column of the shared feature table is swapped between rounds.
+    features, feature_values = _python_features(prepared, "__treatment__", common_causes)
+    y = [float(row["__outcome__"]) for row in prepared]
+    baseline = _python_ols(features, feature_values, y)
+    rng = random.Random(seed)
+    treatment_values = list(feature_values["__treatment__"])
+    null_effects: list[float] = []
+    for _ in range(rounds):
+        rng.shuffle(treatment_values)
+        feature_values["__treatment__"] = treatment_values
+        null_effects.append(_python_ols(features, feature_values, y))
+    return baseline, null_effects
+
+
 def _solve_linear_system(a: list[list[float]], b: list[float]) -> list[float]:
     n = len(b)
     aug = [row[:] + [b[idx]] for idx, row in enumerate(a)]
@@ -292,6 +1249,14 @@ class PolicyDecision:
     rewritten_action: str | None = None
 
 
+_IMPACT_SCANNER = MultiPatternScanner(
+    {
+        "pdpa": ("national_id", "face_embedding"),
+        "charter": ("dark_pattern",),
+    }
+)
+
+
 class CausalIntegrityGuard:
     """Real-time governance gate for Thai PDPA-aware proposals."""
 
@@ -303,7 +1268,15 @@ class CausalIntegrityGuard:
         ]
 
     def evaluate(self, proposal: PolicyProposal) -> PolicyDecision:
-        simulation = self._simulate_impact(proposal)
+        return self._decide(self._simulate_impact(proposal))
+
+    def evaluate_many(self, proposals: list[PolicyProposal]) -> list[PolicyDecision]:
+        """`evaluate` for a batch: all payloads are joined and scanned with one regex pass per rule group."""
+        hits = _IMPACT_SCANNER.scan_many(proposal.payload for proposal in proposals)
+        return [self._decide(_impact_from_hits(found)) for found in hits]
+
+    @staticmethod
+    def _decide(simulation: dict[str, bool]) -> PolicyDecision:
         if not simulation["pdpa_safe"]:
             return PolicyDecision(
                 status="rewrite",
@@ -315,7 +1288,8 @@ class CausalIntegrityGuard:
         return PolicyDecision(status="commit", reason="Proposal passed causal and governance checks")
 
     def _simulate_impact(self, proposal: PolicyProposal) -> dict[str, bool]:
-        payload_text = json.dumps(proposal.payload, ensure_ascii=False).lower()
-        pdpa_safe = "national_id" not in payload_text and "face_embedding" not in payload_text
-        charter_compliant = "dark_pattern" not in payload_text
-        return {"pdpa_safe": pdpa_safe, "charter_compliant": charter_compliant}
+        return _impact_from_hits(_IMPACT_SCANNER.scan(proposal.payload))
+
+
+def _impact_from_hits(found: frozenset[str]) -> dict[str, bool]:
+    return {"pdpa_safe": "pdpa" not in found, "charter_compliant": "charter" not in found}
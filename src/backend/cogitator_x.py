@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Callable
+from itertools import count, islice
+from pathlib import Path
+from typing import Any, Callable, Iterable
+import asyncio
+import hashlib
+import heapq
+import inspect
+import json
+import logging
 import math
+import os
 import re
+import sys
+import threading
+import time
 
-from src.backend.paged_kv_cache import PagedKVBlockManager
+from src.backend.bounded_cache import LRUCache
+from src.backend.paged_kv_cache import SharedPagedKVBlockManager
+from src.backend.reasoning_profile import AdaptiveProfileSelector
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -17,48 +34,181 @@ class ReasoningTrace:
     language_mode: str = "mixed"
 
 
-@dataclass
-class SearchNode:
-    """A node in a lightweight MCTS-style reasoning tree."""
+class SearchTree:
+    """Array-backed MCTS tree: node statistics live in parallel lists indexed by node id.
+
+    Children of a node are created together, so they occupy the contiguous id range
+    `child_start[node] : child_start[node] + child_count[node]`.
+    """
+
+    ROOT = 0
+
+    def __init__(self, root_trace: ReasoningTrace) -> None:
+        self.traces: list[ReasoningTrace] = [root_trace]
+        self.parent: list[int] = [-1]
+        self.visits: list[int] = [0]
+        self.value_sum: list[float] = [0.0]
+        self.prior: list[float] = [0.0]
+        self.child_start: list[int] = [0]
+        self.child_count: list[int] = [0]
+        self.child_visit_total: list[int] = [0]
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def value(self, node_id: int) -> float:
+        visits = self.visits[node_id]
+        return self.value_sum[node_id] / visits if visits > 0 else 0.0
+
+    def children(self, node_id: int) -> range:
+        start = self.child_start[node_id]
+        return range(start, start + self.child_count[node_id])
+
+    def add_children(self, node_id: int, traces: list[ReasoningTrace], prior: float) -> range:
+        start = len(self.traces)
+        for trace in traces:
+            self.traces.append(trace)
+            self.parent.append(node_id)
+            self.visits.append(0)
+            self.value_sum.append(0.0)
+            self.prior.append(prior)
+            self.child_start.append(0)
+            self.child_count.append(0)
+            self.child_visit_total.append(0)
+        self.child_start[node_id] = start
+        self.child_count[node_id] = len(traces)
+        return range(start, start + len(traces))
+
+    def backpropagate(self, node_id: int, reward: float) -> None:
+        visits, value_sum, parent, child_visit_total = self.visits, self.value_sum, self.parent, self.child_visit_total
+        while node_id >= 0:
+            visits[node_id] += 1
+            value_sum[node_id] += reward
+            parent_id = parent[node_id]
+            if parent_id >= 0:
+                child_visit_total[parent_id] += 1
+            node_id = parent_id
+
+    def max_depth(self) -> int:
+        # Parents always precede their children, so one forward pass suffices.
+        depth = [0] * len(self.parent)
+        for node_id in range(1, len(self.parent)):
+            depth[node_id] = depth[self.parent[node_id]] + 1
+        return max(depth)
+
+
+class SearchProfile:
+    """Cumulative per-phase wall time and counters for one profiled search."""
+
+    PHASES = ("select", "expand", "prm", "outcome", "backprop", "pangenes", "early_stop")
 
-    trace: ReasoningTrace
-    visits: int = 0
-    value_sum: float = 0.0
-    prior: float = 0.0
-    children: list["SearchNode"] = field(default_factory=list)
+    def __init__(self) -> None:
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.counters = {"iterations": 0, "candidates": 0, "gems_learned": 0}
+        self._last = time.perf_counter()
 
-    @property
-    def value(self) -> float:
-        return self.value_sum / self.visits if self.visits > 0 else 0.0
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.seconds[phase] += now - self._last
+        self._last = now
+
+    def as_dict(self, tree: SearchTree) -> dict[str, object]:
+        total = sum(self.seconds.values())
+        return {
+            "phase_ms": {phase: round(seconds * 1000.0, 4) for phase, seconds in self.seconds.items()},
+            "phase_share": {phase: round(seconds / total, 4) if total else 0.0 for phase, seconds in self.seconds.items()},
+            "counters": dict(self.counters),
+            "tree": {
+                "node_count": len(tree),
+                "max_depth": tree.max_depth(),
+                "root_children": tree.child_count[tree.ROOT],
+            },
+        }
 
 
 class ProcessRewardModel:
     """Step-level verifier that scores each reasoning step."""
 
+    _REASONING_TOKENS = ("therefore", "because", "compute", "=>", "equation")
+    _VERIFICATION_TOKENS = ("contradiction", "re-check", "verify", "backtrack")
+    # One zero-width scan finds every signal group; no token is a prefix of another,
+    # so the lookahead reports the same matches as the per-token substring checks.
+    _STEP_SIGNALS = re.compile(
+        "(?=(?P<reasoning>{})|(?P<numeric>\\d)|(?P<verification>{}))".format(
+            "|".join(map(re.escape, _REASONING_TOKENS)),
+            "|".join(map(re.escape, _VERIFICATION_TOKENS)),
+        )
+    )
+
+    def __init__(self, *, cache_size: int = 4096) -> None:
+        self._score_cache: LRUCache[str, float] = LRUCache(max_entries=cache_size)
+
     def evaluate_step(self, step: str, context: str) -> float:
-        del context
-        step_lower = step.lower()
-        reward = 0.4
-        if any(token in step_lower for token in ("therefore", "because", "compute", "=>", "equation")):
-            reward += 0.2
-        if re.search(r"\d", step_lower):
-            reward += 0.2
-        if any(token in step_lower for token in ("contradiction", "re-check", "verify", "backtrack")):
-            reward += 0.2
-        return min(1.0, reward)
+        key = self._cache_key(step, context)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            return cached
+        score = self._score_normalized(key)
+        self._score_cache.put(key, score)
+        return score
+
+    def evaluate_steps(self, steps: list[str], context: str = "") -> list[float]:
+        """Batch path: each distinct step is looked up (or scanned) once."""
+        scores: dict[str, float] = {}
+        results: list[float] = []
+        for step in steps:
+            key = self._cache_key(step, context)
+            score = scores.get(key)
+            if score is None:
+                score = self._score_cache.get(key)
+                if score is None:
+                    score = self._score_normalized(key)
+                    self._score_cache.put(key, score)
+                scores[key] = score
+            results.append(score)
+        return results
 
     def evaluate_trace(self, trace: ReasoningTrace, prompt: str) -> float:
         if not trace.steps:
             return 0.0
-        step_scores = [self.evaluate_step(step, context=prompt) for step in trace.steps]
+        step_scores = self.evaluate_steps(trace.steps, context=prompt)
         return sum(step_scores) / len(step_scores)
 
+    def cache_stats(self) -> dict[str, int | float]:
+        return self._score_cache.stats()
+
+    def _cache_key(self, step: str, context: str) -> str:
+        # Scores ignore the context today; verifiers that use it must fold it into the key.
+        del context
+        return step.lower()
+
+    def _score_normalized(self, step_lower: str) -> float:
+        signals: set[str | None] = set()
+        for match in self._STEP_SIGNALS.finditer(step_lower):
+            signals.add(match.lastgroup)
+            if len(signals) == 3:
+                break
+        reward = 0.4
+        for _ in signals:
+            reward += 0.2
+        return min(1.0, reward)
+
 
 class RuleBasedOutcomeReward:
-    """Outcome reward function for deterministic tasks."""
+    """Outcome reward function for deterministic tasks.
 
-    def __init__(self, answer_checker: Callable[[str], bool]):
+    `checker_id` names what the checker accepts (e.g. "equals:12"). Solves are
+    only result-cached when it is set: two checkers with the same id must
+    accept the same answers.
+    """
+
+    def __init__(self, answer_checker: Callable[[str], bool], checker_id: str | None = None):
         self.answer_checker = answer_checker
+        self.checker_id = checker_id
+
+    @property
+    def cache_identity(self) -> str | None:
+        return self.checker_id
 
     def evaluate(self, answer: str) -> float:
         return 1.0 if self.answer_checker(answer) else 0.0
@@ -67,18 +217,37 @@ class RuleBasedOutcomeReward:
 class LanguageMixedThoughtGenerator:
     """Generator that emits mixed-language hidden reasoning traces."""
 
+    _INTEGER_PATTERN = re.compile(r"-?\d+")
+
+    def __init__(self, *, cache_size: int = 512, cache_ttl_seconds: float | None = 300.0) -> None:
+        # Candidates are deterministic in (prompt, branch_factor, language), so the
+        # step lists and the parsed answer are built once and shared by every solve.
+        self._candidate_cache: LRUCache[tuple[str, int, str], tuple[str, tuple[tuple[str, ...], ...]]] = LRUCache(
+            max_entries=cache_size,
+            ttl_seconds=cache_ttl_seconds,
+        )
+
     def generate_candidates(self, prompt: str, branch_factor: int, language: str = "mixed") -> list[ReasoningTrace]:
-        candidates: list[ReasoningTrace] = []
-        for idx in range(branch_factor):
-            steps = self._base_steps(prompt=prompt, variant=idx, language=language)
-            candidates.append(
-                ReasoningTrace(
-                    steps=steps,
-                    final_answer=self._final_answer(prompt=prompt),
-                    language_mode=language,
-                )
+        key = (prompt, branch_factor, language)
+        plan = self._candidate_cache.get(key)
+        if plan is None:
+            plan = (
+                self._final_answer(prompt=prompt),
+                tuple(
+                    tuple(self._base_steps(prompt=prompt, variant=idx, language=language))
+                    for idx in range(branch_factor)
+                ),
             )
-        return candidates
+            self._candidate_cache.put(key, plan)
+
+        final_answer, variant_steps = plan
+        return [
+            ReasoningTrace(steps=list(steps), final_answer=final_answer, language_mode=language)
+            for steps in variant_steps
+        ]
+
+    def cache_stats(self) -> dict[str, int | float]:
+        return self._candidate_cache.stats()
 
     @staticmethod
     def _base_steps(prompt: str, variant: int, language: str) -> list[str]:
@@ -96,9 +265,9 @@ class LanguageMixedThoughtGenerator:
             "Step 5: therefore choose the most consistent answer",
         ]
 
-    @staticmethod
-    def _final_answer(prompt: str) -> str:
-        match = re.findall(r"-?\d+", prompt)
+    @classmethod
+    def _final_answer(cls, prompt: str) -> str:
+        match = cls._INTEGER_PATTERN.findall(prompt)
         if len(match) >= 2 and any(op in prompt for op in ("+", "plus", "บวก")):
             values = [int(x) for x in match[:2]]
             return str(values[0] + values[1])
@@ -117,18 +286,132 @@ class PythonToolExecutor:
         return int(left) + int(right)
 
 
-class WisdomGemStore:
-    """Stores crystallized lessons from failed traces."""
+@dataclass(slots=True)
+class _GemEntry:
+    sequence: int
+    hits: int = 1
 
-    def __init__(self) -> None:
-        self._gems: list[str] = []
 
-    def append_gem(self, lesson: str) -> None:
-        if lesson not in self._gems:
-            self._gems.append(lesson)
+class WisdomGemStore:
+    """Stores crystallized lessons from failed traces.
+
+    Lessons are deduplicated through an insertion-ordered dict, capped at `capacity`
+    (oldest evicted first) and, when `log_path` is set, mirrored to an append-only
+    JSONL log that is replayed on start-up and compacted once it doubles the cap.
+    """
+
+    def __init__(self, *, capacity: int = 10_000, log_path: str | Path | None = None) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = capacity
+        self.log_path = Path(log_path) if log_path is not None else None
+        self._gems: dict[str, _GemEntry] = {}
+        self._sequence = 0
+        self._evictions = 0
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        if self.log_path is not None:
+            self._replay_log()
+
+    def __len__(self) -> int:
+        return len(self._gems)
+
+    @property
+    def sequence(self) -> int:
+        """Monotonic counter of gems ever added; pair with `since()` to read deltas."""
+        return self._sequence
+
+    def append_gem(self, lesson: str) -> bool:
+        with self._lock:
+            entry = self._gems.get(lesson)
+            if entry is not None:
+                entry.hits += 1
+                return False
+            self._insert(lesson)
+            self._append_log(lesson)
+            return True
 
     def list_all(self) -> list[str]:
-        return list(self._gems)
+        with self._lock:
+            return list(self._gems)
+
+    def page(self, offset: int = 0, limit: int = 50) -> list[str]:
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must be >= 0")
+        with self._lock:
+            return list(islice(self._gems, offset, offset + limit))
+
+    def top_k(self, k: int = 10) -> list[str]:
+        """Most frequently re-learned lessons first (newest wins ties)."""
+        with self._lock:
+            ranked = heapq.nlargest(k, self._gems.items(), key=lambda item: (item[1].hits, item[1].sequence))
+        return [lesson for lesson, _ in ranked]
+
+    def since(self, sequence: int) -> list[str]:
+        """Gems added after `sequence` that are still retained, oldest first."""
+        fresh: list[str] = []
+        with self._lock:
+            for lesson, entry in reversed(self._gems.items()):
+                if entry.sequence <= sequence:
+                    break
+                fresh.append(lesson)
+        fresh.reverse()
+        return fresh
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "count": len(self._gems),
+                "capacity": self.capacity,
+                "sequence": self._sequence,
+                "evictions": self._evictions,
+                "log_lines": self._log_lines,
+            }
+
+    def compact(self) -> None:
+        with self._lock:
+            self._rewrite_log()
+
+    def _insert(self, lesson: str) -> None:
+        self._sequence += 1
+        self._gems[lesson] = _GemEntry(sequence=self._sequence)
+        while len(self._gems) > self.capacity:
+            del self._gems[next(iter(self._gems))]
+            self._evictions += 1
+
+    def _replay_log(self) -> None:
+        assert self.log_path is not None
+        if not self.log_path.exists():
+            return
+        with self.log_path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                self._log_lines += 1
+                lesson = json.loads(line).get("lesson")
+                if isinstance(lesson, str) and lesson not in self._gems:
+                    self._insert(lesson)
+
+    def _append_log(self, lesson: str) -> None:
+        if self.log_path is None:
+            return
+        if self._log_lines >= 2 * self.capacity:
+            self._rewrite_log()
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"lesson": lesson}, ensure_ascii=False) + "\n")
+        self._log_lines += 1
+
+    def _rewrite_log(self) -> None:
+        if self.log_path is None:
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.log_path.with_suffix(self.log_path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            for lesson in self._gems:
+                fh.write(json.dumps({"lesson": lesson}, ensure_ascii=False) + "\n")
+        tmp_path.replace(self.log_path)
+        self._log_lines = len(self._gems)
 
 
 class PangenesAgent:
@@ -158,12 +441,29 @@ class CogitatorXEngine:
         pangenes: PangenesAgent,
         *,
         c_puct: float = 1.2,
+        batch_workers: int | None = None,
+        result_cache_size: int = 256,
+        result_cache_ttl_seconds: float | None = 60.0,
+        kv_memory: SharedPagedKVBlockManager | None = None,
+        profile_selector: AdaptiveProfileSelector | None = None,
     ) -> None:
         self.generator = generator
         self.prm = prm
         self.pangenes = pangenes
         self.c_puct = c_puct
-        self._memory = PagedKVBlockManager(num_gpu_blocks=64, block_size=16)
+        self.batch_workers = batch_workers or os.cpu_count() or 1
+        self._results: LRUCache[tuple[Any, ...], dict[str, object]] = LRUCache(
+            result_cache_size, ttl_seconds=result_cache_ttl_seconds
+        )
+        self._inflight: dict[tuple[Any, ...], Future[dict[str, object]]] = {}
+        self._inflight_lock = threading.Lock()
+        self._coalesced = 0
+        self._memory = kv_memory if kv_memory is not None else shared_kv_memory()
+        self.profile_selector = profile_selector if profile_selector is not None else AdaptiveProfileSelector()
+        # One pool per (use_processes, workers); pools are only shut down by `shutdown()`,
+        # so a caller holding one can never have it closed underneath it.
+        self._pools: dict[tuple[bool, int], Executor] = {}
+        self._pools_lock = threading.Lock()
 
     def solve(
         self,
@@ -173,29 +473,324 @@ class CogitatorXEngine:
         compute_budget: int = 12,
         base_branch_factor: int = 2,
         language_mode: str = "mixed",
+        deadline_ms: float | None = None,
+        target_confidence: float | None = None,
+        target_visit_share: float | None = None,
+        use_cache: bool = True,
+        profile: bool = False,
+    ) -> dict[str, object]:
+        """Anytime search: runs up to `compute_budget` iterations, stopping early once
+        the best root child reaches `target_confidence`, the most visited root child
+        holds `target_visit_share` of root visits, or `deadline_ms` elapses.
+
+        Completed searches are cached by prompt fingerprint, search settings and the
+        reward's `checker_id`, and concurrent identical calls share one search. Rewards
+        without a `checker_id` are never cached. Pass `use_cache=False` (or call
+        `clear_result_cache()`) after changing the generator or PRM configuration.
+        `profile=True` always runs a fresh search and adds per-phase timings under
+        `profile`; unprofiled searches skip every timer.
+        """
+        search_kwargs = {
+            "compute_budget": compute_budget,
+            "base_branch_factor": base_branch_factor,
+            "language_mode": language_mode,
+            "deadline_ms": deadline_ms,
+            "target_confidence": target_confidence,
+            "target_visit_share": target_visit_share,
+        }
+        if profile:
+            return self._search(prompt, outcome_reward, profile=True, **search_kwargs)
+        if not use_cache or self._results.max_entries == 0 or outcome_reward.cache_identity is None:
+            return self._search(prompt, outcome_reward, **search_kwargs)
+
+        key = (
+            prompt_fingerprint(prompt),
+            compute_budget,
+            base_branch_factor,
+            language_mode,
+            deadline_ms,
+            target_confidence,
+            target_visit_share,
+            outcome_reward.cache_identity,
+        )
+        cached = self._results.get(key)
+        if cached is not None:
+            return self._replay_cached(cached)
+
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+            else:
+                self._coalesced += 1
+        assert pending is not None
+        if not leader:
+            return self._replay_cached(pending.result())
+
+        try:
+            result = self._search(prompt, outcome_reward, **search_kwargs)
+        except BaseException as exc:
+            pending.set_exception(exc)
+            raise
+        else:
+            if result["stop_reason"] != "deadline":
+                # Deadline stops depend on wall-clock timing, so they are not replayable.
+                self._results.put(key, result)
+            pending.set_result(result)
+            return {**result, "hidden_thought": list(result["hidden_thought"]), "cache": "miss"}  # type: ignore[call-overload]
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def solve_auto(
+        self,
+        prompt: str,
+        outcome_reward: RuleBasedOutcomeReward,
+        *,
+        target_confidence: float | None = None,
+        latency_slo_ms: float | None = None,
+        **solve_kwargs: Any,
     ) -> dict[str, object]:
-        root = SearchNode(trace=ReasoningTrace(steps=[], final_answer="", language_mode=language_mode))
+        """`solve` with `(compute_budget, branch_factor)` chosen by the calibrated profile selector.
+
+        Fresh searches feed their latency and confidence back into the selector;
+        result-cache replays do not, since their timing is not a search measurement.
+        """
+        prompt_class, profile = self.profile_selector.select(
+            prompt,
+            target_confidence=target_confidence,
+            latency_slo_ms=latency_slo_ms,
+        )
+        compute_budget, branch_factor = profile
+        result = self.solve(
+            prompt,
+            outcome_reward,
+            compute_budget=compute_budget,
+            base_branch_factor=branch_factor,
+            **solve_kwargs,
+        )
+        if result.get("cache") != "hit":
+            self.profile_selector.record(
+                prompt_class,
+                profile,
+                latency_ms=float(result["elapsed_ms"]),  # type: ignore[arg-type]
+                confidence=float(result["confidence"]),  # type: ignore[arg-type]
+            )
+        result["reasoning_profile"] = {
+            "prompt_class": prompt_class,
+            "compute_budget": compute_budget,
+            "branch_factor": branch_factor,
+        }
+        return result
+
+    def result_cache_stats(self) -> dict[str, int | float]:
+        stats = self._results.stats()
+        with self._inflight_lock:
+            stats["coalesced"] = self._coalesced
+            stats["inflight"] = len(self._inflight)
+        return stats
+
+    def clear_result_cache(self) -> None:
+        self._results.clear()
+
+    def _replay_cached(self, result: dict[str, object]) -> dict[str, object]:
+        # Lessons were learned by the search that produced the entry; a replay adds none.
+        return {
+            **result,
+            "hidden_thought": list(result["hidden_thought"]),  # type: ignore[call-overload]
+            "gem_count": len(self.pangenes.store),
+            "new_gems": [],
+            "cache": "hit",
+        }
+
+    def _search(
+        self,
+        prompt: str,
+        outcome_reward: RuleBasedOutcomeReward,
+        *,
+        compute_budget: int,
+        base_branch_factor: int,
+        language_mode: str,
+        deadline_ms: float | None,
+        target_confidence: float | None,
+        target_visit_share: float | None,
+        profile: bool = False,
+    ) -> dict[str, object]:
+        if deadline_ms is not None and deadline_ms < 0:
+            raise ValueError("deadline_ms must be >= 0")
+        if target_visit_share is not None and not 0.0 < target_visit_share <= 1.0:
+            raise ValueError("target_visit_share must be in (0, 1]")
+
+        started = time.perf_counter()
+        deadline = started + deadline_ms / 1000.0 if deadline_ms is not None else None
+        tree = SearchTree(ReasoningTrace(steps=[], final_answer="", language_mode=language_mode))
+        gem_mark = self.pangenes.store.sequence
+        stop_reason = "budget_exhausted"
+        iterations = 0
+        # Every timer sits behind `prof is not None`, so unprofiled searches pay one
+        # identity check per phase and no clock reads.
+        prof = SearchProfile() if profile else None
 
         for _ in range(compute_budget):
-            leaf = self._select(root)
-            branch_factor = self._adaptive_branch_factor(leaf, base_branch_factor)
-            children = self._expand(leaf=leaf, prompt=prompt, branch_factor=branch_factor, language_mode=language_mode)
+            leaf = self._select(tree)
+            if prof is not None:
+                prof.lap("select")
+            branch_factor = self._adaptive_branch_factor(tree, leaf, base_branch_factor)
+            children = self._expand(
+                tree=tree,
+                leaf=leaf,
+                prompt=prompt,
+                branch_factor=branch_factor,
+                language_mode=language_mode,
+            )
+            if prof is not None:
+                prof.lap("expand")
+                prof.counters["candidates"] += len(children)
 
             for child in children:
-                prm_score = self.prm.evaluate_trace(child.trace, prompt)
-                outcome_score = outcome_reward.evaluate(child.trace.final_answer)
+                trace = tree.traces[child]
+                prm_score = self.prm.evaluate_trace(trace, prompt)
+                if prof is not None:
+                    prof.lap("prm")
+                outcome_score = outcome_reward.evaluate(trace.final_answer)
+                if prof is not None:
+                    prof.lap("outcome")
                 combined = 0.45 * prm_score + 0.55 * outcome_score
-                self._backpropagate(child, combined)
-                self.pangenes.learn_from_failure(prompt, child.trace, prm_score, outcome_score)
-
-        best = self._best_child(root)
-        best_trace = best.trace if best else ReasoningTrace()
-        return {
+                self._backpropagate(tree, child, combined)
+                if prof is not None:
+                    prof.lap("backprop")
+                self.pangenes.learn_from_failure(prompt, trace, prm_score, outcome_score)
+                if prof is not None:
+                    prof.lap("pangenes")
+
+            iterations += 1
+            early_stop = self._early_stop_reason(
+                tree,
+                deadline=deadline,
+                target_confidence=target_confidence,
+                target_visit_share=target_visit_share,
+            )
+            if prof is not None:
+                prof.lap("early_stop")
+            if early_stop is not None:
+                stop_reason = early_stop
+                break
+
+        best = self._best_child(tree)
+        best_trace = tree.traces[best] if best is not None else ReasoningTrace()
+        result: dict[str, object] = {
             "answer": best_trace.final_answer,
-            "confidence": best.value if best else 0.0,
+            "confidence": tree.value(best) if best is not None else 0.0,
             "hidden_thought": best_trace.steps,
-            "gems": self.pangenes.store.list_all(),
+            "gem_count": len(self.pangenes.store),
+            "new_gems": self.pangenes.store.since(gem_mark),
+            "stop_reason": stop_reason,
+            "iterations": iterations,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
         }
+        if prof is not None:
+            prof.counters["iterations"] = iterations
+            prof.counters["gems_learned"] = self.pangenes.store.sequence - gem_mark
+            result["profile"] = prof.as_dict(tree)
+        return result
+
+    def solve_batch(
+        self,
+        prompts: list[str],
+        outcome_reward: RuleBasedOutcomeReward | list[RuleBasedOutcomeReward],
+        *,
+        workers: int | None = None,
+        use_processes: bool = True,
+        **solve_kwargs: Any,
+    ) -> list[dict[str, object]]:
+        """Solve many prompts, fanning out over a thread or process pool.
+
+        Every prompt runs on an isolated replica (own gem store), so results do not
+        depend on the worker count; each result's `new_gems` holds only the lessons
+        learned for that prompt, merged into this engine's store in prompt order.
+        Process pools need picklable answer checkers (module-level functions).
+        Pools are created lazily per `(use_processes, workers)` and kept until
+        `shutdown()`.
+        """
+        rewards = outcome_reward if isinstance(outcome_reward, list) else [outcome_reward] * len(prompts)
+        if len(rewards) != len(prompts):
+            raise ValueError("outcome_reward list must match prompts")
+
+        workers = self.batch_workers if workers is None else workers
+        if workers <= 1 or len(prompts) <= 1:
+            results = [self._solve_isolated(prompt, reward, solve_kwargs) for prompt, reward in zip(prompts, rewards)]
+        elif use_processes:
+            executor = self._solve_pool(workers, use_processes=True)
+            results = list(executor.map(_solve_in_worker, prompts, rewards, [solve_kwargs] * len(prompts)))
+        else:
+            executor = self._solve_pool(workers, use_processes=False)
+            results = list(
+                executor.map(lambda prompt, reward: self._solve_isolated(prompt, reward, solve_kwargs), prompts, rewards)
+            )
+
+        for result in results:
+            self._absorb_gems(result)
+        return results
+
+    async def asolve(
+        self,
+        prompt: str,
+        outcome_reward: RuleBasedOutcomeReward,
+        *,
+        use_processes: bool = False,
+        **solve_kwargs: Any,
+    ) -> dict[str, object]:
+        """Run `solve` off the event loop (worker thread, or the shared process pool)."""
+        if use_processes:
+            loop = asyncio.get_running_loop()
+            executor = self._solve_pool(self.batch_workers, use_processes=True)
+            result = await loop.run_in_executor(executor, _solve_in_worker, prompt, outcome_reward, solve_kwargs)
+        else:
+            result = await asyncio.to_thread(self._solve_isolated, prompt, outcome_reward, solve_kwargs)
+        self._absorb_gems(result)
+        return result
+
+    def shutdown(self) -> None:
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=True)
+
+    def _solve_pool(self, workers: int, *, use_processes: bool) -> Executor:
+        key = (use_processes, workers)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                if use_processes:
+                    pool = ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_solve_worker,
+                        initargs=(self.generator, self.prm, self.c_puct),
+                    )
+                else:
+                    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cogitator-x")
+                self._pools[key] = pool
+            return pool
+
+    def _solve_isolated(
+        self,
+        prompt: str,
+        outcome_reward: RuleBasedOutcomeReward,
+        solve_kwargs: dict[str, Any],
+    ) -> dict[str, object]:
+        replica = CogitatorXEngine(
+            generator=self.generator,
+            prm=self.prm,
+            pangenes=PangenesAgent(WisdomGemStore()),
+            c_puct=self.c_puct,
+            result_cache_size=0,
+        )
+        return replica.solve(prompt, outcome_reward, **solve_kwargs)
+
+    def _absorb_gems(self, result: dict[str, object]) -> None:
+        for lesson in result.get("new_gems", []):  # type: ignore[union-attr]
+            self.pangenes.store.append_gem(lesson)
 
     def solve_with_resonance(
         self,
@@ -205,14 +800,27 @@ class CogitatorXEngine:
         user_id: str,
         resonance_score: float,
         language_mode: str = "mixed",
+        deadline_ms: float | None = None,
+        target_confidence: float | None = None,
+        use_cache: bool = True,
+        admission_timeout_s: float | None = 5.0,
     ) -> dict[str, object]:
-        """Contextual reasoning path that adapts budget from resonance state."""
+        """Contextual reasoning path that adapts budget from resonance state.
+
+        KV memory is reserved on the (shared) block manager for the duration of the
+        search; when the pool is full the call waits up to `admission_timeout_s`.
+        """
         compute_budget = 8 if resonance_score >= 0.6 else 14
         branch_factor = 2 if resonance_score >= 0.6 else 4
 
-        request_id = f"{user_id}:{abs(hash(prompt)) % 1_000_000}"
+        # Unique per call, so concurrent identical requests never collide.
+        request_id = f"{user_id}:{prompt_fingerprint(prompt)[:12]}:{next(_KV_REQUEST_SEQ)}"
         estimated_tokens = max(8, min(48, len(prompt.split()) * 2))
-        self._memory.allocate_for_request(request_id=request_id, num_tokens=estimated_tokens)
+        self._memory.allocate_for_request(
+            request_id=request_id,
+            num_tokens=estimated_tokens,
+            timeout=admission_timeout_s,
+        )
 
         try:
             result = self.solve(
@@ -221,6 +829,9 @@ class CogitatorXEngine:
                 compute_budget=compute_budget,
                 base_branch_factor=branch_factor,
                 language_mode=language_mode,
+                deadline_ms=deadline_ms,
+                target_confidence=target_confidence,
+                use_cache=use_cache,
             )
         finally:
             self._memory.release_request(request_id)
@@ -234,40 +845,112 @@ class CogitatorXEngine:
             result["decision_state"] = "nominal"
         return result
 
-    def _select(self, root: SearchNode) -> SearchNode:
-        node = root
-        while node.children:
-            total_visits = sum(max(child.visits, 1) for child in node.children)
-            node = max(node.children, key=lambda child: self._ucb_score(child, total_visits))
+    def _select(self, tree: SearchTree) -> int:
+        node = tree.ROOT
+        while tree.child_count[node]:
+            sqrt_total = math.sqrt(max(1, tree.child_visit_total[node]))
+            node = max(tree.children(node), key=lambda child: self._ucb_score(tree, child, sqrt_total))
         return node
 
-    def _expand(self, *, leaf: SearchNode, prompt: str, branch_factor: int, language_mode: str) -> list[SearchNode]:
+    def _expand(
+        self,
+        *,
+        tree: SearchTree,
+        leaf: int,
+        prompt: str,
+        branch_factor: int,
+        language_mode: str,
+    ) -> range:
         traces = self.generator.generate_candidates(prompt=prompt, branch_factor=branch_factor, language=language_mode)
-        leaf.children = [SearchNode(trace=trace, prior=1.0 / max(1, branch_factor)) for trace in traces]
-        return leaf.children
+        return tree.add_children(leaf, traces, prior=1.0 / max(1, branch_factor))
 
-    def _backpropagate(self, node: SearchNode, reward: float) -> None:
-        node.visits += 1
-        node.value_sum += reward
+    def _backpropagate(self, tree: SearchTree, node: int, reward: float) -> None:
+        tree.backpropagate(node, reward)
 
-    def _best_child(self, root: SearchNode) -> SearchNode | None:
-        if not root.children:
+    def _best_child(self, tree: SearchTree) -> int | None:
+        children = tree.children(tree.ROOT)
+        if not children:
             return None
-        return max(root.children, key=lambda child: (child.value, child.visits))
+        return max(children, key=lambda child: (tree.value(child), tree.visits[child]))
 
-    def _ucb_score(self, child: SearchNode, total_visits: int) -> float:
-        exploration = self.c_puct * child.prior * math.sqrt(total_visits) / (1 + child.visits)
-        return child.value + exploration
+    def _ucb_score(self, tree: SearchTree, child: int, sqrt_total_visits: float) -> float:
+        exploration = self.c_puct * tree.prior[child] * sqrt_total_visits / (1 + tree.visits[child])
+        return tree.value(child) + exploration
 
-    def _adaptive_branch_factor(self, node: SearchNode, base_branch_factor: int) -> int:
-        if not node.children:
+    def _early_stop_reason(
+        self,
+        tree: SearchTree,
+        *,
+        deadline: float | None,
+        target_confidence: float | None,
+        target_visit_share: float | None,
+    ) -> str | None:
+        children = tree.children(tree.ROOT)
+        if children and target_confidence is not None:
+            best = self._best_child(tree)
+            if best is not None and tree.value(best) >= target_confidence:
+                return "target_confidence"
+        if children and target_visit_share is not None:
+            most_visited = max(tree.visits[child] for child in children)
+            if most_visited >= target_visit_share * max(1, tree.child_visit_total[tree.ROOT]):
+                return "visit_share"
+        if deadline is not None and time.perf_counter() >= deadline:
+            return "deadline"
+        return None
+
+    def _adaptive_branch_factor(self, tree: SearchTree, node: int, base_branch_factor: int) -> int:
+        children = tree.children(node)
+        if not children:
             return base_branch_factor
-        confidence = max(child.value for child in node.children)
+        confidence = max(tree.value(child) for child in children)
         if confidence < 0.5:
             return min(base_branch_factor + 2, 5)
         return base_branch_factor
 
 
+_KV_REQUEST_SEQ = count(1)
+_SHARED_KV_MEMORY: SharedPagedKVBlockManager | None = None
+_SHARED_KV_MEMORY_LOCK = threading.Lock()
+
+
+def shared_kv_memory() -> SharedPagedKVBlockManager:
+    """Process-wide KV block pool used by engines that are not given their own."""
+    global _SHARED_KV_MEMORY
+    with _SHARED_KV_MEMORY_LOCK:
+        if _SHARED_KV_MEMORY is None:
+            _SHARED_KV_MEMORY = SharedPagedKVBlockManager(num_gpu_blocks=64, block_size=16)
+        return _SHARED_KV_MEMORY
+
+
+def prompt_fingerprint(prompt: str) -> str:
+    """Stable (cross-process, unlike `hash()`) digest of a prompt for cache keys."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_WORKER_ENGINE: CogitatorXEngine | None = None
+
+
+def _init_solve_worker(generator: LanguageMixedThoughtGenerator, prm: ProcessRewardModel, c_puct: float) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = CogitatorXEngine(
+        generator=generator,
+        prm=prm,
+        pangenes=PangenesAgent(WisdomGemStore()),
+        c_puct=c_puct,
+        batch_workers=1,
+    )
+
+
+def _solve_in_worker(
+    prompt: str,
+    outcome_reward: RuleBasedOutcomeReward,
+    solve_kwargs: dict[str, Any],
+) -> dict[str, object]:
+    if _WORKER_ENGINE is None:
+        raise RuntimeError("solve worker was not initialized")
+    return _WORKER_ENGINE._solve_isolated(prompt, outcome_reward, solve_kwargs)
+
+
 @dataclass(frozen=True)
 class SynergyResolution:
     """Deterministic orchestration result for cross-category routing."""
@@ -279,7 +962,13 @@ class SynergyResolution:
 
 
 class SynergyResolver:
-    """Rule-based resolver that maps events into coordinated agent actions."""
+    """Rule-based resolver that maps events into coordinated agent actions.
+
+    The rules are compiled once into a decision table keyed by
+    `(channel, trigger, is_high_tech)`; lookups return shared, interned
+    `SynergyResolution` objects. Raw (un-normalized) keys seen at runtime are
+    memoized up to `max_dynamic_entries` so repeat events skip normalization.
+    """
 
     _CHANNEL_AGENT_MAP: dict[str, tuple[str, ...]] = {
         "LINE": ("agentic-brain", "social-commerce"),
@@ -287,47 +976,123 @@ class SynergyResolver:
         "TIKTOK": ("agentic-brain", "content-engine"),
         "LIFF": ("agentic-brain", "identity"),
     }
+    _KNOWN_TRIGGERS: tuple[str, ...] = (
+        "payment_received",
+        "payment_confirmed",
+        "purchase_intent",
+        "order_confirmed",
+        "education_eligible",
+        "comment_detected",
+        "identity_synced",
+        "message_received",
+    )
+
+    def __init__(self, *, max_dynamic_entries: int = 4096) -> None:
+        self.max_dynamic_entries = max_dynamic_entries
+        self._compiled: dict[tuple[str, str, bool], SynergyResolution] = {}
+        for channel in self._CHANNEL_AGENT_MAP:
+            for trigger in self._KNOWN_TRIGGERS:
+                for high_tech in (False, True):
+                    self._compiled[(channel, trigger, high_tech)] = self._build_resolution(channel, trigger, high_tech)
+        self._table: dict[tuple[str, str, bool], SynergyResolution] = dict(self._compiled)
 
     def resolve(self, *, channel: str, trigger: str, payload: dict[str, object] | None = None) -> SynergyResolution:
-        normalized_channel = channel.strip().upper()
-        normalized_trigger = trigger.strip().lower()
-        payload = payload or {}
+        key = (channel, trigger, payload is not None and payload.get("category") == "high-tech")
+        resolution = self._table.get(key)
+        if resolution is None:
+            resolution = self._resolve_slow(key)
+        return resolution
 
-        base_agents = list(self._CHANNEL_AGENT_MAP.get(normalized_channel, ("agentic-brain",)))
+    def resolve_many(
+        self,
+        events: Iterable[tuple[str, str, dict[str, object] | None]],
+    ) -> list[SynergyResolution]:
+        """Resolve `(channel, trigger, payload)` triples in order, e.g. one webhook batch."""
+        table = self._table
+        resolved: list[SynergyResolution] = []
+        for channel, trigger, payload in events:
+            key = (channel, trigger, payload is not None and payload.get("category") == "high-tech")
+            resolution = table.get(key)
+            resolved.append(resolution if resolution is not None else self._resolve_slow(key))
+        return resolved
+
+    def _resolve_slow(self, key: tuple[str, str, bool]) -> SynergyResolution:
+        channel, trigger, high_tech = key
+        normalized = (channel.strip().upper(), trigger.strip().lower(), high_tech)
+        resolution = self._compiled.get(normalized)
+        if resolution is None:
+            resolution = self._build_resolution(*normalized)
+        if len(self._table) < len(self._compiled) + self.max_dynamic_entries:
+            # A racing insert of the same key stores an equal value, so no lock is needed.
+            self._table[key] = resolution
+        return resolution
+
+    @classmethod
+    def _build_resolution(cls, channel: str, trigger: str, high_tech: bool) -> SynergyResolution:
+        base_agents = list(cls._CHANNEL_AGENT_MAP.get(channel, ("agentic-brain",)))
         actions: list[str] = ["log_event"]
 
-        if normalized_channel == "PROMPTPAY" and normalized_trigger in {"payment_received", "payment_confirmed"}:
+        if channel == "PROMPTPAY" and trigger in {"payment_received", "payment_confirmed"}:
             base_agents.append("finops")
             actions.extend(["record_income", "start_financial_workflow"])
 
-        if normalized_channel == "LINE" and normalized_trigger in {"purchase_intent", "order_confirmed"}:
+        if channel == "LINE" and trigger in {"purchase_intent", "order_confirmed"}:
             base_agents.append("fintech")
             actions.extend(["check_bnpl_eligibility", "register_social_commerce_event"])
 
-        if normalized_trigger == "education_eligible" or payload.get("category") == "high-tech":
+        if trigger == "education_eligible" or high_tech:
             base_agents.append("edtech")
             actions.append("send_micro_learning")
 
-        if normalized_channel == "TIKTOK" and normalized_trigger == "comment_detected":
+        if channel == "TIKTOK" and trigger == "comment_detected":
             actions.extend(["create_personalized_reply", "handoff_to_line_oa"])
 
-        agents = tuple(sorted(set(base_agents)))
-        action_plan = tuple(dict.fromkeys(actions))
         return SynergyResolution(
-            channel=normalized_channel,
-            trigger=normalized_trigger,
-            agents=agents,
-            actions=action_plan,
+            channel=sys.intern(channel),
+            trigger=sys.intern(trigger),
+            agents=tuple(sys.intern(agent) for agent in sorted(set(base_agents))),
+            actions=tuple(sys.intern(action) for action in dict.fromkeys(actions)),
         )
 
 
 class AgentFinPay:
-    """Financial agent that verifies PromptPay slips and unlocks services."""
+    """Financial agent that verifies PromptPay slips and unlocks services.
+
+    Each slip `ref_id` is credited at most once: repeats within a batch, refs
+    credited recently by this agent, and refs the DB already recorded (when it
+    provides `recorded_payment_refs`) come back as duplicate slips, whoever
+    submits them. Bank verification is single-flight per `ref_id`, so
+    concurrent callers share one API call. Credited refs are kept in a bounded
+    LRU/TTL cache, so replays are answered without another bank call; bank
+    rejections are not cached because they may be transient. Without the DB
+    lookup, only the `verification_cache_size` most recent refs are remembered.
+    """
+
+    INVALID_SLIP = "สลิปไม่ถูกต้อง กรุณาส่งใหม่อีกครั้ง"
+    UNVERIFIED = "ไม่สามารถยืนยันยอดเงินได้ในขณะนี้"
+    DUPLICATE_SLIP = "สลิปนี้ถูกใช้ยืนยันยอดเงินไปแล้ว"
 
-    def __init__(self, db: object, visual_engine: object, bank_api_client: object | None = None):
+    def __init__(
+        self,
+        db: object,
+        visual_engine: object,
+        bank_api_client: object | None = None,
+        *,
+        max_concurrency: int = 8,
+        verification_cache_size: int = 4096,
+        verification_cache_ttl_s: float | None = None,
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
         self.db = db
         self.visual_engine = visual_engine
         self.bank_api_client = bank_api_client
+        self.max_concurrency = max_concurrency
+        self._inflight: dict[str, asyncio.Future[bool]] = {}
+        # Refs credited (or being credited) by this agent, or found in the DB.
+        self._claimed: LRUCache[str, bool] = LRUCache(verification_cache_size, ttl_seconds=verification_cache_ttl_s)
+        self._coalesced = 0
+        self._duplicates = 0
 
     async def call_bank_api(self, ref_id: str) -> bool:
         if not ref_id:
@@ -337,18 +1102,133 @@ class AgentFinPay:
         result = await self.bank_api_client.verify_reference(ref_id)
         return bool(result)
 
-    async def verify_slip_and_activate(self, image_data: bytes | str, user_id: str) -> str:
-        extracted_data = await self.visual_engine.analyze_slip(image_data)
-
-        if not extracted_data.get("is_valid_slip"):
-            return "สลิปไม่ถูกต้อง กรุณาส่งใหม่อีกครั้ง"
+    async def verify_reference(self, ref_id: str) -> bool:
+        if not ref_id:
+            return False
+        pending = self._inflight.get(ref_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self.call_bank_api(ref_id))
+            self._inflight[ref_id] = pending
+            pending.add_done_callback(lambda _done: self._inflight.pop(ref_id, None))
+        else:
+            self._coalesced += 1
+        # Shielded so one cancelled caller does not cancel the call others wait on.
+        return await asyncio.shield(pending)
 
-        ref_id = str(extracted_data.get("ref_id", "")).strip()
-        is_authentic = await self.call_bank_api(ref_id)
-        if not is_authentic:
-            return "ไม่สามารถยืนยันยอดเงินได้ในขณะนี้"
+    def verification_stats(self) -> dict[str, int]:
+        return {
+            "coalesced": self._coalesced,
+            "inflight": len(self._inflight),
+            "duplicates": self._duplicates,
+            "claimed": len(self._claimed),
+        }
 
-        amount = float(extracted_data.get("amount", 0.0))
-        await self.db.update_payment_status(user_id=user_id, amount=amount, status="COMPLETED")
-        await self.db.activate_service(user_id)
-        return f"ยืนยันยอดเงิน {amount:.2f} บาท เรียบร้อยแล้วค่ะ!"
+    async def verify_slip_and_activate(self, image_data: bytes | str, user_id: str) -> str:
+        return (await self.verify_slips_and_activate([(image_data, user_id)]))[0]
+
+    async def verify_slips_and_activate(self, slips: Iterable[tuple[bytes | str, str]]) -> list[str]:
+        """Verify many `(image_data, user_id)` slips; messages come back in input order.
+
+        Slips are analysed, then each distinct `ref_id` is bank-verified once; both
+        stages run at most `max_concurrency` slips at a time. Only the first slip
+        (in input order) carrying a ref can be credited. Confirmed payments are
+        written with their ref in one batch (`update_payment_statuses` /
+        `activate_services` when the DB provides them, per-row calls otherwise).
+        A slip whose analysis or verification raises gets the "cannot verify"
+        message without affecting the rest of the batch.
+        """
+        slips = list(slips)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(call: Any) -> Any:
+            async with semaphore:
+                return await call
+
+        extracted = await asyncio.gather(
+            *(bounded(self.visual_engine.analyze_slip(image_data)) for image_data, _ in slips), return_exceptions=True
+        )
+        messages: list[str] = [self.UNVERIFIED] * len(slips)
+        candidates: dict[str, tuple[int, float]] = {}
+        for idx, data in enumerate(extracted):
+            if isinstance(data, BaseException):
+                logger.warning("slip analysis failed", exc_info=data)
+                continue
+            if not data.get("is_valid_slip"):
+                messages[idx] = self.INVALID_SLIP
+                continue
+            ref_id = str(data.get("ref_id", "")).strip()
+            if ref_id in candidates or (ref_id and self._claimed.get(ref_id)):
+                messages[idx] = self.DUPLICATE_SLIP
+                self._duplicates += 1
+            elif ref_id:
+                candidates[ref_id] = (idx, float(data.get("amount", 0.0)))
+
+        refs = list(candidates)
+        verified = await asyncio.gather(*(bounded(self.verify_reference(ref)) for ref in refs), return_exceptions=True)
+        approved: list[str] = []
+        for ref_id, authentic in zip(refs, verified):
+            if isinstance(authentic, BaseException):
+                logger.warning("bank verification failed for ref %s", ref_id, exc_info=authentic)
+            elif authentic:
+                approved.append(ref_id)
+
+        fresh = await self._claim(approved)
+        for ref_id in approved:
+            if ref_id not in fresh:
+                messages[candidates[ref_id][0]] = self.DUPLICATE_SLIP
+                self._duplicates += 1
+        payments = [(slips[candidates[ref][0]][1], candidates[ref][1], ref) for ref in fresh]
+        try:
+            if payments:
+                await self._record_payments(payments)
+        except BaseException:
+            self._release(fresh)
+            raise
+        for _, amount, ref_id in payments:
+            messages[candidates[ref_id][0]] = f"ยืนยันยอดเงิน {amount:.2f} บาท เรียบร้อยแล้วค่ะ!"
+        return messages
+
+    async def _claim(self, ref_ids: list[str]) -> list[str]:
+        # Claim synchronously first, so a concurrent batch cannot slip in while the
+        # DB lookup below is awaited; then give back refs the DB already holds.
+        fresh = [ref_id for ref_id in ref_ids if not self._claimed.get(ref_id)]
+        for ref_id in fresh:
+            self._claimed.put(ref_id, True)
+        lookup = getattr(self.db, "recorded_payment_refs", None)
+        if lookup is None or not fresh:
+            return fresh
+        try:
+            recorded = set(await lookup(fresh))
+        except BaseException:
+            self._release(fresh)
+            raise
+        return [ref_id for ref_id in fresh if ref_id not in recorded]
+
+    def _release(self, ref_ids: Iterable[str]) -> None:
+        for ref_id in ref_ids:
+            self._claimed.pop(ref_id)
+
+    async def _record_payments(self, payments: list[tuple[str, float, str]]) -> None:
+        user_ids = list(dict.fromkeys(user_id for user_id, _, _ in payments))
+        batch_update = getattr(self.db, "update_payment_statuses", None)
+        batch_activate = getattr(self.db, "activate_services", None)
+        if batch_update is not None and batch_activate is not None:
+            await batch_update([(user_id, amount, "COMPLETED", ref_id) for user_id, amount, ref_id in payments])
+            await batch_activate(user_ids)
+            return
+        update = self.db.update_payment_status
+        # Older DB adapters predate `gateway_ref_id`; they still get the payment rows.
+        with_ref = _accepts_keyword(update, "gateway_ref_id")
+        for user_id, amount, ref_id in payments:
+            extra = {"gateway_ref_id": ref_id} if with_ref else {}
+            await update(user_id=user_id, amount=amount, status="COMPLETED", **extra)
+        for user_id in user_ids:
+            await self.db.activate_service(user_id)
+
+
+def _accepts_keyword(fn: Callable[..., Any], name: str) -> bool:
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(param.name == name or param.kind is inspect.Parameter.VAR_KEYWORD for param in parameters)
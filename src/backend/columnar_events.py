@@ -0,0 +1,319 @@
+"""Columnar, append-only storage for Freeze Light event rows used by causal estimation."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Iterable, Iterator
+
+try:  # Optional dependency (vectorized selection / design path)
+    import numpy as np
+except Exception:  # pragma: no cover - optional branch
+    np = None
+
+# Per-row value kinds; ABSENT doubles as the null mask.
+ABSENT, INT, FLOAT, BOOL, STR, OBJECT = 0, 1, 2, 3, 4, 5
+_NUMERIC_KINDS = (INT, FLOAT, BOOL)
+# Largest magnitude a float64 holds exactly; bigger ints keep their raw value too.
+_EXACT_INT_LIMIT = 2**53
+
+
+class EventColumn:
+    """One field across all rows: kind mask, float values and dictionary-encoded strings.
+
+    `values` holds `float(raw)` for int/float/bool rows and the `_coerce_numeric`
+    result (NaN when not numeric) for the rest. Every non-numeric row also gets a
+    dictionary code for `str(raw)`; raw values that are not strings (None, lists,
+    dicts) and ints beyond float precision are kept in a sparse side table so rows
+    can be materialized exactly.
+
+    A column only grows when a row sets it: rows at or past `len(column)` are
+    ABSENT, so sparse fields cost nothing for the rows that lack them.
+    """
+
+    __slots__ = ("kinds", "values", "codes", "dictionary", "_index", "objects")
+
+    def __init__(self):
+        self.kinds = bytearray()
+        self.values = array("d")
+        self.codes = array("i")
+        self.dictionary: list[str] = []
+        self._index: dict[str, int] = {}
+        self.objects: dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def kind(self, idx: int) -> int:
+        return self.kinds[idx] if idx < len(self.kinds) else ABSENT
+
+    def append(self, value: Any, row_idx: int) -> None:
+        """Store `value` at `row_idx`, marking any skipped rows before it ABSENT."""
+        self._pad_to(row_idx)
+        if isinstance(value, bool):
+            self.kinds.append(BOOL)
+            self.values.append(float(value))
+            self.codes.append(-1)
+        elif isinstance(value, int):
+            self.kinds.append(INT)
+            self.values.append(float(value))
+            self.codes.append(-1)
+            if abs(value) > _EXACT_INT_LIMIT:
+                self.objects[row_idx] = value
+        elif isinstance(value, float):
+            self.kinds.append(FLOAT)
+            self.values.append(value)
+            self.codes.append(-1)
+        else:
+            if isinstance(value, str):
+                self.kinds.append(STR)
+                text = value
+            else:
+                self.kinds.append(OBJECT)
+                self.objects[row_idx] = value
+                text = str(value)
+            coerced = _parse_float(value)
+            self.values.append(math.nan if coerced is None else coerced)
+            self.codes.append(self.encode(text))
+
+    def _pad_to(self, length: int) -> None:
+        missing = length - len(self.kinds)
+        if missing > 0:
+            self.kinds.extend(bytes(missing))
+            self.values.frombytes(bytes(8 * missing))
+            self.codes.extend(array("i", [-1]) * missing)
+
+    def vectors(self, size: int) -> tuple[Any, Any, Any]:
+        """NumPy `(kinds, values, codes)` over the first `size` rows, ABSENT past the column end."""
+        stored = min(size, len(self.kinds))
+        kinds = np.zeros(size, dtype=np.uint8)
+        values = np.zeros(size, dtype=float)
+        codes = np.full(size, -1, dtype=np.int32)
+        kinds[:stored] = np.frombuffer(bytes(self.kinds[:stored]), dtype=np.uint8)
+        values[:stored] = np.frombuffer(self.values[:stored].tobytes(), dtype=float)
+        codes[:stored] = np.frombuffer(self.codes[:stored].tobytes(), dtype=np.int32)
+        return kinds, values, codes
+
+    def encode(self, text: str) -> int:
+        code = self._index.get(text)
+        if code is None:
+            code = self._index[text] = len(self.dictionary)
+            self.dictionary.append(text)
+        return code
+
+    def code_of(self, text: str) -> int:
+        return self._index.get(text, -2)
+
+    def raw(self, idx: int) -> Any:
+        kind = self.kind(idx)
+        if kind == INT:
+            exact = self.objects.get(idx)
+            return int(self.values[idx]) if exact is None else exact
+        if kind == FLOAT:
+            return self.values[idx]
+        if kind == BOOL:
+            return self.values[idx] != 0.0
+        if kind == STR:
+            return self.dictionary[self.codes[idx]]
+        if kind == OBJECT:
+            return self.objects[idx]
+        return None
+
+    def text(self, idx: int) -> str:
+        """`str(raw)` without materializing the raw value for encoded rows."""
+        kind = self.kind(idx)
+        if kind in (STR, OBJECT):
+            return self.dictionary[self.codes[idx]]
+        return str(self.raw(idx))
+
+    def memory_bytes(self) -> int:
+        return len(self.kinds) + self.values.itemsize * len(self.values) + self.codes.itemsize * len(self.codes)
+
+
+class ColumnarEventTable:
+    """Append-only column store for event rows (one `EventColumn` per field).
+
+    Readers snapshot `len(table)` and only look at that prefix, so an estimate
+    running alongside `append_rows()` always sees whole rows. Each row only
+    touches the columns it sets; shorter columns read as ABSENT.
+    """
+
+    def __init__(self, rows: Iterable[dict[str, Any]] = ()):
+        self._columns: dict[str, EventColumn] = {}
+        self._size = 0
+        self.append_rows(rows)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> dict[str, EventColumn]:
+        return self._columns
+
+    def append_rows(self, rows: Iterable[dict[str, Any]]) -> int:
+        added = 0
+        columns = self._columns
+        for row in rows:
+            row_idx = self._size + added
+            for name, value in row.items():
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = EventColumn()
+                column.append(value, row_idx)
+            added += 1
+        self._size += added
+        return added
+
+    def row(self, idx: int) -> dict[str, Any]:
+        columns = list(self._columns.items())
+        return {name: column.raw(idx) for name, column in columns if column.kind(idx) != ABSENT}
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        size = self._size
+        columns = list(self._columns.items())
+        for idx in range(size):
+            yield {name: column.raw(idx) for name, column in columns if column.kind(idx) != ABSENT}
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return list(self.iter_rows())
+
+    def memory_bytes(self) -> int:
+        return sum(column.memory_bytes() for column in self._columns.values())
+
+    def prepare_rows(self, *, treatment: str, outcome: str, common_causes: list[str]) -> list[dict[str, Any]]:
+        """Same rows as `CausalPolicyLab._prepare_rows` over dicts, read column-wise."""
+        size = self._size
+        prepared: list[dict[str, Any]] = []
+        cause_columns = [(cause, self._columns[cause]) for cause in common_causes if cause in self._columns]
+        for idx in range(size):
+            treatment_value = self._treatment_at(treatment, idx)
+            outcome_value = self._numeric_at(outcome, idx)
+            if treatment_value is None or outcome_value is None:
+                continue
+            out_row: dict[str, Any] = {"__treatment__": treatment_value, "__outcome__": outcome_value}
+            for cause, column in cause_columns:
+                if column.kind(idx) != ABSENT:
+                    out_row[cause] = column.raw(idx)
+            prepared.append(out_row)
+        return prepared
+
+    def design(self, *, treatment: str, outcome: str, common_causes: list[str]) -> tuple[Any, Any]:
+        """NumPy `(design, y)` equal to `_design_matrix(prepare_rows(...))` without building any dicts."""
+        if np is None:
+            raise RuntimeError("ColumnarEventTable.design requires numpy")
+        size = self._size
+        treatment_values = self.treatment_vector(treatment, size)
+        outcome_values = self.numeric_vector(outcome, size)
+        selected = np.flatnonzero(~np.isnan(outcome_values) & ~np.isnan(treatment_values))
+        base = self.confounder_design(selected, common_causes, size)
+        return np.insert(base, 1, treatment_values[selected], axis=1), outcome_values[selected]
+
+    def confounder_design(self, selected: Any, common_causes: list[str], size: int | None = None) -> Any:
+        """`[intercept, confounders...]` over the `selected` row indices (treatment column not included)."""
+        size = self._size if size is None else size
+        columns = [np.ones(len(selected))]
+        for cause in common_causes:
+            block = self._confounder_block(cause, selected, size)
+            if block is not None:
+                columns.append(block)
+        return np.column_stack(columns)
+
+    def numeric_vector(self, name: str, size: int | None = None) -> Any:
+        """Vector form of `_coerce_numeric` over the first `size` rows: NaN where a row would be rejected."""
+        size = self._size if size is None else size
+        column = self._columns.get(name)
+        if column is None:
+            return np.full(size, np.nan)
+        kinds, values, _ = column.vectors(size)
+        values[(kinds == ABSENT) | (kinds == BOOL)] = np.nan
+        return values
+
+    def treatment_vector(self, name: str, size: int | None = None) -> Any:
+        """Vector form of `_coerce_treatment`: the direct numeric column, else the generic
+        `treatment` field (numbers as-is, labels as 1.0 when equal to `name`)."""
+        size = self._size if size is None else size
+        direct = self.numeric_vector(name, size)
+        generic = self._columns.get("treatment")
+        if generic is None:
+            return direct
+        kinds, values, codes = generic.vectors(size)
+        fallback = np.full(size, np.nan)
+        numeric = np.isin(kinds, _NUMERIC_KINDS)
+        fallback[numeric] = values[numeric]
+        labelled = (kinds == STR) | (kinds == OBJECT)
+        fallback[labelled] = (codes[labelled] == generic.code_of(name)).astype(float)
+        for row_idx, raw in generic.objects.items():
+            if row_idx < size and raw is None:
+                fallback[row_idx] = np.nan
+        return np.where(np.isnan(direct), fallback, direct)
+
+    def _confounder_block(self, cause: str, selected: Any, size: int) -> Any | None:
+        column = self._columns.get(cause)
+        if column is None:
+            return None
+        kinds, values, codes = column.vectors(size)
+        kinds = kinds[selected]
+        if (kinds == ABSENT).any():
+            return None
+        if np.isin(kinds, _NUMERIC_KINDS).all():
+            return values[selected]
+
+        if np.isin(kinds, (STR, OBJECT)).all():
+            codes = codes[selected]
+        else:
+            # Mixed numbers and labels: categories are `str(raw)` for every row.
+            local: dict[str, int] = {}
+            codes = np.fromiter(
+                (local.setdefault(column.text(int(idx)), len(local)) for idx in selected),
+                dtype=np.int32,
+                count=len(selected),
+            )
+            names = list(local)
+            return _one_hot(codes, names)
+        present = np.unique(codes)
+        remap = np.full(len(column.dictionary), -1, dtype=np.int32)
+        remap[present] = np.arange(len(present), dtype=np.int32)
+        return _one_hot(remap[codes], [column.dictionary[code] for code in present])
+
+    def _numeric_at(self, name: str, idx: int) -> float | None:
+        column = self._columns.get(name)
+        if column is None:
+            return None
+        kind = column.kind(idx)
+        if kind in (ABSENT, BOOL):
+            return None
+        value = column.values[idx]
+        return None if math.isnan(value) else value
+
+    def _treatment_at(self, name: str, idx: int) -> float | None:
+        direct = self._numeric_at(name, idx)
+        if direct is not None:
+            return direct
+        generic = self._columns.get("treatment")
+        if generic is None:
+            return None
+        kind = generic.kind(idx)
+        if kind == ABSENT or (kind == OBJECT and generic.objects[idx] is None):
+            return None
+        if kind in _NUMERIC_KINDS:
+            value = generic.values[idx]
+            return None if math.isnan(value) else value
+        return 1.0 if generic.dictionary[generic.codes[idx]] == name else 0.0
+
+
+def _one_hot(codes: Any, names: list[str]) -> Any | None:
+    """Indicator columns for every category but the first in sorted order."""
+    if len(names) < 2:
+        return None
+    order = sorted(range(len(names)), key=names.__getitem__)
+    rank = np.empty(len(names), dtype=np.int32)
+    rank[order] = np.arange(len(names), dtype=np.int32)
+    return (rank[codes][:, None] == np.arange(1, len(names))).astype(float)
+
+
+def _parse_float(value: Any) -> float | None:
+    try:
+        converted = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(converted) else converted
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class ComputeSaturatedError(RuntimeError):
+    """Raised when the executor already holds `max_workers + max_queue_depth` jobs."""
+
+
+class ComputeTimeoutError(TimeoutError):
+    """Raised when a job does not finish within its timeout."""
+
+
+class BoundedComputeExecutor:
+    """Shared pool for CPU-bound request handlers, with admission control.
+
+    `run()` keeps the event loop free while `fn` executes on a thread (default) or
+    process pool. At most `max_workers` jobs run and `max_queue_depth` more may
+    wait; beyond that `run()` fails fast with `ComputeSaturatedError` instead of
+    growing an unbounded backlog. A caller that times out stops waiting, but its
+    job keeps its slot until the worker actually finishes (threads cannot be
+    interrupted), so saturation metrics reflect real pool pressure.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        max_queue_depth: int = 32,
+        timeout_s: float | None = 30.0,
+        kind: str = "thread",
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be > 0")
+        if max_queue_depth < 0:
+            raise ValueError("max_queue_depth must be >= 0")
+        if timeout_s is not None and timeout_s <= 0:
+            raise ValueError("timeout_s must be > 0")
+        if kind not in ("thread", "process"):
+            raise ValueError("kind must be 'thread' or 'process'")
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.timeout_s = timeout_s
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._queue_wait_s = 0.0
+        self._run_s = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue_depth
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout_s: float | None = None, **kwargs: Any) -> T:
+        """Run `fn(*args, **kwargs)` on the pool and await its result."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise ComputeSaturatedError(f"compute executor saturated ({self._in_flight}/{self.capacity} jobs)")
+            self._in_flight += 1
+            self._submitted += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            future = self._get_executor().submit(_timed_call, time.time(), functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._finish(None)
+            raise
+        future.add_done_callback(self._finish)
+
+        timeout = self.timeout_s if timeout_s is None else timeout_s
+        try:
+            result, _, _ = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise ComputeTimeoutError(f"compute job exceeded {timeout:.3f}s") from None
+        return result
+
+    def metrics(self) -> dict[str, int | float | str]:
+        with self._lock:
+            finished = self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "peak_in_flight": self._peak_in_flight,
+                "saturation": round(self._in_flight / self.capacity, 4),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_queue_wait_ms": round(self._queue_wait_s / finished * 1000, 3) if finished else 0.0,
+                "avg_run_ms": round(self._run_s / finished * 1000, 3) if finished else 0.0,
+            }
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute")
+            return self._executor
+
+    def _finish(self, future: Future | None) -> None:
+        # Runs when the worker finishes, including jobs whose caller timed out.
+        with self._lock:
+            self._in_flight -= 1
+            if future is None or future.cancelled() or future.exception() is not None:
+                self._failed += 1
+                return
+            _, queue_wait_s, run_s = future.result()
+            self._completed += 1
+            self._queue_wait_s += queue_wait_s
+            self._run_s += run_s
+
+
+def _timed_call(submitted_at: float, call: Callable[[], T]) -> tuple[T, float, float]:
+    # Wall clock for the queue wait so the delta is valid inside a worker process.
+    started = time.time()
+    begin = time.perf_counter()
+    result = call()
+    return result, max(0.0, started - submitted_at), time.perf_counter() - begin
@@ -232,6 +232,10 @@ def init_db() -> None:
             CREATE UNIQUE INDEX IF NOT EXISTS idx_user_contexts_tiktok_user_id_unique
                 ON user_contexts(tiktok_user_id)
                 WHERE tiktok_user_id IS NOT NULL;
+
+            CREATE INDEX IF NOT EXISTS idx_transactions_gateway_ref_id
+                ON transactions(gateway_ref_id)
+                WHERE gateway_ref_id IS NOT NULL;
             """
         )
 
@@ -466,17 +470,61 @@ def link_line_identity(*, user_id: str, line_user_id: str) -> IdentityLinkRecord
     return IdentityLinkRecord(**dict(row))
 
 
-async def update_payment_status(*, user_id: str, amount: float, status: str) -> str:
+def _payment_tx_status(status: str) -> str:
+    return status if status in {"PENDING", "SUCCESS", "FAILED"} else "SUCCESS"
+
+
+async def update_payment_status(*, user_id: str, amount: float, status: str, gateway_ref_id: str | None = None) -> str:
     tx_type = "TOPUP"
-    normalized_status = status if status in {"PENDING", "SUCCESS", "FAILED"} else "SUCCESS"
-    return create_transaction(user_id=user_id, amount=amount, tx_type=tx_type, status=normalized_status)
+    return create_transaction(
+        user_id=user_id,
+        amount=amount,
+        tx_type=tx_type,
+        status=_payment_tx_status(status),
+        gateway_ref_id=gateway_ref_id,
+    )
+
+
+async def update_payment_statuses(updates: list[tuple[str, float, str] | tuple[str, float, str, str | None]]) -> list[str]:
+    """Batch form of `update_payment_status` for `(user_id, amount, status[, gateway_ref_id])` rows: one commit."""
+    timestamp = now_iso()
+    rows = [
+        (str(uuid.uuid4()), user_id, amount, "TOPUP", _payment_tx_status(status), ref[0] if ref else None, timestamp)
+        for user_id, amount, status, *ref in updates
+    ]
+    with get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (id, user_id, amount, type, status, gateway_ref_id, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    return [row[0] for row in rows]
+
+
+async def recorded_payment_refs(ref_ids: list[str]) -> set[str]:
+    """Subset of `ref_ids` already credited by a successful top-up."""
+    if not ref_ids:
+        return set()
+    placeholders = ", ".join("?" for _ in ref_ids)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT gateway_ref_id FROM transactions WHERE type = 'TOPUP' AND status = 'SUCCESS' "
+            f"AND gateway_ref_id IN ({placeholders})",
+            list(ref_ids),
+        ).fetchall()
+    return {row["gateway_ref_id"] for row in rows}
 
 
 async def activate_service(user_id: str) -> None:
+    await activate_services([user_id])
+
+
+async def activate_services(user_ids: list[str]) -> None:
+    next_billing_date = (datetime.now(tz=timezone.utc) + timedelta(days=30)).isoformat()
     with get_conn() as conn:
-        conn.execute(
+        conn.executemany(
             "UPDATE subscriptions SET status = 'ACTIVE', next_billing_date = ? WHERE user_id = ?",
-            ((datetime.now(tz=timezone.utc) + timedelta(days=30)).isoformat(), user_id),
+            [(next_billing_date, user_id) for user_id in user_ids],
         )
         conn.commit()
 
@@ -106,6 +106,7 @@ def billing_status(user_sub=require_feature(None)) -> dict[str, Any]:
             "ghost_worker_daily": config.daily_ghost_quota,
             "tachyon_priority": config.tachyon_priority,
             "requests_per_minute": config.requests_per_minute,
+            "reasoning_deadline_ms": config.reasoning_deadline_ms,
         },
     }
 
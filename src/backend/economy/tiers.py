@@ -20,6 +20,7 @@ class TierConfig:
     tachyon_priority: int
     custom_minting: bool
     requests_per_minute: int | None
+    reasoning_deadline_ms: float
 
 
 TIER_CONFIGS: dict[TierLevel, TierConfig] = {
@@ -30,6 +31,7 @@ TIER_CONFIGS: dict[TierLevel, TierConfig] = {
         tachyon_priority=1,
         custom_minting=False,
         requests_per_minute=60,
+        reasoning_deadline_ms=150.0,
     ),
     TierLevel.SYNDICATE: TierConfig(
         max_agents=10,
@@ -38,6 +40,7 @@ TIER_CONFIGS: dict[TierLevel, TierConfig] = {
         tachyon_priority=2,
         custom_minting=True,
         requests_per_minute=300,
+        reasoning_deadline_ms=400.0,
     ),
     TierLevel.SINGULARITY: TierConfig(
         max_agents=999_999,
@@ -46,6 +49,7 @@ TIER_CONFIGS: dict[TierLevel, TierConfig] = {
         tachyon_priority=3,
         custom_minting=True,
         requests_per_minute=None,
+        reasoning_deadline_ms=1500.0,
     ),
 }
 
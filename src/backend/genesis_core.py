@@ -13,6 +13,8 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field, field_validator
 
+from src.backend.pattern_scanner import MultiPatternScanner
+
 
 class SoulBreakError(Exception):
     """Critical domain error translated to RFC 9457 responses."""
@@ -58,9 +60,17 @@ class SATILayer:
 
     _blocked_tokens = ("ignore previous", "rm -rf", "system override", "drop table")
 
+    def __init__(self) -> None:
+        self._scanner = MultiPatternScanner({"prompt_injection": self._blocked_tokens})
+
+    def is_blocked(self, ingress: IntentIngressRequest) -> bool:
+        return self._scanner.matches((ingress.intent, ingress.payload))
+
+    def blocked_many(self, ingresses: list[IntentIngressRequest]) -> list[bool]:
+        return [bool(hits) for hits in self._scanner.scan_many((item.intent, item.payload) for item in ingresses)]
+
     def inspect(self, ingress: IntentIngressRequest) -> None:
-        serialized = json.dumps({"intent": ingress.intent, "payload": ingress.payload}, ensure_ascii=False).lower()
-        if any(token in serialized for token in self._blocked_tokens):
+        if self.is_blocked(ingress):
             raise SoulBreakError(
                 title="SATI policy violation",
                 detail="Request blocked by SATI layer due to malicious prompt injection pattern.",
@@ -135,10 +135,10 @@ def build_tiktok_script(*, trend_name: str, key_points: list[str], line_oa_link:
 @router.post("/line/webhook")
 async def line_webhook(payload: LineWebhookPayload, background_tasks: BackgroundTasks) -> dict[str, Any]:
     processed: list[dict[str, Any]] = []
-    for event in payload.events:
-        text = event.message.text if event.message else ""
-        trigger = _detect_line_trigger(text)
-        resolution = resolver.resolve(channel="LINE", trigger=trigger, payload={"text": text})
+    resolutions = resolver.resolve_many(
+        ("LINE", _detect_line_trigger(event.message.text if event.message else ""), None) for event in payload.events
+    )
+    for event, resolution in zip(payload.events, resolutions):
         background_tasks.add_task(process_agent_logic, event_data=event.model_dump(by_alias=True), user_id=event.source.user_id)
         processed.append(
             {
@@ -2,19 +2,115 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass, field
+import threading
+import time
 
 
 class OutOfBlocksError(RuntimeError):
     """Raised when no physical KV blocks remain on GPU memory."""
 
 
+@dataclass(frozen=True)
+class SlidingWindowPolicy:
+    """Keep the first `sink_blocks` plus the last `window_blocks`; reclaim the middle."""
+
+    sink_blocks: int = 1
+    window_blocks: int = 4
+
+    def __post_init__(self) -> None:
+        if self.sink_blocks < 0:
+            raise ValueError("sink_blocks must be >= 0")
+        if self.window_blocks <= 0:
+            raise ValueError("window_blocks must be > 0")
+
+    def is_evictable(self, logical_idx: int, last_idx: int) -> bool:
+        return self.sink_blocks <= logical_idx <= last_idx - self.window_blocks
+
+
+@dataclass(eq=False)
+class BlockSegment:
+    """Frozen run of blocks shared structurally by every request forked beneath it.
+
+    `blocks` shadow the same logical indices further up the chain (copy-on-write),
+    while `masked` hides ancestor indices this segment no longer sees. `refs` counts
+    direct holders (request tables or child segments); `drops[idx]` counts how many
+    of them stopped seeing `idx`, so a block is freed as soon as none of them do.
+    """
+
+    parent: BlockSegment | None
+    blocks: dict[int, int]
+    masked: set[int]
+    refs: int = 1
+    drops: dict[int, int] = field(default_factory=dict)
+
+    def lookup(self, logical_idx: int) -> int | None:
+        segment: BlockSegment | None = self
+        while segment is not None:
+            if logical_idx in segment.blocks:
+                return segment.blocks[logical_idx]
+            if logical_idx in segment.masked:
+                return None
+            segment = segment.parent
+        return None
+
+
 @dataclass
 class BlockTable:
-    """Logical-to-physical mapping for one active request."""
+    """Logical-to-physical mapping for one active request.
+
+    Only blocks written since the request last forked live in `local_blocks`;
+    the older prefix is reached through the shared `base` segment chain.
+    """
 
-    mapping: dict[int, int] = field(default_factory=dict)
-    filled_count: dict[int, int] = field(default_factory=dict)
+    block_size: int
+    local_blocks: dict[int, int] = field(default_factory=dict)
     total_tokens: int = 0
+    window: SlidingWindowPolicy | None = None
+    evicted_tokens: int = 0
+    base: BlockSegment | None = None
+    masked: set[int] = field(default_factory=set)
+
+    @property
+    def resident_tokens(self) -> int:
+        return self.total_tokens - self.evicted_tokens
+
+    @property
+    def mapping(self) -> dict[int, int]:
+        chain: list[BlockSegment] = []
+        segment = self.base
+        while segment is not None:
+            chain.append(segment)
+            segment = segment.parent
+
+        resolved: dict[int, int] = {}
+        for segment in reversed(chain):
+            for logical_idx in segment.masked:
+                resolved.pop(logical_idx, None)
+            resolved.update(segment.blocks)
+        for logical_idx in self.masked:
+            resolved.pop(logical_idx, None)
+        resolved.update(self.local_blocks)
+        return resolved
+
+    @property
+    def filled_count(self) -> dict[int, int]:
+        last_idx = (self.total_tokens - 1) // self.block_size
+        tail_filled = self.total_tokens - last_idx * self.block_size
+        return {
+            logical_idx: tail_filled if logical_idx == last_idx else self.block_size
+            for logical_idx in sorted(self.mapping)
+        }
+
+    def lookup(self, logical_idx: int) -> int | None:
+        if logical_idx in self.masked:
+            return None
+        if logical_idx in self.local_blocks:
+            return self.local_blocks[logical_idx]
+        return self.base.lookup(logical_idx) if self.base is not None else None
+
+    def dropped(self) -> set[int]:
+        """Indices this table no longer reads from `base` (evicted or copied on write)."""
+        return self.masked | self.local_blocks.keys()
 
 
 class PagedKVBlockManager:
@@ -29,33 +125,73 @@ class PagedKVBlockManager:
         self.block_size = block_size
         self.free_blocks: deque[int] = deque(range(num_gpu_blocks))
         self.active_requests: dict[str, BlockTable] = {}
-        self._physical_ref_count: dict[int, int] = {}
+        self._allocated_blocks: set[int] = set()
 
     def _acquire_block(self) -> int:
         if not self.free_blocks:
             raise OutOfBlocksError("No free GPU KV blocks available")
         block_id = self.free_blocks.popleft()
-        self._physical_ref_count[block_id] = 0
+        self._allocated_blocks.add(block_id)
         return block_id
 
-    def _retain(self, block_id: int) -> None:
-        self._physical_ref_count[block_id] = self._physical_ref_count.get(block_id, 0) + 1
-
-    def _release(self, block_id: int) -> None:
-        ref_count = self._physical_ref_count.get(block_id, 0)
-        if ref_count <= 1:
-            self._physical_ref_count.pop(block_id, None)
-            self.free_blocks.append(block_id)
-            return
-        self._physical_ref_count[block_id] = ref_count - 1
-
-    def allocate_for_request(self, request_id: str, num_tokens: int) -> list[int]:
+    def _free_block(self, block_id: int) -> None:
+        self._allocated_blocks.discard(block_id)
+        self.free_blocks.append(block_id)
+
+    def _release_segment(self, segment: BlockSegment | None, dropped: set[int]) -> None:
+        # `dropped` are the indices the departing holder had already stopped seeing.
+        while segment is not None:
+            segment.refs -= 1
+            if segment.refs > 0:
+                for logical_idx in dropped:
+                    if logical_idx in segment.drops:
+                        segment.drops[logical_idx] -= 1
+                # Indices only the departing holder still saw are now unreferenced.
+                for logical_idx in [idx for idx, count in segment.drops.items() if count >= segment.refs]:
+                    self._drop_from(self._hide(segment, logical_idx), logical_idx)
+                return
+            for block_id in segment.blocks.values():
+                self._free_block(block_id)
+            dropped = segment.masked | segment.blocks.keys()
+            segment = segment.parent
+
+    def _drop(self, table: BlockTable, logical_idx: int) -> None:
+        # `table` stopped seeing an index it used to read from its base segment.
+        if table.base is not None and table.base.lookup(logical_idx) is not None:
+            self._drop_from(table.base, logical_idx)
+
+    def _drop_from(self, segment: BlockSegment | None, logical_idx: int) -> None:
+        while segment is not None:
+            count = segment.drops.get(logical_idx, 0) + 1
+            if count < segment.refs:
+                segment.drops[logical_idx] = count
+                return
+            segment = self._hide(segment, logical_idx)
+
+    def _hide(self, segment: BlockSegment, logical_idx: int) -> BlockSegment | None:
+        # No holder of `segment` sees `logical_idx` any more: free the block if the
+        # segment owns it, otherwise the segment itself drops it from its parent.
+        segment.drops.pop(logical_idx, None)
+        segment.masked.add(logical_idx)
+        block_id = segment.blocks.pop(logical_idx, None)
+        if block_id is not None:
+            self._free_block(block_id)
+            return None
+        return segment.parent
+
+    def allocate_for_request(
+        self,
+        request_id: str,
+        num_tokens: int,
+        *,
+        window: SlidingWindowPolicy | None = None,
+    ) -> list[int]:
         if request_id in self.active_requests:
             raise ValueError(f"request_id already exists: {request_id}")
         if num_tokens < 0:
             raise ValueError("num_tokens must be >= 0")
 
-        table = BlockTable(total_tokens=num_tokens)
+        table = BlockTable(block_size=self.block_size, total_tokens=num_tokens, window=window)
         allocated_blocks: list[int] = []
 
         if num_tokens == 0:
@@ -64,32 +200,95 @@ class PagedKVBlockManager:
 
         num_blocks = (num_tokens + self.block_size - 1) // self.block_size
         for logical_idx in range(num_blocks):
+            if window is not None and window.is_evictable(logical_idx, num_blocks - 1):
+                # Middle blocks fall outside the attention window: never materialize them.
+                table.evicted_tokens += self.block_size
+                continue
             block_id = self._acquire_block()
-            self._retain(block_id)
             allocated_blocks.append(block_id)
-            table.mapping[logical_idx] = block_id
-            table.filled_count[logical_idx] = min(num_tokens - (logical_idx * self.block_size), self.block_size)
+            table.local_blocks[logical_idx] = block_id
 
         self.active_requests[request_id] = table
         return allocated_blocks
 
     def fork_request(self, source_request_id: str, target_request_id: str) -> None:
+        self.fork_many(source_request_id, [target_request_id])
+
+    def fork_many(self, source_request_id: str, targets: int | list[str]) -> list[str]:
+        """Fork `source` into several children that share its prefix structurally.
+
+        `targets` is either explicit request ids or a count, in which case ids are
+        derived as `<source>/<n>`. Each child costs O(1) regardless of prefix length.
+        """
         if source_request_id not in self.active_requests:
             raise KeyError(f"unknown source request: {source_request_id}")
-        if target_request_id in self.active_requests:
-            raise ValueError(f"target request already exists: {target_request_id}")
+        if isinstance(targets, str):
+            raise TypeError("targets must be a fork count or a list of request ids, not a str")
+        if isinstance(targets, int):
+            if targets < 0:
+                raise ValueError("fork count must be >= 0")
+            target_ids = [f"{source_request_id}/{idx}" for idx in range(targets)]
+        else:
+            target_ids = list(targets)
+        if len(set(target_ids)) != len(target_ids):
+            raise ValueError("target request ids must be unique")
+        for target_request_id in target_ids:
+            if target_request_id in self.active_requests:
+                raise ValueError(f"target request already exists: {target_request_id}")
 
         source = self.active_requests[source_request_id]
-        target = BlockTable(
-            mapping=source.mapping.copy(),
-            filled_count=source.filled_count.copy(),
-            total_tokens=source.total_tokens,
-        )
-
-        for block_id in target.mapping.values():
-            self._retain(block_id)
+        base = self._freeze(source)
+        if base is not None:
+            base.refs += len(target_ids)
+
+        for target_request_id in target_ids:
+            self.active_requests[target_request_id] = BlockTable(
+                block_size=self.block_size,
+                total_tokens=source.total_tokens,
+                window=source.window,
+                evicted_tokens=source.evicted_tokens,
+                base=base,
+            )
+        return target_ids
+
+    def _freeze(self, table: BlockTable) -> BlockSegment | None:
+        # Move (not copy) the private tail into a shared segment; the table's
+        # reference on its old base is handed over to the new segment.
+        if table.local_blocks or table.masked:
+            table.base = BlockSegment(parent=table.base, blocks=table.local_blocks, masked=table.masked)
+            table.local_blocks = {}
+            table.masked = set()
+        return table.base
+
+    def _absorb_unshared(self, table: BlockTable) -> None:
+        # Segments no other request references are folded back into the table.
+        # With a single holder every drop is applied eagerly, so whatever the
+        # segment still holds is visible to the table.
+        while table.base is not None and table.base.refs == 1:
+            segment = table.base
+            table.local_blocks.update(segment.blocks)
+            table.masked |= segment.masked - table.local_blocks.keys()
+            table.base = segment.parent
+
+    def set_window_policy(self, request_id: str, window: SlidingWindowPolicy | None) -> list[int]:
+        """Attach (or clear) a sliding-window policy and reclaim blocks it no longer covers."""
+        if request_id not in self.active_requests:
+            raise KeyError(f"unknown request: {request_id}")
 
-        self.active_requests[target_request_id] = target
+        table = self.active_requests[request_id]
+        table.window = window
+        if window is None or table.total_tokens == 0:
+            return []
+
+        self._absorb_unshared(table)
+        last_idx = self._last_index(table)
+        view = table.mapping
+        evicted: list[int] = []
+        for logical_idx in sorted(view):
+            if window.is_evictable(logical_idx, last_idx):
+                self._evict_block(table, logical_idx)
+                evicted.append(view[logical_idx])
+        return evicted
 
     def append_token(self, request_id: str, token_count: int = 1) -> list[int]:
         if token_count <= 0:
@@ -97,6 +296,7 @@ class PagedKVBlockManager:
         if request_id not in self.active_requests:
             raise KeyError(f"unknown request: {request_id}")
 
+        self._absorb_unshared(self.active_requests[request_id])
         new_blocks: list[int] = []
         for _ in range(token_count):
             maybe_new = self._append_one(request_id)
@@ -107,52 +307,66 @@ class PagedKVBlockManager:
     def _append_one(self, request_id: str) -> int | None:
         table = self.active_requests[request_id]
 
-        if not table.mapping:
+        if table.total_tokens == 0:
             block_id = self._acquire_block()
-            self._retain(block_id)
-            table.mapping[0] = block_id
-            table.filled_count[0] = 1
+            table.local_blocks[0] = block_id
             table.total_tokens = 1
             return block_id
 
-        last_idx = max(table.mapping)
-        block_id = table.mapping[last_idx]
-        filled = table.filled_count[last_idx]
+        last_idx = self._last_index(table)
+        filled = table.total_tokens - last_idx * self.block_size
 
         if filled < self.block_size:
-            if self._physical_ref_count.get(block_id, 0) > 1:
-                replacement = self._acquire_block()
-                self._retain(replacement)
-                table.mapping[last_idx] = replacement
-                self._release(block_id)
-            table.filled_count[last_idx] += 1
+            if last_idx not in table.local_blocks:
+                # The partially filled tail still lives in a shared segment: copy on write.
+                table.local_blocks[last_idx] = self._acquire_block()
+                self._drop(table, last_idx)
             table.total_tokens += 1
             return None
 
         new_block = self._acquire_block()
-        self._retain(new_block)
         new_idx = last_idx + 1
-        table.mapping[new_idx] = new_block
-        table.filled_count[new_idx] = 1
+        table.local_blocks[new_idx] = new_block
         table.total_tokens += 1
+        if table.window is not None:
+            stale_idx = new_idx - table.window.window_blocks
+            if table.window.is_evictable(stale_idx, new_idx) and table.lookup(stale_idx) is not None:
+                self._evict_block(table, stale_idx)
         return new_block
 
+    def _last_index(self, table: BlockTable) -> int:
+        # Blocks fill contiguously, so the tail index follows from the token count
+        # even after middle blocks have been reclaimed.
+        return (table.total_tokens - 1) // self.block_size
+
+    def _evict_block(self, table: BlockTable, logical_idx: int) -> None:
+        if logical_idx in table.local_blocks:
+            # A copy-on-write shadow was already dropped from the base when it was made.
+            self._free_block(table.local_blocks.pop(logical_idx))
+            if table.lookup(logical_idx) is not None:
+                table.masked.add(logical_idx)
+        elif table.lookup(logical_idx) is not None:
+            # Shared with siblings: hide it here, the segment frees it once no holder sees it.
+            table.masked.add(logical_idx)
+            self._drop(table, logical_idx)
+        table.evicted_tokens += self.block_size
+
     def release_request(self, request_id: str) -> None:
         table = self.active_requests.pop(request_id, None)
         if table is None:
             return
-        for block_id in table.mapping.values():
-            self._release(block_id)
+        for block_id in table.local_blocks.values():
+            self._free_block(block_id)
+        self._release_segment(table.base, table.dropped())
 
     def memory_report(self) -> dict[str, int | float]:
-        used_blocks = len(self._physical_ref_count)
+        used_blocks = len(self._allocated_blocks)
         total_blocks = used_blocks + len(self.free_blocks)
         capacity_tokens = used_blocks * self.block_size
-        used_tokens = sum(table.total_tokens for table in self.active_requests.values())
+        used_tokens = sum(table.resident_tokens for table in self.active_requests.values())
+        reclaimed_tokens = sum(table.evicted_tokens for table in self.active_requests.values())
         last_block_waste = sum(
-            self.block_size - table.filled_count[max(table.filled_count)]
-            for table in self.active_requests.values()
-            if table.filled_count
+            (-table.total_tokens) % self.block_size for table in self.active_requests.values() if table.total_tokens
         )
         utilization = (used_tokens / capacity_tokens) if capacity_tokens else 0.0
 
@@ -163,9 +377,141 @@ class PagedKVBlockManager:
             "active_requests": len(self.active_requests),
             "capacity_tokens": capacity_tokens,
             "used_tokens": used_tokens,
+            "reclaimed_tokens": reclaimed_tokens,
             "last_block_waste_tokens": last_block_waste,
             "token_utilization": round(utilization, 4),
         }
 
     def get_ref_count(self, block_id: int) -> int:
-        return self._physical_ref_count.get(block_id, 0)
+        """Physical references keeping `block_id` allocated; 0 once it is back in the pool.
+
+        A private block has one. A block in a shared segment has one per direct holder
+        of that segment (request table or nested segment) that still maps it. Diagnostic
+        scan, O(allocated blocks).
+        """
+        seen: set[int] = set()
+        for table in self.active_requests.values():
+            if block_id in table.local_blocks.values():
+                return 1
+            segment = table.base
+            while segment is not None and id(segment) not in seen:
+                seen.add(id(segment))
+                for logical_idx, segment_block in segment.blocks.items():
+                    if segment_block == block_id:
+                        return segment.refs - segment.drops.get(logical_idx, 0)
+                segment = segment.parent
+        return 0
+
+    def get_view_count(self, block_id: int) -> int:
+        """Number of active requests whose resolved view maps to `block_id` (diagnostic, O(tables))."""
+        return sum(1 for table in self.active_requests.values() if block_id in table.mapping.values())
+
+
+class SharedPagedKVBlockManager(PagedKVBlockManager):
+    """Thread-safe manager meant to be shared by many engines and worker threads.
+
+    Every public operation runs under one re-entrant lock. `allocate_for_request`
+    is an admission gate: when the pool is short it waits (up to `timeout`) for
+    releases instead of failing, and only raises for requests that could never fit.
+    `append_token` waits the same way whenever its next token needs a fresh block.
+    Operations that return blocks to the pool wake waiting callers.
+    """
+
+    def __init__(self, num_gpu_blocks: int, block_size: int = 16):
+        super().__init__(num_gpu_blocks=num_gpu_blocks, block_size=block_size)
+        self.num_gpu_blocks = num_gpu_blocks
+        self._cond = threading.Condition(threading.RLock())
+        self._admission_waits = 0
+        self._admission_timeouts = 0
+        self._peak_active_requests = 0
+
+    def blocks_needed(self, num_tokens: int, window: SlidingWindowPolicy | None = None) -> int:
+        num_blocks = (num_tokens + self.block_size - 1) // self.block_size
+        if window is None:
+            return num_blocks
+        return sum(1 for idx in range(num_blocks) if not window.is_evictable(idx, num_blocks - 1))
+
+    def allocate_for_request(
+        self,
+        request_id: str,
+        num_tokens: int,
+        *,
+        window: SlidingWindowPolicy | None = None,
+        timeout: float | None = None,
+    ) -> list[int]:
+        needed = self.blocks_needed(num_tokens, window)
+        if needed > self.num_gpu_blocks:
+            raise OutOfBlocksError(f"request needs {needed} blocks but the pool only has {self.num_gpu_blocks}")
+        with self._cond:
+            if len(self.free_blocks) < needed:
+                self._admission_waits += 1
+                if not self._cond.wait_for(lambda: len(self.free_blocks) >= needed, timeout=timeout):
+                    self._admission_timeouts += 1
+                    raise OutOfBlocksError(f"timed out waiting for {needed} free KV blocks")
+            allocated = super().allocate_for_request(request_id, num_tokens, window=window)
+            self._peak_active_requests = max(self._peak_active_requests, len(self.active_requests))
+            return allocated
+
+    def fork_many(self, source_request_id: str, targets: int | list[str]) -> list[str]:
+        with self._cond:
+            return super().fork_many(source_request_id, targets)
+
+    def set_window_policy(self, request_id: str, window: SlidingWindowPolicy | None) -> list[int]:
+        with self._cond:
+            evicted = super().set_window_policy(request_id, window)
+            self._cond.notify_all()
+            return evicted
+
+    def append_token(self, request_id: str, token_count: int = 1, *, timeout: float | None = None) -> list[int]:
+        """Append tokens, waiting up to `timeout` for a free block whenever one is needed.
+
+        On timeout the tokens appended so far stay appended, as when the plain
+        manager runs out of blocks part-way through.
+        """
+        if token_count <= 0:
+            raise ValueError("token_count must be > 0")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            free_before = len(self.free_blocks)
+            new_blocks: list[int] = []
+            try:
+                for _ in range(token_count):
+                    if request_id in self.active_requests and not self.free_blocks:
+                        self._wait_for_append_block(request_id, deadline)
+                    new_blocks.extend(super().append_token(request_id))
+            finally:
+                if len(self.free_blocks) > free_before:
+                    self._cond.notify_all()
+            return new_blocks
+
+    def _wait_for_append_block(self, request_id: str, deadline: float | None) -> None:
+        table = self.active_requests[request_id]
+        self._absorb_unshared(table)
+        if table.total_tokens % self.block_size and self._last_index(table) in table.local_blocks:
+            return  # the private tail block still has room
+        self._admission_waits += 1
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self._cond.wait_for(lambda: bool(self.free_blocks), timeout=remaining):
+            self._admission_timeouts += 1
+            raise OutOfBlocksError("timed out waiting for a free KV block to append to")
+
+    def release_request(self, request_id: str) -> None:
+        with self._cond:
+            super().release_request(request_id)
+            self._cond.notify_all()
+
+    def memory_report(self) -> dict[str, int | float]:
+        with self._cond:
+            report = super().memory_report()
+            report["admission_waits"] = self._admission_waits
+            report["admission_timeouts"] = self._admission_timeouts
+            report["peak_active_requests"] = self._peak_active_requests
+            return report
+
+    def get_ref_count(self, block_id: int) -> int:
+        with self._cond:
+            return super().get_ref_count(block_id)
+
+    def get_view_count(self, block_id: int) -> int:
+        with self._cond:
+            return super().get_view_count(block_id)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_right
+from typing import Any, Iterable, Mapping
+
+
+class MultiPatternScanner:
+    """Case-insensitive substring rules matched against JSON-like payloads without serializing them.
+
+    Each named group of tokens compiles into one alternation. A scan collects dict
+    keys and string leaves (key names like `national_id` are what most rules look
+    for), joins them with NUL so no token can match across two leaves, and runs
+    one C-level regex pass per group, regardless of how many tokens it holds.
+    Numbers, booleans and None are scanned as their JSON text; any other object
+    raises TypeError, as `json.dumps` of the payload would. `scan_many` joins a
+    whole batch the same way and maps match offsets back to items, so a batch
+    also costs one pass per group.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self._patterns: dict[str, re.Pattern[str]] = {}
+        for label, tokens in groups.items():
+            lowered = sorted({token.lower() for token in tokens if token}, key=len, reverse=True)
+            if lowered:
+                self._patterns[label] = re.compile("|".join(map(re.escape, lowered)))
+        self._labels = frozenset(self._patterns)
+
+    @property
+    def labels(self) -> frozenset[str]:
+        return self._labels
+
+    def scan_text(self, text: str) -> frozenset[str]:
+        lowered = text.lower()
+        return frozenset(label for label, pattern in self._patterns.items() if pattern.search(lowered))
+
+    def scan(self, value: Any) -> frozenset[str]:
+        """Labels of every group with a token in any key or string leaf of `value`."""
+        return self.scan_text(_SEPARATOR.join(_string_leaves(value)))
+
+    def scan_many(self, values: Iterable[Any]) -> list[frozenset[str]]:
+        """`scan` for a batch of payloads, in order."""
+        chunks: list[str] = []
+        starts: list[int] = []
+        position = 0
+        for value in values:
+            # Lowercase per item: case mapping can change length, which would skew offsets.
+            chunk = _SEPARATOR.join(_string_leaves(value)).lower()
+            starts.append(position)
+            chunks.append(chunk)
+            position += len(chunk) + 1
+        joined = _SEPARATOR.join(chunks)
+        found: list[set[str]] = [set() for _ in starts]
+        for label, pattern in self._patterns.items():
+            for match in pattern.finditer(joined):
+                found[bisect_right(starts, match.start()) - 1].add(label)
+        return [frozenset(labels) for labels in found]
+
+    def matches(self, value: Any) -> bool:
+        return bool(self.scan(value))
+
+
+_SEPARATOR = "\x00"
+
+
+def _string_leaves(value: Any) -> list[str]:
+    texts: list[str] = []
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            texts.append(item)
+        elif isinstance(item, dict):
+            texts.extend(key if isinstance(key, str) else _scalar_text(key, "keys") for key in item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        else:
+            texts.append(_scalar_text(item, "values"))
+    return texts
+
+
+def _scalar_text(item: Any, role: str) -> str:
+    if item is None or isinstance(item, (bool, int, float)):
+        return json.dumps(item)
+    # Fail closed like the `json.dumps` scan this replaces: an unscannable payload is never "clean".
+    raise TypeError(f"payload {role} of type {type(item).__name__} are not JSON serializable")
@@ -1,19 +1,155 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+
 LIGHTWEIGHT_PROMPT_WORDS = 8
 COMPLEX_PROMPT_WORDS = 40
 
+# (compute_budget, branch_factor) ladder ordered by expected cost.
+CANDIDATE_PROFILES: tuple[tuple[int, int], ...] = ((2, 1), (4, 1), (5, 2), (7, 3), (10, 3), (14, 4))
+_DEFAULT_PROFILES: dict[str, tuple[int, int]] = {"arithmetic": (4, 1), "analysis": (7, 3), "general": (5, 2)}
 
-def select_reasoning_profile(prompt: str) -> tuple[int, int]:
-    """Choose an efficient search profile to balance quality vs. inference cost."""
-    words = prompt.split()
-    word_count = len(words)
+
+def classify_prompt(prompt: str) -> str:
+    """Bucket a prompt into the coarse class used for profile selection and calibration."""
+    word_count = len(prompt.split())
 
     has_math_signal = any(symbol in prompt for symbol in ("+", "-", "*", "/", "="))
     has_structured_signal = any(token in prompt.lower() for token in ("explain", "analyze", "เปรียบเทียบ", "วิเคราะห์"))
 
     if word_count <= LIGHTWEIGHT_PROMPT_WORDS and has_math_signal and not has_structured_signal:
-        return 4, 1
+        return "arithmetic"
 
     if word_count >= COMPLEX_PROMPT_WORDS or has_structured_signal:
-        return 7, 3
+        return "analysis"
+
+    return "general"
+
+
+def select_reasoning_profile(prompt: str) -> tuple[int, int]:
+    """Choose an efficient search profile to balance quality vs. inference cost."""
+    return _DEFAULT_PROFILES[classify_prompt(prompt)]
+
+
+@dataclass
+class ProfileEstimate:
+    """Exponentially weighted latency/confidence estimate for one (class, profile) cell."""
+
+    samples: int = 0
+    latency_ms: float = 0.0
+    confidence: float = 0.0
+
+    def observe(self, latency_ms: float, confidence: float, alpha: float) -> None:
+        if self.samples == 0:
+            self.latency_ms, self.confidence = latency_ms, confidence
+        else:
+            self.latency_ms += alpha * (latency_ms - self.latency_ms)
+            self.confidence += alpha * (confidence - self.confidence)
+        self.samples += 1
+
+
+class AdaptiveProfileSelector:
+    """Pick the cheapest profile expected to reach `target_confidence` within `latency_slo_ms`.
+
+    Estimates start empty, so a class first runs its static default profile. Once
+    a profile has `min_samples` observations it either qualifies (then a cheaper,
+    uncalibrated profile is probed every `explore_every` selections) or it does
+    not. Profiles that fit the SLO but miss the target escalate to the next
+    uncalibrated profile up the ladder; when nothing fits the SLO, the fastest
+    calibrated profile is used instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        candidates: tuple[tuple[int, int], ...] = CANDIDATE_PROFILES,
+        target_confidence: float = 0.8,
+        latency_slo_ms: float = 400.0,
+        alpha: float = 0.2,
+        min_samples: int = 3,
+        explore_every: int = 20,
+    ) -> None:
+        if not candidates:
+            raise ValueError("candidates must not be empty")
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        if min_samples <= 0 or explore_every <= 0:
+            raise ValueError("min_samples and explore_every must be > 0")
+        self.candidates = tuple(sorted(set(candidates), key=lambda profile: (profile[0] * profile[1], profile)))
+        self.target_confidence = target_confidence
+        self.latency_slo_ms = latency_slo_ms
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self._estimates: dict[tuple[str, tuple[int, int]], ProfileEstimate] = {}
+        self._selections: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def select(
+        self,
+        prompt: str,
+        *,
+        target_confidence: float | None = None,
+        latency_slo_ms: float | None = None,
+    ) -> tuple[str, tuple[int, int]]:
+        """Return `(prompt_class, (compute_budget, branch_factor))` for `prompt`."""
+        prompt_class = classify_prompt(prompt)
+        target = self.target_confidence if target_confidence is None else target_confidence
+        slo = self.latency_slo_ms if latency_slo_ms is None else latency_slo_ms
+        with self._lock:
+            selections = self._selections.get(prompt_class, 0) + 1
+            self._selections[prompt_class] = selections
+            return prompt_class, self._choose(prompt_class, target, slo, explore=selections % self.explore_every == 0)
+
+    def record(self, prompt_class: str, profile: tuple[int, int], *, latency_ms: float, confidence: float) -> None:
+        with self._lock:
+            estimate = self._estimates.setdefault((prompt_class, profile), ProfileEstimate())
+            estimate.observe(latency_ms, confidence, self.alpha)
+
+    def estimates(self) -> dict[str, dict[str, dict[str, float]]]:
+        with self._lock:
+            snapshot: dict[str, dict[str, dict[str, float]]] = {}
+            for (prompt_class, (budget, branch)), estimate in self._estimates.items():
+                snapshot.setdefault(prompt_class, {})[f"{budget}x{branch}"] = {
+                    "samples": estimate.samples,
+                    "latency_ms": round(estimate.latency_ms, 3),
+                    "confidence": round(estimate.confidence, 4),
+                }
+            return snapshot
+
+    def _choose(self, prompt_class: str, target: float, slo: float, *, explore: bool) -> tuple[int, int]:
+        calibrated: list[tuple[tuple[int, int], ProfileEstimate]] = []
+        for profile in self.candidates:
+            estimate = self._estimates.get((prompt_class, profile))
+            if estimate is not None and estimate.samples >= self.min_samples:
+                calibrated.append((profile, estimate))
+        if not calibrated:
+            return _DEFAULT_PROFILES[prompt_class]
+
+        known = {profile for profile, _ in calibrated}
+        uncalibrated = [profile for profile in self.candidates if profile not in known]
+        feasible = [
+            profile for profile, estimate in calibrated if estimate.confidence >= target and estimate.latency_ms <= slo
+        ]
+        if feasible:
+            best = feasible[0]
+            cheaper = [profile for profile in uncalibrated if self.candidates.index(profile) < self.candidates.index(best)]
+            return cheaper[-1] if explore and cheaper else best
+
+        within_slo = [(profile, estimate) for profile, estimate in calibrated if estimate.latency_ms <= slo]
+        if not within_slo:
+            # The SLO is already blown: a larger profile would only be slower.
+            return min(calibrated, key=lambda item: item[1].latency_ms)[0]
 
-    return 5, 2
+        # Profiles within the SLO miss the target: try the next uncalibrated profile
+        # above them, but not one costlier than a profile already known to be too slow.
+        floor = max(self.candidates.index(profile) for profile, _ in within_slo)
+        ceiling = min(
+            (self.candidates.index(profile) for profile, estimate in calibrated if estimate.latency_ms > slo),
+            default=len(self.candidates),
+        )
+        larger = [profile for profile in uncalibrated if floor < self.candidates.index(profile) < ceiling]
+        if larger:
+            return larger[0]
+        return max(within_slo, key=lambda item: item[1].confidence)[0]
@@ -16,8 +16,9 @@ class DummyDB:
         self.updated = None
         self.activated = None
 
-    async def update_payment_status(self, *, user_id, amount, status):
+    async def update_payment_status(self, *, user_id, amount, status, gateway_ref_id=None):
         self.updated = (user_id, amount, status)
+        self.ref_id = gateway_ref_id
 
     async def activate_service(self, user_id):
         self.activated = user_id
@@ -32,6 +33,7 @@ def test_agent_finpay_verifies_slip_and_activates_service() -> None:
 
     assert "499.00" in message
     assert db.updated == ("user-001", 499.0, "COMPLETED")
+    assert db.ref_id == "ABC123"
     assert db.activated == "user-001"
 
 
@@ -44,3 +46,182 @@ def test_agent_finpay_rejects_invalid_slip() -> None:
 
     assert message == "สลิปไม่ถูกต้อง กรุณาส่งใหม่อีกครั้ง"
     assert db.updated is None
+
+
+class SlipVisualEngine:
+    def __init__(self, slips):
+        self.slips = slips
+        self.active = 0
+        self.peak = 0
+
+    async def analyze_slip(self, image_data):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return self.slips[image_data]
+
+
+class CountingBank:
+    def __init__(self, authentic=True, failing=()):
+        self.authentic = authentic
+        self.failing = set(failing)
+        self.calls = []
+
+    async def verify_reference(self, ref_id):
+        self.calls.append(ref_id)
+        await asyncio.sleep(0.01)
+        if ref_id in self.failing:
+            raise ConnectionError("bank timeout")
+        return self.authentic
+
+
+class BatchDB(DummyDB):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.activated_batches = []
+
+    async def update_payment_statuses(self, updates):
+        self.batches.append(list(updates))
+
+    async def activate_services(self, user_ids):
+        self.activated_batches.append(list(user_ids))
+
+
+def test_agent_finpay_pipeline_bounds_concurrency_and_credits_each_ref_once() -> None:
+    visual = SlipVisualEngine(
+        {
+            "a": {"is_valid_slip": True, "ref_id": "DUP", "amount": 100.0},
+            "b": {"is_valid_slip": True, "ref_id": "DUP", "amount": 100.0},
+            "c": {"is_valid_slip": True, "ref_id": "DUP", "amount": 100.0},
+            "d": {"is_valid_slip": True, "ref_id": "R-2", "amount": 50.0},
+            "e": {"is_valid_slip": False},
+        }
+    )
+    bank = CountingBank()
+    db = BatchDB()
+    service = AgentFinPay(db=db, visual_engine=visual, bank_api_client=bank, max_concurrency=4)
+
+    slips = [("a", "u1"), ("b", "u1"), ("c", "u2"), ("d", "u3"), ("e", "u4")]
+    messages = asyncio.run(service.verify_slips_and_activate(slips))
+
+    assert visual.peak <= 4
+    assert sorted(bank.calls) == ["DUP", "R-2"]
+    assert "100.00" in messages[0] and "50.00" in messages[3]
+    assert messages[1] == messages[2] == AgentFinPay.DUPLICATE_SLIP
+    assert messages[4] == "สลิปไม่ถูกต้อง กรุณาส่งใหม่อีกครั้ง"
+    assert db.batches == [[("u1", 100.0, "COMPLETED", "DUP"), ("u3", 50.0, "COMPLETED", "R-2")]]
+    assert db.activated_batches == [["u1", "u3"]]
+
+    # Replays, from the same user or another one, are rejected without crediting again.
+    replays = [
+        asyncio.run(service.verify_slip_and_activate(image_data="a", user_id="u1")),
+        asyncio.run(service.verify_slip_and_activate(image_data="c", user_id="u5")),
+    ]
+    assert replays == [AgentFinPay.DUPLICATE_SLIP] * 2
+    assert len(db.batches) == 1
+    assert service.verification_stats()["duplicates"] == 4
+
+
+def test_agent_finpay_concurrent_batches_share_bank_call_but_credit_once() -> None:
+    visual = SlipVisualEngine({"a": {"is_valid_slip": True, "ref_id": "R-1", "amount": 20.0}})
+    bank = CountingBank()
+    db = BatchDB()
+    service = AgentFinPay(db=db, visual_engine=visual, bank_api_client=bank)
+
+    async def scenario():
+        return await asyncio.gather(
+            service.verify_slips_and_activate([("a", "u1")]),
+            service.verify_slips_and_activate([("a", "u2")]),
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert bank.calls == ["R-1"]
+    assert service.verification_stats()["coalesced"] == 1
+    assert sorted(first + second) == sorted([AgentFinPay.DUPLICATE_SLIP, "ยืนยันยอดเงิน 20.00 บาท เรียบร้อยแล้วค่ะ!"])
+    assert sum(len(batch) for batch in db.batches) == 1
+
+
+def test_agent_finpay_consults_recorded_refs_and_survives_per_slip_errors() -> None:
+    class FlakyVisualEngine(SlipVisualEngine):
+        async def analyze_slip(self, image_data):
+            if image_data == "boom":
+                raise ValueError("unreadable image")
+            return await super().analyze_slip(image_data)
+
+    class RecordingDB(BatchDB):
+        def __init__(self, recorded):
+            super().__init__()
+            self.recorded = set(recorded)
+
+        async def recorded_payment_refs(self, ref_ids):
+            return self.recorded & set(ref_ids)
+
+    visual = FlakyVisualEngine(
+        {
+            "old": {"is_valid_slip": True, "ref_id": "R-OLD", "amount": 10.0},
+            "new": {"is_valid_slip": True, "ref_id": "R-NEW", "amount": 30.0},
+            "down": {"is_valid_slip": True, "ref_id": "R-DOWN", "amount": 40.0},
+        }
+    )
+    db = RecordingDB(recorded={"R-OLD"})
+    service = AgentFinPay(db=db, visual_engine=visual, bank_api_client=CountingBank(failing={"R-DOWN"}))
+
+    messages = asyncio.run(
+        service.verify_slips_and_activate([("old", "u1"), ("boom", "u2"), ("new", "u3"), ("down", "u4")])
+    )
+
+    assert messages[0] == AgentFinPay.DUPLICATE_SLIP
+    assert messages[1] == messages[3] == "ไม่สามารถยืนยันยอดเงินได้ในขณะนี้"
+    assert "30.00" in messages[2]
+    assert db.batches == [[("u3", 30.0, "COMPLETED", "R-NEW")]]
+
+    # Credited and recorded refs are cached: replays skip the bank and the DB lookup.
+    bank_calls = len(service.bank_api_client.calls)
+    assert asyncio.run(service.verify_slips_and_activate([("new", "u5"), ("old", "u6")])) == [
+        AgentFinPay.DUPLICATE_SLIP
+    ] * 2
+    assert len(service.bank_api_client.calls) == bank_calls
+    assert service.verification_stats()["claimed"] == 2
+
+
+def test_agent_finpay_pipeline_does_not_cache_failed_verification() -> None:
+    visual = SlipVisualEngine({"a": {"is_valid_slip": True, "ref_id": "R-9", "amount": 10.0}})
+    bank = CountingBank(authentic=False)
+    db = DummyDB()
+    service = AgentFinPay(db=db, visual_engine=visual, bank_api_client=bank)
+
+    first = asyncio.run(service.verify_slips_and_activate([("a", "u1")]))
+    bank.authentic = True
+    second = asyncio.run(service.verify_slips_and_activate([("a", "u1")]))
+
+    assert first == ["ไม่สามารถยืนยันยอดเงินได้ในขณะนี้"]
+    assert "10.00" in second[0]
+    assert bank.calls == ["R-9", "R-9"]
+    assert db.updated == ("u1", 10.0, "COMPLETED")
+    assert db.activated == "u1"
+
+
+def test_agent_finpay_bounds_remembered_refs_and_supports_legacy_db() -> None:
+    class LegacyDB:
+        def __init__(self):
+            self.updates = []
+
+        async def update_payment_status(self, *, user_id, amount, status):
+            self.updates.append((user_id, amount, status))
+
+        async def activate_service(self, user_id):
+            pass
+
+    visual = SlipVisualEngine({name: {"is_valid_slip": True, "ref_id": f"R-{name}", "amount": 5.0} for name in "abc"})
+    db = LegacyDB()
+    service = AgentFinPay(db=db, visual_engine=visual, verification_cache_size=2)
+
+    messages = asyncio.run(service.verify_slips_and_activate([("a", "u1"), ("b", "u2"), ("c", "u3")]))
+
+    assert all("5.00" in message for message in messages)
+    assert db.updates == [("u1", 5.0, "COMPLETED"), ("u2", 5.0, "COMPLETED"), ("u3", 5.0, "COMPLETED")]
+    assert service.verification_stats()["claimed"] == 2
+    assert asyncio.run(service.verify_slip_and_activate(image_data="c", user_id="u4")) == AgentFinPay.DUPLICATE_SLIP
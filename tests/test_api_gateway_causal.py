@@ -56,5 +56,112 @@ def test_causal_and_policy_genome_endpoints(tmp_path: Path):
         assert genome.status_code == 200
         payload = genome.json()
         assert payload["meta"]["node_count"] >= 1
+
+        stats = client.get("/causal/cache/stats").json()
+        assert stats["hits"] >= 4  # recommend + genome reuse the estimate results
+        assert stats["data_version"] == 1
+
+        matrix = client.post("/causal/estimate-matrix", json={"outcomes": ["stakeholder_trust", "adaptability"]}).json()
+        assert set(matrix["effects"]) == {"auto_switch_deep", "summary_to_story", "strategic_to_operational"}
+        assert matrix["effects"]["auto_switch_deep"]["stakeholder_trust"] > 0
+        assert matrix["effects"]["summary_to_story"]["adaptability"] == 0.0  # never applied in the seed data
     finally:
         main.causal_lab = original_lab
+
+
+def test_causal_spec_registration_enables_online_estimates(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _seed_events(events_file)
+
+    original_lab = main.causal_lab
+    try:
+        main.causal_lab = CausalPolicyLab(events_file=events_file)
+        client = TestClient(main.app)
+        body = {"treatment": "auto_switch_deep", "outcome": "stakeholder_trust", "online": True}
+
+        assert client.post("/causal/estimate", json=body).json()["causal_effect"] is None
+
+        spec = client.post("/causal/specs", json={"treatment": "auto_switch_deep", "outcome": "stakeholder_trust"})
+        assert spec.status_code == 200
+        assert spec.json()["sample_size"] == 40
+        assert len(client.get("/causal/specs").json()["specs"]) == 1
+
+        online = client.post("/causal/estimate", json=body).json()
+        assert online["method"] == "online_ols"
+        assert online["causal_effect"] > 0
+    finally:
+        main.causal_lab = original_lab
+
+
+def test_cpu_bound_endpoints_use_bounded_compute_executor(tmp_path: Path):
+    import asyncio
+    import threading
+
+    from src.backend.compute_executor import BoundedComputeExecutor
+
+    events_file = tmp_path / "events.jsonl"
+    _seed_events(events_file)
+    original_lab, original_executor = main.causal_lab, main.compute_executor
+    executor = BoundedComputeExecutor(1, max_queue_depth=0)
+    release, started = threading.Event(), threading.Event()
+
+    def occupy():
+        started.set()
+        release.wait()
+
+    blocker = threading.Thread(target=lambda: asyncio.run(executor.run(occupy)))
+    try:
+        main.causal_lab = CausalPolicyLab(events_file=events_file)
+        main.compute_executor = executor
+        client = TestClient(main.app)
+
+        assert client.get("/causal/recommend?top_n=1").status_code == 200
+        blocker.start()
+        assert started.wait(5)
+        saturated = client.post("/causal/estimate", json={"treatment": "auto_switch_deep", "outcome": "stakeholder_trust"})
+        assert saturated.status_code == 503 and saturated.headers["Retry-After"] == "1"
+
+        metrics = client.get("/api/v1/compute/metrics").json()
+        assert (metrics["in_flight"], metrics["rejected"], metrics["completed"]) == (1, 1, 1)
+    finally:
+        release.set()
+        if blocker.ident is not None:
+            blocker.join()
+        executor.shutdown()
+        main.causal_lab, main.compute_executor = original_lab, original_executor
+
+
+def test_causal_spec_endpoints_and_online_estimate_run_on_compute_executor(tmp_path: Path):
+    from src.backend.compute_executor import BoundedComputeExecutor
+
+    events_file = tmp_path / "events.jsonl"
+    _seed_events(events_file)
+    original_lab, original_executor = main.causal_lab, main.compute_executor
+    executor = BoundedComputeExecutor(1, max_queue_depth=0)
+    try:
+        main.causal_lab = CausalPolicyLab(events_file=events_file)
+        main.compute_executor = executor
+        client = TestClient(main.app)
+        spec = {"treatment": "auto_switch_deep", "outcome": "stakeholder_trust"}
+
+        assert client.post("/causal/estimate", json={**spec, "online": True}).json()["causal_effect"] is None
+        assert client.post("/causal/specs", json=spec).status_code == 200
+        assert client.post("/causal/estimate", json={**spec, "online": True}).json()["method"] == "online_ols"
+
+        assert len(client.get("/causal/specs").json()["specs"]) == 1
+
+        metrics = client.get("/api/v1/compute/metrics").json()
+        assert (metrics["submitted"], metrics["completed"], metrics["failed"]) == (4, 3, 1)  # unregistered spec raised
+    finally:
+        executor.shutdown()
+        main.causal_lab, main.compute_executor = original_lab, original_executor
+
+
+@pytest.mark.parametrize("resamples", [-1, main.CAUSAL_MAX_BOOTSTRAP_RESAMPLES + 1, "many"])
+def test_causal_estimate_rejects_invalid_bootstrap_resamples(resamples):
+    response = TestClient(main.app).post(
+        "/causal/estimate",
+        json={"treatment": "auto_switch_deep", "outcome": "stakeholder_trust", "bootstrap_resamples": resamples},
+    )
+
+    assert response.status_code == 422
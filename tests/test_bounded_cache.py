@@ -0,0 +1,50 @@
+from src.backend.bounded_cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_lru_cache_with_zero_capacity_stores_nothing() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_entries=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_expires_entries_after_ttl() -> None:
+    now = [100.0]
+    cache: LRUCache[str, int] = LRUCache(max_entries=4, ttl_seconds=5.0, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] = 104.0
+    assert cache.get("a") == 1
+
+    now[0] = 105.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_cache_pop_removes_entry() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", -1) == -1
+    assert len(cache) == 0
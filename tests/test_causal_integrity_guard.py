@@ -1,3 +1,5 @@
+import pytest
+
 from src.backend.causal_policy_lab import CausalIntegrityGuard, PolicyProposal
 
 
@@ -16,3 +18,31 @@ def test_causal_integrity_guard_rewrites_pdpa_risky_proposal() -> None:
 
     assert decision.status == "rewrite"
     assert decision.rewritten_action == "request_explicit_consent_before_processing"
+
+
+def test_causal_integrity_guard_batch_matches_single_evaluation() -> None:
+    guard = CausalIntegrityGuard()
+    proposals = [
+        PolicyProposal(actor="agent", action="send_offer", payload={"campaign": "gold"}),
+        PolicyProposal(actor="agent", action="segment_users", payload={"fields": [{"name": "Face_Embedding"}]}),
+        PolicyProposal(actor="agent", action="upsell", payload={"ui": {"style": "dark_pattern"}}),
+    ]
+
+    decisions = guard.evaluate_many(proposals)
+
+    assert decisions == [guard.evaluate(proposal) for proposal in proposals]
+    assert [decision.reason for decision in decisions] == [
+        "Proposal passed causal and governance checks",
+        "PDPA risk detected",
+        "Governance charter mismatch",
+    ]
+
+
+def test_causal_integrity_guard_fails_closed_on_non_json_payload() -> None:
+    guard = CausalIntegrityGuard()
+    proposal = PolicyProposal(actor="agent", action="segment_users", payload={"ids": {"national_id"}})
+
+    with pytest.raises(TypeError):
+        guard.evaluate(proposal)
+    with pytest.raises(TypeError):
+        guard.evaluate_many([proposal])
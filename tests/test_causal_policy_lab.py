@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from src.backend.causal_policy_lab import CausalPolicyLab
 from src.backend.policy_genome import PolicyGenomeEngine
 
@@ -56,3 +58,531 @@ def test_policy_genome_engine_build_graph():
     assert graph["meta"]["node_count"] == 2
     assert graph["meta"]["embed_dim"] == 16
     assert len(graph["nodes"]) == 2
+
+
+def test_numpy_ols_matches_pure_python_path(tmp_path: Path):
+    pytest.importorskip("numpy")
+    from src.backend.causal_policy_lab import _ols_treatment_effect_numpy, _ols_treatment_effect_python
+
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+    lab.refresh()
+    causes = ["load_level", "industry", "scenario"]
+    prepared = lab._prepare_rows(treatment="auto_switch_deep", outcome="stakeholder_trust", common_causes=causes)
+
+    expected = _ols_treatment_effect_python(prepared, "__treatment__", "__outcome__", causes)
+    actual = _ols_treatment_effect_numpy(prepared, "__treatment__", "__outcome__", causes)
+
+    assert actual == pytest.approx(expected, abs=1e-9)
+
+
+def _prepared(tmp_path: Path, **lab_kwargs):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file, **lab_kwargs)
+    lab.refresh()
+    causes = ["load_level", "industry", "scenario"]
+    return lab, lab._prepare_rows(treatment="auto_switch_deep", outcome="stakeholder_trust", common_causes=causes), causes
+
+
+def test_random_refute_is_deterministic_and_rounds_are_configurable(tmp_path: Path):
+    lab, prepared, causes = _prepared(tmp_path, refute_rounds=12, refute_seed=5)
+
+    first = lab._random_refute(prepared, causes)
+    second = lab._random_refute(prepared, causes)
+    reseeded = lab._random_refute(prepared, causes, rounds=40, seed=6)
+
+    assert first == second
+    assert first["null_rounds"] == 12
+    assert reseeded["null_rounds"] == 40
+    assert first["baseline_effect"] > 0
+    assert 0.0 <= first["p_value"] <= 1.0
+
+
+def test_permutation_null_effects_match_full_refits(tmp_path: Path):
+    np = pytest.importorskip("numpy")
+    from src.backend.causal_policy_lab import _design_matrix, _permutation_null_effects
+
+    _, prepared, causes = _prepared(tmp_path)
+    design = _design_matrix(prepared, "__treatment__", causes)
+    y = np.array([row["__outcome__"] for row in prepared])
+
+    baseline, nulls = _permutation_null_effects(design, y, rounds=5, seed=3)
+
+    rng = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+    permuted = rng.permuted(np.tile(design[:, 1], (5, 1)), axis=1)
+    for column, null in zip(permuted, nulls):
+        placebo = design.copy()
+        placebo[:, 1] = column
+        assert null == pytest.approx(np.linalg.lstsq(placebo, y, rcond=None)[0][1], abs=1e-9)
+    assert baseline == pytest.approx(np.linalg.lstsq(design, y, rcond=None)[0][1], abs=1e-9)
+
+
+def test_random_refute_process_pool_matches_inline(tmp_path: Path, monkeypatch):
+    pytest.importorskip("numpy")
+    from src.backend import causal_policy_lab
+
+    monkeypatch.setattr(causal_policy_lab, "_REFUTE_BATCH_CELLS", 240)  # 4 rounds per batch at 60 rows
+    inline_lab, prepared, causes = _prepared(tmp_path, refute_rounds=16)
+    pooled_lab = CausalPolicyLab(events_file=tmp_path / "events.jsonl", refute_rounds=16, refute_workers=2)
+    try:
+        assert pooled_lab._random_refute(prepared, causes) == inline_lab._random_refute(prepared, causes)
+    finally:
+        pooled_lab.shutdown()
+
+
+def test_python_refute_path_is_seeded():
+    from src.backend.causal_policy_lab import _permutation_null_effects_python
+
+    prepared = [{"__treatment__": float(idx % 2), "__outcome__": 0.1 * idx, "load_level": idx % 3} for idx in range(20)]
+
+    first = _permutation_null_effects_python(prepared, ["load_level"], rounds=6, seed=9)
+    second = _permutation_null_effects_python(prepared, ["load_level"], rounds=6, seed=9)
+
+    assert first == second
+    assert len(first[1]) == 6
+
+
+def test_refresh_reads_only_appended_lines_and_handles_rotation(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+
+    assert lab.rows == [] and lab.data_version == 0  # nothing is read at construction
+    assert lab.refresh() == 60
+    offset = lab._tail.offset
+
+    record = json.loads(events_file.read_text(encoding="utf-8").splitlines()[0])
+    line = json.dumps(record)
+    with events_file.open("a", encoding="utf-8") as fh:
+        fh.write(line + "\n" + line[:10])  # second write is still in flight
+    assert lab.refresh() == 1
+    assert lab._tail.offset == offset + len(line) + 1 + 10
+    with events_file.open("a", encoding="utf-8") as fh:
+        fh.write(line[10:] + "\n")
+    assert lab.refresh() == 1
+    assert (len(lab.rows), lab.data_version) == (62, 3)
+    assert lab.refresh() == 0 and lab.data_version == 3
+
+    events_file.write_text(line + "\n", encoding="utf-8")  # truncated / rotated
+    assert lab.refresh() == 1
+    assert (len(lab.rows), lab.data_version) == (1, 4)
+
+
+
+def test_refresh_ingests_a_final_line_without_trailing_newline(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lines = events_file.read_text(encoding="utf-8").splitlines()
+    events_file.write_text("\n".join(lines[:-1]) + "\n" + lines[-1][:15], encoding="utf-8")
+    lab = CausalPolicyLab(events_file=events_file)
+
+    assert lab.refresh() == 59  # the last record is still being written
+    with events_file.open("a", encoding="utf-8") as fh:
+        fh.write(lines[-1][15:])  # completed, but the writer never adds a newline
+    assert lab.refresh() == 1
+    assert len(lab.rows) == 60
+
+    with events_file.open("a", encoding="utf-8") as fh:
+        fh.write("\n" + lines[0] + "\n")  # a late newline is not a new record
+    assert lab.refresh() == 1
+    assert (len(lab.rows), lab._tail.skipped_lines) == (61, 0)
+
+def test_auto_refresh_picks_up_new_events(tmp_path: Path):
+    import time
+
+    events_file = tmp_path / "events.jsonl"
+    lab = CausalPolicyLab(events_file=events_file)
+    lab.start_auto_refresh(0.01)
+    try:
+        _write_events(events_file)
+        deadline = time.monotonic() + 5
+        while len(lab.rows) < 60 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        lab.shutdown()
+
+    assert len(lab.rows) == 60
+
+
+def _append_events(path: Path, payloads: list[dict]):
+    with path.open("a", encoding="utf-8") as fh:
+        for payload in payloads:
+            fh.write(json.dumps({"event_type": "resonance.intervention.evaluated", "payload": payload}) + "\n")
+
+
+def _batch_effect(lab: CausalPolicyLab, treatment: str, outcome: str, causes: list[str]) -> float:
+    from src.backend.causal_policy_lab import _ols_treatment_effect_python
+
+    prepared = lab._prepare_rows(treatment=treatment, outcome=outcome, common_causes=causes)
+    return _ols_treatment_effect_python(prepared, "__treatment__", "__outcome__", causes)
+
+
+def test_online_statistics_match_batch_ols_as_events_stream_in(tmp_path: Path):
+    import random
+
+    rng = random.Random(11)
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+    causes = ["load_level", "industry", "scenario", "region"]
+
+    spec = lab.register_spec("auto_switch_deep", "stakeholder_trust", causes)
+    assert spec["sample_size"] == 60
+    online = lab.estimate_online("auto_switch_deep", "stakeholder_trust", causes)
+    assert online["method"] == "online_ols"
+    assert online["causal_effect"] == pytest.approx(_batch_effect(lab, "auto_switch_deep", "stakeholder_trust", causes))
+
+    stream_file = tmp_path / "stream.jsonl"
+    stream_lab = CausalPolicyLab(events_file=stream_file)
+    assert stream_lab.register_spec("auto_switch_deep", "stakeholder_trust", causes)["sample_size"] == 0
+
+    for batch in range(3):
+        payloads = [
+            {
+                "treatment": "auto_switch_deep" if rng.random() < 0.5 else "manual",
+                "stakeholder_trust": rng.random(),
+                "confounders": {
+                    "load_level": rng.randrange(4),
+                    "industry": rng.choice(["TechSaaS", "Healthcare", "Energy"]),
+                    "scenario": "stress_test",
+                    # A string level arrives in the last batch: numeric -> categorical.
+                    "region": rng.choice(["north", "south"]) if batch == 2 else rng.randrange(2),
+                },
+            }
+            for _ in range(25)
+        ]
+        for target_lab, target_file in ((lab, events_file), (stream_lab, stream_file)):
+            _append_events(target_file, payloads)
+            target_lab.refresh()
+            expected = _batch_effect(target_lab, "auto_switch_deep", "stakeholder_trust", causes)
+            result = target_lab.estimate_online("auto_switch_deep", "stakeholder_trust", causes)
+            assert result["causal_effect"] == pytest.approx(expected, abs=1e-9)
+        assert lab.registered_specs()[0]["sample_size"] == 60 + 25 * (batch + 1)
+    assert stream_lab._online[("auto_switch_deep", "stakeholder_trust", tuple(causes))].kinds["region"] == "categorical"
+
+
+def test_online_and_batch_paths_drop_the_same_nan_rows(tmp_path: Path):
+    import random
+
+    rng = random.Random(3)
+    events_file = tmp_path / "events.jsonl"
+    causes = ["load_level", "industry"]
+    payloads = []
+    for idx in range(80):
+        treated = float(idx % 2)
+        payloads.append(
+            {
+                # A numeric generic `treatment`, NaN for every 7th row; every 11th outcome is NaN.
+                "treatment": float("nan") if idx % 7 == 0 else treated,
+                "stakeholder_trust": float("nan") if idx % 11 == 0 else 0.4 + 0.2 * treated + rng.random() * 0.1,
+                "confounders": {"load_level": idx % 3, "industry": rng.choice(["TechSaaS", "Energy"])},
+            }
+        )
+    _append_events(events_file, payloads)
+    lab = CausalPolicyLab(events_file=events_file)
+
+    spec = lab.register_spec("auto_switch_deep", "stakeholder_trust", causes)
+    prepared = lab._prepare_rows(treatment="auto_switch_deep", outcome="stakeholder_trust", common_causes=causes)
+    expected_rows = sum(1 for idx in range(80) if idx % 7 and idx % 11)
+    assert spec["sample_size"] == len(prepared) == expected_rows
+
+    online = lab.estimate_online("auto_switch_deep", "stakeholder_trust", causes)["causal_effect"]
+    assert online == pytest.approx(_batch_effect(lab, "auto_switch_deep", "stakeholder_trust", causes), abs=1e-9)
+    batch = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", causes, method="linear_regression")
+    assert batch["sample_size"] == expected_rows
+    if batch["method"] == "adjusted_ols":
+        assert online == pytest.approx(batch["causal_effect"], abs=1e-9)
+
+
+def test_estimate_online_requires_registration(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+
+    with pytest.raises(KeyError):
+        lab.estimate_online("auto_switch_deep", "stakeholder_trust")
+    lab.register_spec("auto_switch_deep", "stakeholder_trust")
+    assert lab.registered_specs()[0]["common_causes"] == ["load_level", "industry", "scenario"]
+
+
+def test_estimates_are_cached_per_data_version(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+
+    first = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust")
+    first["causal_effect"] = "mutated by caller"
+    second = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust")
+    assert isinstance(second["causal_effect"], float)
+    assert lab.cache_stats()["hits"] == 1
+
+    lab.recommend_policies(top_n=3)
+    lab.recommend_policies(top_n=3)
+    # First call reuses the stakeholder_trust estimate; the second is all hits.
+    assert lab.cache_stats()["hits"] == 1 + 1 + 3
+
+    _append_events(events_file, [{"treatment": "manual", "stakeholder_trust": 0.1}])
+    lab.refresh()
+    third = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust")
+    assert third["sample_size"] == second["sample_size"] + 1
+    assert lab.cache_stats()["data_version"] == 2
+
+
+def test_estimate_matrix_matches_pairwise_estimates(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    # Rows without `adaptability` put that outcome in its own row group.
+    _append_events(
+        events_file,
+        [
+            {
+                "treatment": "summary_to_story" if idx % 2 else "manual",
+                "stakeholder_trust": 0.5 + (idx % 2) * 0.1 + idx * 0.001,
+                "resource_efficiency": 0.4 + (idx % 3) * 0.02,
+                "confounders": {"load_level": idx % 3, "industry": "Retail", "scenario": "stress_test"},
+            }
+            for idx in range(12)
+        ],
+    )
+    lab = CausalPolicyLab(events_file=events_file, refute_rounds=0)
+    treatments = ["auto_switch_deep", "summary_to_story"]
+    outcomes = ["stakeholder_trust", "adaptability", "resource_efficiency", "resilience"]
+
+    matrix = lab.estimate_matrix(treatments, outcomes)
+
+    assert matrix["treatments"] == treatments and list(matrix["effects"]["auto_switch_deep"]) == outcomes
+    for treatment in treatments:
+        assert matrix["effects"][treatment]["resilience"] is None
+        assert matrix["sample_sizes"][treatment]["resilience"] == 0
+        for outcome in outcomes[:3]:
+            single = lab.estimate_causal_effect(treatment, outcome)
+            assert matrix["sample_sizes"][treatment][outcome] == single["sample_size"]
+            assert matrix["effects"][treatment][outcome] == pytest.approx(single["causal_effect"], abs=1e-9)
+    assert lab.estimate_matrix(treatments, outcomes) == matrix
+
+
+def test_bootstrap_interval_is_seeded_and_brackets_the_effect(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file, refute_rounds=0, bootstrap_resamples=40, bootstrap_seed=3)
+
+    first = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", use_cache=False)
+    second = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", use_cache=False)
+    interval = first["confidence_interval"]
+
+    assert interval == second["confidence_interval"]
+    assert interval["method"] == "bootstrap_percentile" and interval["resamples"] == 40
+    assert interval["lower"] <= first["causal_effect"] <= interval["upper"]
+    assert interval["std_error"] > 0
+    assert lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", bootstrap_resamples=0)[
+        "confidence_interval"
+    ] is None
+
+
+def test_bootstrap_resample_budget_caps_each_request(tmp_path: Path):
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file, refute_rounds=0, bootstrap_max_cells=60 * 8)
+
+    capped = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", bootstrap_resamples=500)
+    assert (capped["confidence_interval"]["resamples"], capped["confidence_interval"]["requested_resamples"]) == (8, 500)
+
+    lab.bootstrap_max_cells = 60
+    tiny = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", bootstrap_resamples=500)
+    assert tiny["confidence_interval"] is None
+
+
+def test_bootstrap_matches_full_refits_and_pool_matches_inline(tmp_path: Path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    from src.backend import causal_policy_lab
+    from src.backend.causal_policy_lab import _bootstrap_effects, _design_matrix
+
+    _, prepared, causes = _prepared(tmp_path)
+    design = _design_matrix(prepared, "__treatment__", causes)
+    y = np.array([row["__outcome__"] for row in prepared])
+
+    effects = _bootstrap_effects(design, y, resamples=4, seed=1)
+    picks = np.random.default_rng(np.random.SeedSequence(1).spawn(1)[0]).integers(0, len(y), size=(4, len(y)))
+    for rows, effect in zip(picks, effects):
+        assert effect == pytest.approx(np.linalg.lstsq(design[rows], y[rows], rcond=None)[0][1], abs=1e-9)
+
+    monkeypatch.setattr(causal_policy_lab, "_BOOTSTRAP_BATCH_CELLS", 60 * 3)  # 3 per batch
+    inline = _bootstrap_effects(design, y, resamples=10, seed=2)
+    with causal_policy_lab.ProcessPoolExecutor(max_workers=2) as pool:
+        assert _bootstrap_effects(design, y, resamples=10, seed=2, executor=pool) == inline
+
+
+def test_python_bootstrap_path_is_seeded_and_matches_resampled_refits():
+    import random
+
+    from src.backend.causal_policy_lab import _bootstrap_effects_python, _ols_treatment_effect_python
+
+    prepared = [
+        {"__treatment__": float(idx % 2), "__outcome__": 0.1 * idx + (idx % 7) * 0.03, "load_level": idx % 3}
+        for idx in range(20)
+    ]
+
+    first = _bootstrap_effects_python(prepared, ["load_level"], resamples=5, seed=4)
+
+    assert first == _bootstrap_effects_python(prepared, ["load_level"], resamples=5, seed=4)
+    rng = random.Random(4)
+    for effect in first:
+        picks = [prepared[rng.randrange(len(prepared))] for _ in prepared]
+        assert effect == pytest.approx(
+            _ols_treatment_effect_python(picks, "__treatment__", "__outcome__", ["load_level"]), abs=1e-9
+        )
+
+
+def test_default_estimates_skip_the_bootstrap(tmp_path: Path, monkeypatch):
+    from src.backend import causal_policy_lab
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("bootstrap ran on the default estimate path")
+
+    monkeypatch.setattr(causal_policy_lab, "_bootstrap_effects", fail)
+    monkeypatch.setattr(causal_policy_lab, "_bootstrap_effects_python", fail)
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file)
+
+    assert lab.bootstrap_resamples == 0
+    assert lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust")["confidence_interval"] is None
+    assert lab.recommend_policies(top_n=3)
+
+
+def test_dowhy_refute_mode_is_validated(tmp_path: Path):
+    with pytest.raises(ValueError):
+        CausalPolicyLab(events_file=tmp_path / "events.jsonl", dowhy_refute="sometimes")
+
+
+def test_dowhy_models_are_reused_and_refutation_attaches_in_background(tmp_path: Path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("dowhy")
+    import time
+
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file, dowhy_refute="background")
+    try:
+        first = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="linear_regression")
+        assert first["method"] == "dowhy.linear_regression"
+        assert first["refute_results"]["status"] in ("pending", "completed")
+
+        deadline = time.monotonic() + 120
+        while lab.cache_stats()["pending_refutes"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        again = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="linear_regression")
+        assert again["causal_effect"] == first["causal_effect"]
+        assert again["refute_results"]["status"] == "completed"
+
+        # A second method on the same spec and data version reuses the identified model.
+        lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="propensity_score_matching")
+        assert lab.cache_stats()["dowhy_models"]["hits"] >= 1
+    finally:
+        lab.shutdown()
+
+
+class _FakeFrame:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.columns = {key for row in rows for key in row}
+
+
+def _fake_dowhy(monkeypatch, gate):
+    import threading
+    from types import SimpleNamespace
+
+    from src.backend import causal_policy_lab
+
+    models, refuted = [], []
+
+    class FakeCausalModel:
+        def __init__(self, data, **_kwargs):
+            self.data = data
+            self.busy = threading.Lock()
+            self.overlaps = 0
+            models.append(self)
+
+        def identify_effect(self):
+            return "backdoor"
+
+        def _exclusive(self):
+            if not self.busy.acquire(blocking=False):
+                self.overlaps += 1
+                self.busy.acquire()
+
+        def estimate_effect(self, identified, method_name, confidence_intervals):
+            self._exclusive()
+            try:
+                treated = [row["__outcome__"] for row in self.data.rows if row["__treatment__"] == 1.0]
+                control = [row["__outcome__"] for row in self.data.rows if row["__treatment__"] == 0.0]
+                return SimpleNamespace(value=sum(treated) / len(treated) - sum(control) / len(control))
+            finally:
+                self.busy.release()
+
+        def refute_estimate(self, identified, estimate, method_name):
+            self._exclusive()
+            try:
+                refuted.append(self)
+                assert gate.wait(5)
+                return f"refuted over {len(self.data.rows)} rows"
+            finally:
+                self.busy.release()
+
+    monkeypatch.setattr(causal_policy_lab, "CausalModel", FakeCausalModel)
+    monkeypatch.setattr(causal_policy_lab, "pd", SimpleNamespace(DataFrame=_FakeFrame))
+    return models, refuted
+
+
+def test_background_refutes_share_the_model_lock_and_drop_stale_versions(tmp_path: Path, monkeypatch):
+    import threading
+    import time
+
+    gate = threading.Event()
+    models, refuted = _fake_dowhy(monkeypatch, gate)
+    events_file = tmp_path / "events.jsonl"
+    _write_events(events_file)
+    lab = CausalPolicyLab(events_file=events_file, dowhy_refute="background")
+
+    def wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert condition()
+
+    try:
+        first = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="linear_regression")
+        assert (first["method"], first["refute_results"]["status"]) == ("dowhy.linear_regression", "pending")
+        wait_for(lambda: len(refuted) == 1)
+
+        # Another method on the same spec reuses the model, so it waits for the running refutation.
+        other = threading.Thread(
+            target=lab.estimate_causal_effect, args=("auto_switch_deep", "stakeholder_trust", None, "propensity_score_matching")
+        )
+        other.start()
+        other.join(0.2)
+        assert other.is_alive()
+        assert lab.estimate_causal_effect("auto_switch_deep", "adaptability")["refute_results"]["status"] == "pending"
+        assert lab.cache_stats()["pending_refutes"] == 2
+
+        # New events: the queued refutation is cancelled and the running one is forgotten.
+        _append_events(events_file, [{"treatment": "auto_switch_deep", "stakeholder_trust": 0.9, "adaptability": 0.6}])
+        assert lab.refresh() == 1
+        assert lab.cache_stats()["pending_refutes"] == 0
+
+        gate.set()
+        other.join(5)
+        assert not other.is_alive()
+        assert len(models) == 2 and lab.cache_stats()["dowhy_models"]["hits"] >= 1
+        assert all(model.overlaps == 0 for model in models)
+
+        fresh = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="linear_regression")
+        assert fresh["sample_size"] == 61 and fresh["refute_results"]["status"] == "pending"
+        wait_for(lambda: lab.cache_stats()["pending_refutes"] == 0)
+        done = lab.estimate_causal_effect("auto_switch_deep", "stakeholder_trust", method="linear_regression")
+        assert done["refute_results"] == {"method": "random_common_cause", "status": "completed", "result": "refuted over 61 rows"}
+        assert refuted == [models[0], models[2]]  # the cancelled `adaptability` refutation never ran
+    finally:
+        lab.shutdown()
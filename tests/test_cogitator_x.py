@@ -1,3 +1,5 @@
+import pytest
+
 from src.backend.cogitator_x import (
     CogitatorXEngine,
     LanguageMixedThoughtGenerator,
@@ -5,6 +7,9 @@ from src.backend.cogitator_x import (
     ProcessRewardModel,
     RuleBasedOutcomeReward,
     PythonToolExecutor,
+    ReasoningTrace,
+    SearchTree,
+    SynergyResolver,
     WisdomGemStore,
 )
 
@@ -53,7 +58,8 @@ def test_pangenes_crystallizes_gems_when_outcome_fails() -> None:
     )
 
     assert result["answer"] == "12"
-    assert len(result["gems"]) >= 1
+    assert len(result["new_gems"]) >= 1
+    assert result["gem_count"] == len(gems)
 
 
 def test_cogitator_x_resonance_path_adds_decision_state_and_memory_report() -> None:
@@ -74,3 +80,375 @@ def test_cogitator_x_resonance_path_adds_decision_state_and_memory_report() -> N
     assert result["answer"] == "9"
     assert result["decision_state"] == "stabilization_mode"
     assert "memory_report" in result
+
+
+def test_process_reward_model_batch_scores_match_single_step_scores() -> None:
+    prm = ProcessRewardModel()
+    steps = [
+        "Step 3: compute equation path variant=1",
+        "Therefore verify the answer",
+        "plain narration",
+        "backtrack on contradiction => 42",
+        "computequation without spaces",
+        "PLAIN NARRATION",
+    ]
+
+    batch = prm.evaluate_steps(steps, context="prompt")
+
+    assert batch == [ProcessRewardModel(cache_size=0).evaluate_step(step, context="prompt") for step in steps]
+    assert batch == pytest.approx([0.8, 0.8, 0.4, 1.0, 0.6, 0.4])
+
+
+def test_process_reward_model_memoizes_repeated_steps_within_bound() -> None:
+    generator = LanguageMixedThoughtGenerator()
+    prm = ProcessRewardModel(cache_size=8)
+    engine = CogitatorXEngine(generator=generator, prm=prm, pangenes=PangenesAgent(WisdomGemStore()))
+
+    engine.solve(
+        prompt="Compute 7 + 5",
+        outcome_reward=RuleBasedOutcomeReward(answer_checker=lambda a: a == "12"),
+        compute_budget=6,
+        base_branch_factor=2,
+        language_mode="en",
+    )
+
+    stats = prm.cache_stats()
+    assert stats["size"] <= 8
+    assert stats["hits"] > stats["misses"]
+
+
+def test_generator_reuses_cached_candidates_across_solve_iterations() -> None:
+    generator = LanguageMixedThoughtGenerator()
+    engine = CogitatorXEngine(generator=generator, prm=ProcessRewardModel(), pangenes=PangenesAgent(WisdomGemStore()))
+
+    engine.solve(
+        prompt="Compute 7 + 5",
+        outcome_reward=RuleBasedOutcomeReward(answer_checker=lambda a: a == "12"),
+        compute_budget=10,
+        base_branch_factor=2,
+        language_mode="en",
+    )
+
+    stats = generator.cache_stats()
+    assert stats["misses"] <= 2
+    assert stats["hits"] >= 8
+
+    first = generator.generate_candidates("Compute 7 + 5", branch_factor=2, language="en")
+    first[0].steps.append("mutated by caller")
+    second = generator.generate_candidates("Compute 7 + 5", branch_factor=2, language="en")
+    assert second[0].steps == LanguageMixedThoughtGenerator._base_steps("Compute 7 + 5", variant=0, language="en")
+    assert second[0].final_answer == "12"
+
+
+def test_search_tree_backpropagates_along_full_path_and_tracks_child_visits() -> None:
+    tree = SearchTree(ReasoningTrace())
+    first_level = tree.add_children(SearchTree.ROOT, [ReasoningTrace(), ReasoningTrace()], prior=0.5)
+    leaf_level = tree.add_children(first_level[1], [ReasoningTrace(), ReasoningTrace(), ReasoningTrace()], prior=1 / 3)
+
+    tree.backpropagate(first_level[0], 1.0)
+    tree.backpropagate(leaf_level[2], 0.5)
+    tree.backpropagate(leaf_level[0], 0.25)
+
+    assert tree.visits[SearchTree.ROOT] == 3
+    assert tree.value_sum[SearchTree.ROOT] == 1.75
+    assert tree.visits[first_level[1]] == 2
+    assert tree.value(first_level[1]) == 0.375
+    assert tree.parent[leaf_level[2]] == first_level[1]
+    for node in range(len(tree)):
+        assert tree.child_visit_total[node] == sum(tree.visits[child] for child in tree.children(node))
+
+
+def _engine() -> CogitatorXEngine:
+    return CogitatorXEngine(
+        generator=LanguageMixedThoughtGenerator(),
+        prm=ProcessRewardModel(),
+        pangenes=PangenesAgent(WisdomGemStore()),
+    )
+
+
+def test_solve_stops_early_once_target_confidence_is_reached() -> None:
+    result = _engine().solve(
+        prompt="Compute 7 + 5",
+        outcome_reward=RuleBasedOutcomeReward(answer_checker=lambda a: a == "12"),
+        compute_budget=200,
+        target_confidence=0.85,
+    )
+
+    assert result["stop_reason"] == "target_confidence"
+    assert result["iterations"] < 200
+    assert result["answer"] == "12"
+    assert result["confidence"] >= 0.85
+
+
+def test_solve_returns_best_answer_so_far_when_deadline_expires() -> None:
+    result = _engine().solve(
+        prompt="Compute 7 + 5",
+        outcome_reward=RuleBasedOutcomeReward(answer_checker=lambda _: False),
+        compute_budget=10_000,
+        deadline_ms=0,
+    )
+
+    assert result["stop_reason"] == "deadline"
+    assert result["iterations"] == 1
+    assert result["answer"] == "12"
+
+
+def test_solve_runs_full_budget_without_stopping_criteria() -> None:
+    result = _engine().solve(
+        prompt="Compute 7 + 5",
+        outcome_reward=RuleBasedOutcomeReward(answer_checker=lambda _: False),
+        compute_budget=5,
+        target_visit_share=1.0,
+    )
+
+    assert result["stop_reason"] == "budget_exhausted"
+    assert result["iterations"] == 5
+
+
+def _answer_is_twelve(answer: str) -> bool:
+    return answer == "12"
+
+
+def _deterministic_view(results: list[dict[str, object]]) -> list[dict[str, object]]:
+    return [{key: value for key, value in result.items() if key != "elapsed_ms"} for result in results]
+
+
+def test_solve_batch_is_deterministic_across_worker_counts() -> None:
+    prompts = ["Compute 7 + 5", "Compute 4 + 8", "จงหาผลลัพธ์ 6 + 6", "Summarize the roadmap"]
+    outcome = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve)
+
+    engine = _engine()
+    try:
+        inline = engine.solve_batch(prompts, outcome, workers=1, compute_budget=8)
+        threaded = engine.solve_batch(prompts, outcome, workers=3, use_processes=False, compute_budget=8)
+        pooled = engine.solve_batch(prompts, outcome, workers=2, use_processes=True, compute_budget=8)
+    finally:
+        engine.shutdown()
+
+    assert _deterministic_view(inline) == _deterministic_view(threaded) == _deterministic_view(pooled)
+    assert [result["answer"] for result in inline] == ["12", "12", "12", "insufficient-data"]
+    assert inline[3]["new_gems"]
+    assert engine.pangenes.store.list_all() == inline[3]["new_gems"]
+
+
+def test_solve_batch_keeps_pools_alive_across_worker_counts() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = _engine()
+    outcome = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve)
+    prompts = ["Compute 7 + 5", "Compute 6 + 6"]
+    try:
+        # Alternating pool sizes from several threads used to shut a pool down
+        # while another thread was submitting to it.
+        with ThreadPoolExecutor(max_workers=4) as callers:
+            futures = [
+                callers.submit(
+                    engine.solve_batch, prompts, outcome, workers=2 + idx % 2, use_processes=False, compute_budget=4
+                )
+                for idx in range(16)
+            ]
+            answers = {tuple(result["answer"] for result in future.result(timeout=30)) for future in futures}
+        assert answers == {("12", "12")}
+        assert sorted(engine._pools) == [(False, 2), (False, 3)]
+    finally:
+        engine.shutdown()
+    assert engine._pools == {}
+
+
+def test_asolve_offloads_solve_from_event_loop() -> None:
+    import asyncio
+
+    engine = _engine()
+    result = asyncio.run(
+        engine.asolve(
+            "Compute 7 + 5",
+            RuleBasedOutcomeReward(answer_checker=lambda a: a == "12"),
+            compute_budget=4,
+        )
+    )
+
+    assert result["answer"] == "12"
+    assert result["iterations"] == 4
+
+
+def test_wisdom_gem_store_dedups_evicts_and_pages() -> None:
+    store = WisdomGemStore(capacity=3)
+
+    assert store.append_gem("a") is True
+    assert store.append_gem("a") is False
+    mark = store.sequence
+    for lesson in ("b", "c", "d"):
+        store.append_gem(lesson)
+    store.append_gem("c")
+
+    assert store.list_all() == ["b", "c", "d"]
+    assert store.since(mark) == ["b", "c", "d"]
+    assert store.since(store.sequence) == []
+    assert store.page(offset=1, limit=1) == ["c"]
+    assert store.top_k(1) == ["c"]
+    assert store.stats()["evictions"] == 1
+
+
+def test_wisdom_gem_store_replays_and_compacts_log(tmp_path) -> None:
+    log_path = tmp_path / "gems.jsonl"
+    store = WisdomGemStore(capacity=2, log_path=log_path)
+    for lesson in ("a", "b", "c", "d", "e"):
+        store.append_gem(lesson)
+
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) <= 2 * store.capacity
+    assert WisdomGemStore(capacity=2, log_path=log_path).list_all() == ["d", "e"]
+
+    store.compact()
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_solve_result_cache_hits_bypasses_and_keys_on_checker() -> None:
+    engine = _engine()
+    twelve = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve, checker_id="equals:12")
+
+    first = engine.solve("Compute 7 + 5", twelve, compute_budget=6)
+    # A checker rebuilt per request still hits when it carries the same id.
+    second = engine.solve("Compute 7 + 5", RuleBasedOutcomeReward(lambda a: a == "12", "equals:12"), compute_budget=6)
+    bypassed = engine.solve("Compute 7 + 5", twelve, compute_budget=6, use_cache=False)
+    other_checker = engine.solve("Compute 7 + 5", RuleBasedOutcomeReward(lambda a: a == "13", "equals:13"), compute_budget=6)
+    anonymous = engine.solve("Compute 7 + 5", RuleBasedOutcomeReward(_answer_is_twelve), compute_budget=6)
+
+    assert (first["cache"], second["cache"]) == ("miss", "hit")
+    assert "cache" not in bypassed
+    assert "cache" not in anonymous
+    assert second["answer"] == first["answer"] == bypassed["answer"] == anonymous["answer"]
+    assert other_checker["cache"] == "miss"
+    assert second["new_gems"] == []
+    stats = engine.result_cache_stats()
+    assert (stats["hits"], stats["size"]) == (1, 2)
+
+
+def test_solve_coalesces_concurrent_identical_requests() -> None:
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    release = threading.Event()
+    calls = 0
+
+    def slow_checker(answer: str) -> bool:
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return answer == "12"
+
+    engine = _engine()
+    reward = RuleBasedOutcomeReward(answer_checker=slow_checker, checker_id="equals:12")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(engine.solve, "Compute 7 + 5", reward, compute_budget=2) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while engine.result_cache_stats()["coalesced"] < 3 and time.monotonic() < deadline:
+            release.wait(timeout=0.005)
+        coalesced = engine.result_cache_stats()["coalesced"]
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert coalesced == 3
+
+    assert sorted(result["cache"] for result in results) == ["hit", "hit", "hit", "miss"]
+    assert len({result["answer"] for result in results}) == 1
+    assert calls == 4  # one search: 2 iterations x 2 candidates
+
+
+def test_solve_profile_reports_phases_counters_and_tree_stats() -> None:
+    engine = _engine()
+    reward = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve)
+
+    plain = engine.solve("Compute 7 + 5", reward, compute_budget=5)
+    profiled = engine.solve("Compute 7 + 5", reward, compute_budget=5, profile=True)
+
+    assert "profile" not in plain
+    profile = profiled["profile"]
+    assert set(profile["phase_ms"]) == {"select", "expand", "prm", "outcome", "backprop", "pangenes", "early_stop"}
+    assert profile["counters"]["iterations"] == 5
+    assert profile["tree"]["node_count"] == profile["counters"]["candidates"] + 1
+    assert profile["tree"]["max_depth"] >= 1
+    assert profiled["answer"] == plain["answer"]
+
+
+def test_concurrent_resonance_solves_share_kv_pool_without_collisions() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.backend.paged_kv_cache import SharedPagedKVBlockManager
+
+    memory = SharedPagedKVBlockManager(num_gpu_blocks=2, block_size=16)
+    engines = [
+        CogitatorXEngine(
+            generator=LanguageMixedThoughtGenerator(),
+            prm=ProcessRewardModel(),
+            pangenes=PangenesAgent(WisdomGemStore()),
+            kv_memory=memory,
+        )
+        for _ in range(2)
+    ]
+    reward = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve)
+
+    def run(idx: int) -> dict[str, object]:
+        return engines[idx % 2].solve_with_resonance(
+            "Compute 7 + 5",
+            reward,
+            user_id="same-user",
+            resonance_score=0.7,
+            use_cache=False,
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, range(32)))
+
+    assert {result["answer"] for result in results} == {"12"}
+    report = memory.memory_report()
+    assert report["used_blocks"] == 0
+    assert report["active_requests"] == 0
+    assert report["peak_active_requests"] <= 2
+    assert report["admission_timeouts"] == 0
+
+
+def test_synergy_resolver_table_matches_rules_and_interns_results() -> None:
+    resolver = SynergyResolver()
+
+    for channel in ("line", " PromptPay ", "tiktok", "LIFF", "unknown"):
+        for trigger in SynergyResolver._KNOWN_TRIGGERS + ("never_seen",):
+            for payload in (None, {"category": "high-tech"}, {"text": "hi"}):
+                expected = SynergyResolver._build_resolution(
+                    channel.strip().upper(),
+                    trigger,
+                    payload is not None and payload.get("category") == "high-tech",
+                )
+                assert resolver.resolve(channel=channel, trigger=trigger.upper(), payload=payload) == expected
+
+    first = resolver.resolve(channel="line", trigger="purchase_intent")
+    assert resolver.resolve(channel="LINE", trigger="Purchase_Intent ") is first
+    assert "fintech" in first.agents
+
+
+def test_synergy_resolver_resolve_many_preserves_order() -> None:
+    resolver = SynergyResolver(max_dynamic_entries=0)
+    events = [
+        ("LINE", "purchase_intent", None),
+        ("PROMPTPAY", "payment_received", {"category": "high-tech"}),
+        ("TIKTOK", "comment_detected", None),
+    ]
+
+    resolved = resolver.resolve_many(events)
+
+    assert [r.channel for r in resolved] == ["LINE", "PROMPTPAY", "TIKTOK"]
+    assert resolved == [resolver.resolve(channel=c, trigger=t, payload=p) for c, t, p in events]
+    assert "edtech" in resolved[1].agents
+
+
+def test_solve_auto_uses_selector_profile_and_records_fresh_searches() -> None:
+    engine = _engine()
+    reward = RuleBasedOutcomeReward(answer_checker=_answer_is_twelve, checker_id="equals:12")
+
+    first = engine.solve_auto("7 + 5", reward)
+    replay = engine.solve_auto("7 + 5", reward)
+
+    assert first["reasoning_profile"] == {"prompt_class": "arithmetic", "compute_budget": 4, "branch_factor": 1}
+    assert first["iterations"] == 4
+    assert replay["cache"] == "hit"
+    assert engine.profile_selector.estimates()["arithmetic"]["4x1"]["samples"] == 1
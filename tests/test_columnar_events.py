@@ -0,0 +1,94 @@
+import pytest
+
+from src.backend.causal_policy_lab import _coerce_numeric, _coerce_treatment
+from src.backend.columnar_events import ColumnarEventTable
+
+ROWS = [
+    {"event_type": "a", "treatment": "auto_switch_deep", "trust": 0.7, "load": 1, "industry": "TechSaaS"},
+    {"event_type": "a", "treatment": "manual", "trust": "0.4", "load": 2, "industry": "Retail"},
+    {"event_type": "b", "treatment": True, "trust": 0.6, "load": 0.5, "industry": "Retail", "flag": None},
+    {"event_type": "a", "auto_switch_deep": 0.25, "trust": 0.55, "load": 3, "industry": 7},
+    {"event_type": "a", "treatment": None, "trust": 0.9, "load": 1, "industry": "Finance"},
+    {"event_type": "a", "treatment": "manual", "trust": True, "load": 2, "industry": "Finance"},
+    {"event_type": "a", "treatment": "auto_switch_deep", "trust": float("nan"), "load": 0, "industry": "Retail"},
+    {"event_type": "b", "treatment": 0, "trust": 0.35, "load": 2, "industry": "TechSaaS", "late": [1, 2]},
+    {"event_type": "a", "treatment": "auto_switch_deep", "trust": 0.8, "load": 1, "industry": "TechSaaS", "late": "x"},
+    {"event_type": "a", "treatment": "manual", "trust": 0.5, "load": 3, "industry": "Healthcare", "late": 3},
+]
+
+
+def _dict_prepare(rows, treatment, outcome, causes):
+    prepared = []
+    for row in rows:
+        treatment_value = _coerce_treatment(row, treatment)
+        outcome_value = _coerce_numeric(row.get(outcome))
+        if treatment_value is None or outcome_value is None:
+            continue
+        out_row = {"__treatment__": treatment_value, "__outcome__": outcome_value}
+        out_row.update({cause: row[cause] for cause in causes if cause in row})
+        prepared.append(out_row)
+    return prepared
+
+
+def test_rows_round_trip_including_late_columns_and_objects():
+    table = ColumnarEventTable(ROWS[:5])
+    table.append_rows(ROWS[5:])
+
+    assert len(table) == len(ROWS)
+    restored = table.to_rows()
+    for original, row in zip(ROWS, restored):
+        assert row.keys() == original.keys()
+        for key, value in original.items():
+            if isinstance(value, float) and value != value:
+                assert row[key] != row[key]
+            else:
+                assert row[key] == value and type(row[key]) is type(value)
+    assert table.memory_bytes() > 0
+
+
+def test_prepare_rows_matches_dict_rows():
+    table = ColumnarEventTable(ROWS)
+    causes = ["load", "industry", "late", "missing"]
+
+    assert table.prepare_rows(treatment="auto_switch_deep", outcome="trust", common_causes=causes) == _dict_prepare(
+        ROWS, "auto_switch_deep", "trust", causes
+    )
+
+
+def test_design_matches_dict_design_matrix():
+    np = pytest.importorskip("numpy")
+    from src.backend.causal_policy_lab import _design_matrix
+
+    # `late` is missing from some selected rows, `event_type` mixes labels only,
+    # `industry` mixes an int with strings.
+    table = ColumnarEventTable(ROWS)
+    causes = ["load", "industry", "late", "event_type", "missing"]
+    design, y = table.design(treatment="auto_switch_deep", outcome="trust", common_causes=causes)
+    prepared = _dict_prepare(ROWS, "auto_switch_deep", "trust", causes)
+
+    np.testing.assert_array_equal(design, _design_matrix(prepared, "__treatment__", causes))
+    np.testing.assert_array_equal(y, [row["__outcome__"] for row in prepared])
+
+
+def test_columns_only_grow_for_rows_that_set_them():
+    table = ColumnarEventTable([{"trust": 0.5, "rare": "x"}])
+    table.append_rows({"trust": 0.1 * idx} for idx in range(99))
+
+    assert len(table) == 100
+    assert (len(table.columns["trust"]), len(table.columns["rare"])) == (100, 1)
+    assert table.row(0) == {"trust": 0.5, "rare": "x"}
+    assert table.row(99) == {"trust": 0.1 * 98}
+    assert table.prepare_rows(treatment="rare", outcome="trust", common_causes=["rare"]) == []
+
+    table.append_rows([{"rare": "y"}])
+    assert len(table.columns["rare"]) == 101
+    assert [row.get("rare") for row in table.iter_rows()].count(None) == 99
+
+
+def test_ints_beyond_float_precision_round_trip_exactly():
+    big = [2**53 + 1, -(2**63) + 7, 2**53, 10**30 + 3]
+    table = ColumnarEventTable({"id": value} for value in big)
+
+    assert [row["id"] for row in table.to_rows()] == big
+    assert all(type(row["id"]) is int for row in table.iter_rows())
+    assert table.columns["id"].text(0) == str(2**53 + 1)
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.backend.compute_executor import BoundedComputeExecutor, ComputeSaturatedError, ComputeTimeoutError
+
+
+def _busy(seconds: float) -> str:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+    return "done"
+
+
+def test_run_keeps_event_loop_responsive():
+    executor = BoundedComputeExecutor(1)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        result = await executor.run(_busy, 0.2)
+        task.cancel()
+        return result, ticks
+
+    try:
+        result, ticks = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert result == "done"
+    assert ticks >= 5  # the loop kept serving other coroutines during the CPU-bound job
+    metrics = executor.metrics()
+    assert (metrics["submitted"], metrics["completed"], metrics["in_flight"]) == (1, 1, 0)
+    assert metrics["avg_run_ms"] >= 150
+
+
+def test_queue_depth_limit_rejects_and_timeout_keeps_slot_until_done():
+    executor = BoundedComputeExecutor(1, max_queue_depth=1, timeout_s=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued", timeout_s=5))
+        await asyncio.sleep(0)
+        with pytest.raises(ComputeSaturatedError):
+            await executor.run(lambda: "rejected")
+        with pytest.raises(ComputeTimeoutError):
+            await first
+        saturated = executor.metrics()
+        release.set()
+        return saturated, await queued
+
+    try:
+        saturated, queued = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert queued == "queued"
+    assert (saturated["in_flight"], saturated["queued"], saturated["saturation"]) == (2, 1, 1.0)
+    metrics = executor.metrics()
+    assert (metrics["rejected"], metrics["timeouts"], metrics["completed"], metrics["in_flight"]) == (1, 1, 2, 0)
+    assert metrics["peak_in_flight"] == 2
+
+
+def test_failures_are_counted_and_reraised():
+    executor = BoundedComputeExecutor(2)
+
+    def explode():
+        raise ValueError("bad spec")
+
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(explode))
+    finally:
+        executor.shutdown()
+    assert (executor.metrics()["failed"], executor.metrics()["in_flight"]) == (1, 0)
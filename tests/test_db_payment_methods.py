@@ -33,3 +33,33 @@ def test_add_payment_method_self_heals_missing_default_flag(tmp_path):
     default_method = db.get_default_payment_method(user_id)
     assert default_method is not None
     assert default_method.id == second.id
+
+
+def test_batched_payment_updates_insert_one_transaction_per_row(tmp_path):
+    import asyncio
+
+    db.DB_PATH = tmp_path / "asi-payments-batch.db"
+    db.init_db()
+    user_id, _ = db.create_default_user("batch@example.com", "Batch", None, None)
+
+    tx_ids = asyncio.run(db.update_payment_statuses([(user_id, 100.0, "COMPLETED"), (user_id, 50.0, "FAILED")]))
+    asyncio.run(db.activate_services([user_id]))
+
+    with db.get_conn() as conn:
+        rows = conn.execute("SELECT id, amount, status FROM transactions WHERE user_id = ? ORDER BY amount", (user_id,)).fetchall()
+    assert sorted(tx_ids) == sorted(row["id"] for row in rows)
+    assert [(row["amount"], row["status"]) for row in rows] == [(50.0, "FAILED"), (100.0, "SUCCESS")]
+
+
+def test_payment_refs_are_stored_and_looked_up(tmp_path):
+    import asyncio
+
+    db.DB_PATH = tmp_path / "asi-payments-refs.db"
+    db.init_db()
+    user_id, _ = db.create_default_user("refs@example.com", "Refs", None, None)
+
+    asyncio.run(db.update_payment_statuses([(user_id, 100.0, "COMPLETED", "R-1"), (user_id, 5.0, "FAILED", "R-2")]))
+    asyncio.run(db.update_payment_status(user_id=user_id, amount=20.0, status="COMPLETED", gateway_ref_id="R-3"))
+
+    assert asyncio.run(db.recorded_payment_refs(["R-1", "R-2", "R-3", "R-4"])) == {"R-1", "R-3"}
+    assert asyncio.run(db.recorded_payment_refs([])) == set()
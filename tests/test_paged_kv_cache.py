@@ -1,6 +1,11 @@
 import pytest
 
-from src.backend.paged_kv_cache import OutOfBlocksError, PagedKVBlockManager
+from src.backend.paged_kv_cache import (
+    OutOfBlocksError,
+    PagedKVBlockManager,
+    SharedPagedKVBlockManager,
+    SlidingWindowPolicy,
+)
 
 
 def test_allocate_and_append_on_demand_block_growth():
@@ -57,3 +62,290 @@ def test_out_of_blocks_raises_error():
 
     with pytest.raises(OutOfBlocksError):
         manager.append_token("req-1")
+
+
+def test_sliding_window_allocation_skips_middle_blocks():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    window = SlidingWindowPolicy(sink_blocks=1, window_blocks=2)
+
+    allocated = manager.allocate_for_request("req-1", 24, window=window)  # 6 logical blocks
+
+    table = manager.active_requests["req-1"]
+    assert len(allocated) == 3
+    assert sorted(table.mapping) == [0, 4, 5]
+    assert table.resident_tokens == 12
+    assert manager.memory_report()["reclaimed_tokens"] == 12
+
+
+def test_sliding_window_reclaims_middle_blocks_as_tokens_append():
+    manager = PagedKVBlockManager(num_gpu_blocks=4, block_size=4)
+    manager.allocate_for_request("req-1", 0, window=SlidingWindowPolicy(sink_blocks=1, window_blocks=2))
+
+    # 400 tokens = 100 logical blocks, yet only sink + window stay resident.
+    manager.append_token("req-1", token_count=400)
+
+    table = manager.active_requests["req-1"]
+    assert sorted(table.mapping) == [0, 98, 99]
+    assert table.total_tokens == 400
+    assert manager.memory_report()["used_blocks"] == 3
+
+
+def test_set_window_policy_reclaims_existing_request():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    manager.allocate_for_request("req-1", 32)
+
+    freed = manager.set_window_policy("req-1", SlidingWindowPolicy(sink_blocks=2, window_blocks=3))
+
+    assert len(freed) == 3
+    assert sorted(manager.active_requests["req-1"].mapping) == [0, 1, 5, 6, 7]
+    assert manager.memory_report()["free_blocks"] == 3
+
+
+def test_sliding_window_keeps_ref_counts_correct_across_forks():
+    manager = PagedKVBlockManager(num_gpu_blocks=16, block_size=4)
+    window = SlidingWindowPolicy(sink_blocks=1, window_blocks=2)
+    manager.allocate_for_request("req-parent", 12, window=window)  # blocks 0,1,2 resident
+    shared_middle = manager.active_requests["req-parent"].mapping[1]
+
+    manager.fork_request("req-parent", "req-child")
+    assert manager.get_ref_count(shared_middle) == 2
+
+    # Child slides past block 1: only its reference is dropped, parent keeps the block.
+    manager.append_token("req-child", token_count=1)
+    assert 1 not in manager.active_requests["req-child"].mapping
+    assert manager.active_requests["req-parent"].mapping[1] == shared_middle
+    assert manager.get_ref_count(shared_middle) == 1
+
+    manager.append_token("req-parent", token_count=1)
+    assert manager.get_ref_count(shared_middle) == 0
+    sink = manager.active_requests["req-parent"].mapping[0]
+    assert manager.get_ref_count(sink) == 2
+
+    manager.release_request("req-parent")
+    manager.release_request("req-child")
+    report = manager.memory_report()
+    assert report["used_blocks"] == 0
+    assert report["free_blocks"] == 16
+
+
+def test_fork_many_shares_prefix_structurally():
+    manager = PagedKVBlockManager(num_gpu_blocks=32, block_size=4)
+    manager.allocate_for_request("root", 40)
+
+    children = manager.fork_many("root", 5)
+
+    assert children == [f"root/{idx}" for idx in range(5)]
+    bases = {id(manager.active_requests[child].base) for child in children}
+    assert len(bases) == 1
+    assert manager.active_requests["root"].base is manager.active_requests["root/0"].base
+    assert all(manager.active_requests[child].mapping == manager.active_requests["root"].mapping for child in children)
+    assert manager.memory_report()["used_blocks"] == 10
+    assert manager.get_ref_count(manager.active_requests["root"].mapping[0]) == 6
+
+
+def test_fork_many_rejects_existing_targets_without_partial_forks():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    manager.allocate_for_request("root", 4)
+    manager.allocate_for_request("taken", 4)
+
+    with pytest.raises(ValueError):
+        manager.fork_many("root", ["fresh", "taken"])
+
+    assert "fresh" not in manager.active_requests
+    assert manager.get_ref_count(manager.active_requests["root"].mapping[0]) == 1
+
+
+def test_fork_many_rejects_bare_string_targets():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    manager.allocate_for_request("root", 4)
+
+    with pytest.raises(TypeError):
+        manager.fork_many("root", "child")
+    assert list(manager.active_requests) == ["root"]
+
+
+def test_ref_count_is_physical_and_view_count_counts_requests():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    manager.allocate_for_request("root", 4)
+    manager.fork_request("root", "a")
+    manager.append_token("a", token_count=4)
+    manager.fork_request("a", "b")  # a's private block moves into a nested segment
+
+    sink = manager.active_requests["root"].mapping[0]
+    assert manager.get_view_count(sink) == 3
+    # Held directly by root and by the nested segment shared by a and b.
+    assert manager.get_ref_count(sink) == 2
+
+
+def test_windowed_forks_free_shared_blocks_no_request_sees():
+    manager = PagedKVBlockManager(num_gpu_blocks=16, block_size=4)
+    window = SlidingWindowPolicy(sink_blocks=1, window_blocks=2)
+    manager.allocate_for_request("parent", 20, window=window)  # blocks 0, 3, 4 resident
+    manager.fork_request("parent", "child")
+
+    manager.append_token("parent", token_count=8)
+    manager.append_token("child", token_count=8)
+
+    # Shared blocks 3 and 4 slid out of both windows and went back to the pool.
+    assert sorted(manager.active_requests["parent"].mapping) == [0, 5, 6]
+    assert manager.memory_report()["used_blocks"] == 5
+    assert manager.get_ref_count(manager.active_requests["parent"].mapping[0]) == 2
+
+
+def test_beam_tree_forks_release_every_block():
+    manager = PagedKVBlockManager(num_gpu_blocks=256, block_size=4)
+    manager.allocate_for_request("beam", 6)
+    frontier = ["beam"]
+    for _ in range(4):
+        expanded: list[str] = []
+        for node in frontier:
+            for child in manager.fork_many(node, 3):
+                manager.append_token(child, token_count=5)
+                expanded.append(child)
+        for node in frontier:
+            manager.release_request(node)
+        frontier = expanded[:3]
+        for pruned in expanded[3:]:
+            manager.release_request(pruned)
+
+    for node in frontier:
+        assert manager.active_requests[node].total_tokens == 26
+        assert sorted(manager.active_requests[node].filled_count.values()) == [2, 4, 4, 4, 4, 4, 4]
+        manager.release_request(node)
+
+    report = manager.memory_report()
+    assert report["used_blocks"] == 0
+    assert report["free_blocks"] == 256
+
+
+def test_released_parent_segment_is_absorbed_by_surviving_child():
+    manager = PagedKVBlockManager(num_gpu_blocks=8, block_size=4)
+    manager.allocate_for_request("parent", 6)
+    manager.fork_request("parent", "child")
+    manager.release_request("parent")
+
+    manager.append_token("child")
+
+    table = manager.active_requests["child"]
+    assert table.base is None
+    assert sorted(table.local_blocks) == [0, 1]
+    assert manager.memory_report()["used_blocks"] == 2
+
+
+def test_random_fork_append_release_matches_flat_reference():
+    import random
+
+    rng = random.Random(7)
+    block_size = 4
+    manager = PagedKVBlockManager(num_gpu_blocks=512, block_size=block_size)
+    window = SlidingWindowPolicy(sink_blocks=1, window_blocks=3)
+    expected_tokens: dict[str, int] = {}
+    next_id = 0
+
+    for step in range(400):
+        op = rng.random()
+        if not expected_tokens or op < 0.15:
+            request_id = f"r{next_id}"
+            next_id += 1
+            tokens = rng.randint(0, 20)
+            manager.allocate_for_request(request_id, tokens, window=window if rng.random() < 0.5 else None)
+            expected_tokens[request_id] = tokens
+        elif op < 0.45:
+            source = rng.choice(sorted(expected_tokens))
+            for child in manager.fork_many(source, [f"r{next_id + idx}" for idx in range(rng.randint(1, 3))]):
+                expected_tokens[child] = expected_tokens[source]
+            next_id += 3
+        elif op < 0.85:
+            request_id = rng.choice(sorted(expected_tokens))
+            count = rng.randint(1, 9)
+            manager.append_token(request_id, token_count=count)
+            expected_tokens[request_id] += count
+        else:
+            request_id = rng.choice(sorted(expected_tokens))
+            manager.release_request(request_id)
+            del expected_tokens[request_id]
+
+        visible: set[int] = set()
+        for request_id, tokens in expected_tokens.items():
+            table = manager.active_requests[request_id]
+            assert table.total_tokens == tokens
+            last_idx = (tokens - 1) // block_size
+            expected_keys = set(range(last_idx + 1))
+            if table.window is not None:
+                expected_keys = {idx for idx in expected_keys if not table.window.is_evictable(idx, last_idx)}
+            assert set(table.mapping) == expected_keys, step
+            assert table.resident_tokens == sum(table.filled_count.values())
+            visible.update(table.mapping.values())
+        # Nothing stays pinned: every allocated block is mapped by some live request.
+        assert visible == manager._allocated_blocks, step
+        assert manager._allocated_blocks.isdisjoint(manager.free_blocks)
+
+    for request_id in list(expected_tokens):
+        manager.release_request(request_id)
+    assert manager.memory_report()["free_blocks"] == 512
+    assert len(set(manager.free_blocks)) == 512
+
+
+def test_shared_manager_admission_waits_for_released_blocks():
+    import threading
+
+    manager = SharedPagedKVBlockManager(num_gpu_blocks=2, block_size=4)
+    manager.allocate_for_request("holder", 8)
+
+    admitted = threading.Event()
+
+    def admit() -> None:
+        manager.allocate_for_request("waiter", 4, timeout=5)
+        admitted.set()
+
+    thread = threading.Thread(target=admit)
+    thread.start()
+    assert not admitted.wait(timeout=0.05)
+    manager.release_request("holder")
+    thread.join(timeout=5)
+
+    assert admitted.is_set()
+    assert manager.memory_report()["admission_waits"] == 1
+
+
+def test_shared_manager_rejects_oversized_and_times_out():
+    manager = SharedPagedKVBlockManager(num_gpu_blocks=2, block_size=4)
+
+    with pytest.raises(OutOfBlocksError):
+        manager.allocate_for_request("too-big", 12)
+
+    manager.allocate_for_request("holder", 8)
+    with pytest.raises(OutOfBlocksError):
+        manager.allocate_for_request("late", 4, timeout=0.01)
+    assert manager.memory_report()["admission_timeouts"] == 1
+    assert manager.blocks_needed(64, SlidingWindowPolicy(sink_blocks=1, window_blocks=2)) == 3
+
+
+
+def test_shared_manager_append_waits_for_a_free_block():
+    import threading
+
+    manager = SharedPagedKVBlockManager(num_gpu_blocks=2, block_size=4)
+    manager.allocate_for_request("holder", 4)
+    manager.allocate_for_request("grower", 3)
+
+    manager.append_token("grower", timeout=0)  # fills its own tail block without waiting
+    with pytest.raises(OutOfBlocksError):
+        manager.append_token("grower", timeout=0.01)
+
+    appended = threading.Event()
+
+    def grow() -> None:
+        manager.append_token("grower", timeout=5)
+        appended.set()
+
+    thread = threading.Thread(target=grow)
+    thread.start()
+    assert not appended.wait(timeout=0.05)
+    manager.release_request("holder")
+    thread.join(timeout=5)
+
+    assert appended.is_set()
+    assert manager.active_requests["grower"].total_tokens == 5
+    report = manager.memory_report()
+    assert (report["admission_waits"], report["admission_timeouts"]) == (2, 1)
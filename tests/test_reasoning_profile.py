@@ -1,4 +1,4 @@
-from src.backend.reasoning_profile import select_reasoning_profile
+from src.backend.reasoning_profile import AdaptiveProfileSelector, classify_prompt, select_reasoning_profile
 
 
 def test_reasoning_profile_uses_low_budget_for_short_arithmetic_prompts() -> None:
@@ -12,3 +12,44 @@ def test_reasoning_profile_uses_higher_budget_for_analysis_prompts() -> None:
 
 def test_reasoning_profile_uses_balanced_budget_for_general_prompts() -> None:
     assert select_reasoning_profile("ช่วยสรุปแผนงาน sprint นี้ให้สั้นและชัดเจน") == (5, 2)
+
+
+def _calibrate(selector: AdaptiveProfileSelector, prompt_class: str, profile, *, latency_ms, confidence) -> None:
+    for _ in range(selector.min_samples):
+        selector.record(prompt_class, profile, latency_ms=latency_ms, confidence=confidence)
+
+
+def test_adaptive_selector_starts_from_static_default() -> None:
+    selector = AdaptiveProfileSelector()
+
+    assert selector.select("12 + 30 เท่ากับเท่าไร") == ("arithmetic", (4, 1))
+    assert classify_prompt("ช่วยสรุปแผนงาน sprint นี้ให้สั้นและชัดเจน") == "general"
+
+
+def test_adaptive_selector_picks_cheapest_profile_meeting_target_within_slo() -> None:
+    selector = AdaptiveProfileSelector(target_confidence=0.8, latency_slo_ms=100.0, explore_every=1_000)
+    _calibrate(selector, "general", (2, 1), latency_ms=5.0, confidence=0.5)
+    _calibrate(selector, "general", (5, 2), latency_ms=30.0, confidence=0.85)
+    _calibrate(selector, "general", (7, 3), latency_ms=60.0, confidence=0.9)
+
+    assert selector.select("plain prompt")[1] == (5, 2)
+    # (2, 1) fits 20 ms but misses the target and (5, 2) is too slow: try (4, 1) in between.
+    assert selector.select("plain prompt", latency_slo_ms=20.0)[1] == (4, 1)
+    assert selector.select("plain prompt", target_confidence=0.88)[1] == (7, 3)
+    # Nothing meets a 1 ms SLO: never escalate, fall back to the fastest profile.
+    assert selector.select("plain prompt", latency_slo_ms=1.0)[1] == (2, 1)
+
+    _calibrate(selector, "general", (4, 1), latency_ms=12.0, confidence=0.7)
+    assert selector.select("plain prompt", latency_slo_ms=20.0)[1] == (4, 1)  # best confidence within the SLO
+
+
+def test_adaptive_selector_escalates_then_probes_cheaper_profiles() -> None:
+    selector = AdaptiveProfileSelector(target_confidence=0.8, explore_every=2)
+    _calibrate(selector, "arithmetic", (4, 1), latency_ms=5.0, confidence=0.4)
+
+    assert selector.select("1 + 1")[1] == (5, 2)
+
+    _calibrate(selector, "arithmetic", (5, 2), latency_ms=8.0, confidence=0.9)
+    picks = {selector.select("1 + 1")[1] for _ in range(2)}
+    assert picks == {(5, 2), (2, 1)}
+    assert selector.estimates()["arithmetic"]["5x2"]["samples"] == selector.min_samples